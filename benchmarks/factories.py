@@ -0,0 +1,162 @@
+"""
+Handler factory benchmark
+
+Compares the cost of creating and calling a handler with each handler factory.
+
+    python benchmarks/factories.py
+"""
+
+import asyncio
+import collections.abc
+import dataclasses
+import time
+import typing
+
+import injector
+
+import banshee
+import banshee.extra.injector
+
+#######################################################################################
+# handlers
+#######################################################################################
+
+
+@dataclasses.dataclass(frozen=True, slots=True)
+class Query:
+    """
+    Query.
+    """
+
+
+class Store:  # pylint: disable=too-few-public-methods
+    """
+    Store.
+
+    A dependency to inject.
+    """
+
+
+async def function_handler(_: Query) -> None:
+    """
+    Function handler.
+    """
+
+
+async def injected_function_handler(_: Query, store: Store) -> Store:
+    """
+    Injected function handler.
+
+    :param store: injected dependency
+
+    :returns: the dependency
+    """
+    return store
+
+
+class ClassHandler:  # pylint: disable=too-few-public-methods
+    """
+    Class handler.
+    """
+
+    async def __call__(self, _: Query) -> None:
+        pass
+
+
+class InjectedClassHandler:  # pylint: disable=too-few-public-methods
+    """
+    Injected class handler.
+
+    :param store: injected dependency
+    """
+
+    def __init__(self, store: Store) -> None:
+        self.store = store
+
+    async def __call__(self, _: Query) -> Store:
+        return self.store
+
+
+#######################################################################################
+# benchmark
+#######################################################################################
+
+
+async def measure(
+    factory: banshee.HandlerFactory,
+    handler: type | collections.abc.Callable[..., typing.Any],
+    iterations: int,
+) -> float:
+    """
+    Measure.
+
+    :param factory: factory to create handlers
+    :param handler: handler to reference
+    :param iterations: number of times to create and call the handler
+
+    :returns: mean microseconds per iteration
+    """
+    reference: banshee.HandlerReference[Query] = banshee.HandlerReference(
+        name=handler.__name__, handler=handler
+    )
+    query = Query()
+
+    # warm up, so one-off preparation isn't measured
+    await factory(reference)(query)
+
+    start = time.perf_counter()
+
+    for _ in range(iterations):
+        await factory(reference)(query)
+
+    return (time.perf_counter() - start) / iterations * 1_000_000
+
+
+async def main(iterations: int = 20_000) -> None:
+    """
+    Main entry-point.
+
+    :param iterations: number of times to create and call each handler
+    """
+    container = injector.Injector(lambda binder: binder.bind(Store, to=Store()))
+
+    cases: list[
+        tuple[
+            str,
+            banshee.HandlerFactory,
+            type | collections.abc.Callable[..., typing.Any],
+        ]
+    ]
+    cases = [
+        ("simple, function", banshee.SimpleHandlerFactory(), function_handler),
+        ("simple, class", banshee.SimpleHandlerFactory(), ClassHandler),
+        (
+            "injector, function",
+            banshee.extra.injector.InjectorHandlerFactory(container),
+            function_handler,
+        ),
+        (
+            "injector, injected function",
+            banshee.extra.injector.InjectorHandlerFactory(container),
+            injected_function_handler,
+        ),
+        (
+            "injector, class",
+            banshee.extra.injector.InjectorHandlerFactory(container),
+            ClassHandler,
+        ),
+        (
+            "injector, injected class",
+            banshee.extra.injector.InjectorHandlerFactory(container),
+            InjectedClassHandler,
+        ),
+    ]
+
+    for name, factory, handler in cases:
+        result = await measure(factory, handler, iterations)
+
+        print(f"{name:<30} {result:8.2f} us")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
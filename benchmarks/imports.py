@@ -0,0 +1,60 @@
+"""
+Import time benchmark
+
+Measures how long a fresh interpreter takes to import parts of the package, less the
+time to start an interpreter that imports nothing.
+
+    python benchmarks/imports.py
+"""
+
+import statistics
+import subprocess
+import sys
+import time
+
+STATEMENTS = {
+    "from banshee import Bus, Message": "from banshee import Bus, Message",
+    "import banshee": "import banshee",
+    "from banshee import *": "from banshee import *",
+}
+
+
+def measure(statement: str, runs: int) -> float:
+    """
+    Measure.
+
+    :param statement: python statement to run in a fresh interpreter
+    :param runs: number of interpreters to start
+
+    :returns: median milliseconds to start the interpreter and run the statement
+    """
+    timings = []
+
+    for _ in range(runs):
+        start = time.perf_counter()
+
+        subprocess.run([sys.executable, "-c", statement], check=True)
+
+        timings.append(time.perf_counter() - start)
+
+    return statistics.median(timings) * 1000
+
+
+def main(runs: int = 30) -> None:
+    """
+    Main entry-point.
+
+    :param runs: number of interpreters to start for each statement
+    """
+    startup = measure("pass", runs)
+
+    print(f"{'interpreter startup':<36} {startup:8.2f} ms")
+
+    for name, statement in STATEMENTS.items():
+        result = measure(statement, runs)
+
+        print(f"{name:<36} {result - startup:+8.2f} ms")
+
+
+if __name__ == "__main__":
+    main()
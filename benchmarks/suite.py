@@ -0,0 +1,635 @@
+"""
+Message bus benchmark suite
+
+Measures the hot paths of the message bus while sweeping middleware depth, context
+count, subscriber fan-out, nested :class:`~banshee.HandleAfter` messages, the handler
+factory and identifier generators, reporting throughput, p50/p99 latency and
+allocations.
+
+    python benchmarks/suite.py
+    python benchmarks/suite.py --save baseline.json
+    python benchmarks/suite.py --baseline baseline.json --tolerance 0.1
+
+Allocations are measured in a separate pass under :mod:`tracemalloc`, so tracing
+doesn't skew the timings. `alloc` is the mean peak memory allocated by a single
+operation, `retained` is the mean memory still held after each operation.
+"""
+
+import argparse
+import asyncio
+import collections.abc
+import dataclasses
+import functools
+import json
+import pathlib
+import platform
+import sys
+import time
+import tracemalloc
+import typing
+import uuid
+
+import injector
+
+import banshee
+import banshee.extra.injector
+
+T = typing.TypeVar("T")
+
+Operation = collections.abc.Callable[[], collections.abc.Awaitable[typing.Any]]
+
+#######################################################################################
+# requests and handlers
+#######################################################################################
+
+
+@dataclasses.dataclass(frozen=True, slots=True)
+class Query:
+    """
+    Query.
+    """
+
+
+@dataclasses.dataclass(frozen=True, slots=True)
+class Event:
+    """
+    Event.
+
+    :param remaining: number of nested events still to send
+    """
+
+    remaining: int
+
+
+@dataclasses.dataclass(frozen=True, slots=True)
+class Marker:
+    """
+    Marker.
+
+    A context to pad messages with.
+
+    :param number: position of the context
+    """
+
+    number: int
+
+
+class Store:  # pylint: disable=too-few-public-methods
+    """
+    Store.
+
+    A dependency to inject.
+    """
+
+
+async def query_handler(_: Query) -> None:
+    """
+    Query handler.
+    """
+
+
+async def injected_query_handler(_: Query, store: Store) -> None:
+    """
+    Injected query handler.
+
+    :param store: injected dependency
+    """
+    assert store
+
+
+async def passthrough(
+    message: banshee.Message[T],
+    handle: banshee.HandleMessage,
+) -> banshee.Message[T]:
+    """
+    Passthrough middleware.
+
+    :param message: message to process
+    :param handle: next middleware invoker
+
+    :returns: processed message
+    """
+    return await handle(message)
+
+
+#######################################################################################
+# cases
+#######################################################################################
+
+
+def _bus(
+    registry: banshee.Registry,
+    *middleware: banshee.Middleware,
+    factory: banshee.HandlerFactory | None = None,
+) -> banshee.Bus:
+    """
+    Bus.
+
+    :param registry: registry of handlers
+    :param middleware: middleware to add before dispatching
+    :param factory: handler factory
+
+    :returns: message bus
+    """
+    builder = banshee.Builder().with_locator(registry)
+
+    for item in middleware:
+        builder = builder.with_middleware(item)
+
+    if factory:
+        builder = builder.with_factory(factory)
+
+    return builder.build()
+
+
+def _query_registry(fan_out: int = 1) -> banshee.Registry:
+    """
+    Query registry.
+
+    :param fan_out: number of handlers subscribed to :class:`Query`
+
+    :returns: registry
+    """
+    registry = banshee.Registry()
+
+    for number in range(fan_out):
+        registry.subscribe(query_handler, to=Query, name=f"handler_{number}")
+
+    return registry
+
+
+def depth_case(depth: int) -> Operation:
+    """
+    Middleware depth case.
+
+    :param depth: number of middleware before dispatching
+
+    :returns: operation handling a query
+    """
+    bus = _bus(_query_registry(), *[passthrough] * depth)
+
+    return lambda: bus.handle(Query())
+
+
+def contexts_case(count: int) -> Operation:
+    """
+    Context count case.
+
+    :param count: number of contexts the message carries
+
+    :returns: operation handling a query
+    """
+    bus = _bus(
+        _query_registry(),
+        banshee.IdentityMiddleware(),
+        banshee.CausationMiddleware(),
+    )
+    contexts = [Marker(number) for number in range(count)]
+
+    return lambda: bus.handle(Query(), contexts)
+
+
+def including_case(count: int) -> Operation:
+    """
+    Including case.
+
+    :param count: number of contexts already on the message
+
+    :returns: operation adding a context to a message
+    """
+    message = banshee.message_for(Query(), [Marker(number) for number in range(count)])
+    context = banshee.Dispatch(name="handler", result=None)
+
+    async def _operation() -> banshee.Message[Query]:
+        return message.including(context)
+
+    return _operation
+
+
+def fan_out_case(fan_out: int) -> Operation:
+    """
+    Subscriber fan-out case.
+
+    :param fan_out: number of handlers subscribed to the query
+
+    :returns: operation handling a query
+    """
+    bus = _bus(_query_registry(fan_out))
+
+    return lambda: bus.handle(Query())
+
+
+def subscribers_case(fan_out: int) -> Operation:
+    """
+    Subscribers lookup case.
+
+    :param fan_out: number of handlers subscribed to the query
+
+    :returns: operation looking up the handlers for a query
+    """
+    registry = _query_registry(fan_out)
+    message = banshee.message_for(Query())
+
+    async def _operation() -> typing.Any:
+        return registry.subscribers_for(message)
+
+    return _operation
+
+
+def handle_after_case(nesting: int) -> Operation:
+    """
+    Nested handle after case.
+
+    :param nesting: number of events each handled after the event that sent it
+
+    :returns: operation handling an event
+    """
+    registry = banshee.Registry()
+
+    bus = _bus(registry, banshee.HandleAfterMiddleware())
+
+    async def event_handler(event: Event) -> None:
+        if event.remaining:
+            await bus.handle(Event(event.remaining - 1), [banshee.HandleAfter()])
+
+    registry.subscribe(event_handler, to=Event)
+
+    return lambda: bus.handle(Event(nesting))
+
+
+def factory_case(
+    name: str,
+    handler: collections.abc.Callable[..., typing.Any],
+) -> Operation:
+    """
+    Handler factory case.
+
+    :param name: `simple` or `injector`
+    :param handler: handler subscribed to the query
+
+    :returns: operation handling a query
+    """
+    registry = banshee.Registry()
+    registry.subscribe(handler, to=Query)
+
+    factory: banshee.HandlerFactory
+
+    if name == "injector":
+        factory = banshee.extra.injector.InjectorHandlerFactory(
+            injector.Injector(lambda binder: binder.bind(Store, to=Store()))
+        )
+    else:
+        factory = banshee.SimpleHandlerFactory()
+
+    bus = _bus(registry, factory=factory)
+
+    return lambda: bus.handle(Query())
+
+
+def traceable_case(max_messages: int | None) -> Operation:
+    """
+    Traceable bus case.
+
+    :param max_messages: number of messages to retain, or `None` for all
+
+    :returns: operation handling a query
+    """
+    bus = banshee.TraceableBus(_bus(_query_registry()), max_messages=max_messages)
+
+    return lambda: bus.handle(Query())
+
+
+def _generator(name: str) -> banshee.IdGenerator:
+    """
+    Identifier generator.
+
+    :param name: `uuid4`, `uuid7` or `counter`
+
+    :returns: generator
+    """
+    if name == "uuid7":
+        return banshee.UUID7Generator()
+
+    if name == "counter":
+        return banshee.CounterGenerator()
+
+    return uuid.uuid4
+
+
+def ids_case(name: str) -> Operation:
+    """
+    Identifier generation case.
+
+    :param name: `uuid4`, `uuid7` or `counter`
+
+    :returns: operation generating a batch of identifiers
+    """
+    generator = _generator(name)
+
+    async def _operation() -> list[uuid.UUID]:
+        return [generator() for _ in range(100)]
+
+    return _operation
+
+
+def identity_case(name: str) -> Operation:
+    """
+    Identity middleware case.
+
+    :param name: `uuid4`, `uuid7` or `counter`
+
+    :returns: operation handling a query
+    """
+    bus = _bus(_query_registry(), banshee.IdentityMiddleware(_generator(name)))
+
+    return lambda: bus.handle(Query())
+
+
+def cases() -> dict[str, collections.abc.Callable[[], Operation]]:
+    """
+    Cases.
+
+    :returns: functions to set up each case, by name
+    """
+    return {
+        **{f"depth/{n}": functools.partial(depth_case, n) for n in (0, 4, 16)},
+        **{f"contexts/{n}": functools.partial(contexts_case, n) for n in (0, 8, 32)},
+        **{f"including/{n}": functools.partial(including_case, n) for n in (0, 8, 32)},
+        **{f"fan-out/{n}": functools.partial(fan_out_case, n) for n in (1, 8, 32)},
+        **{
+            f"subscribers/{n}": functools.partial(subscribers_case, n)
+            for n in (1, 8, 32)
+        },
+        **{
+            f"handle-after/{n}": functools.partial(handle_after_case, n)
+            for n in (0, 4, 16)
+        },
+        "factory/simple": functools.partial(factory_case, "simple", query_handler),
+        "factory/injector": functools.partial(factory_case, "injector", query_handler),
+        "factory/injector-injected": functools.partial(
+            factory_case, "injector", injected_query_handler
+        ),
+        "traceable/unbounded": functools.partial(traceable_case, None),
+        "traceable/bounded": functools.partial(traceable_case, 1000),
+        **{
+            f"ids/{name}": functools.partial(ids_case, name)
+            for name in ("uuid4", "uuid7", "counter")
+        },
+        **{
+            f"identity/{name}": functools.partial(identity_case, name)
+            for name in ("uuid4", "uuid7", "counter")
+        },
+    }
+
+
+#######################################################################################
+# measurement
+#######################################################################################
+
+
+@dataclasses.dataclass(frozen=True)
+class Result:
+    """
+    Result.
+
+    :param iterations: number of timed operations
+    :param throughput: operations per second
+    :param p50: median latency in nanoseconds
+    :param p99: 99th percentile latency in nanoseconds
+    :param allocated: mean peak bytes allocated by an operation
+    :param retained: mean bytes still allocated after an operation
+    """
+
+    iterations: int
+    throughput: float
+    p50: int
+    p99: int
+    allocated: float
+    retained: float
+
+
+def _percentile(timings: collections.abc.Sequence[int], q: float) -> int:
+    """
+    Percentile.
+
+    :param timings: sorted timings
+    :param q: percentile from `0.0` to `1.0`
+
+    :returns: timing at the percentile, using the nearest rank
+    """
+    return timings[min(len(timings) - 1, int(q * len(timings)))]
+
+
+async def measure(operation: Operation, iterations: int) -> Result:
+    """
+    Measure.
+
+    :param operation: operation to measure
+    :param iterations: number of times to run the operation
+
+    :returns: result
+    """
+    # warm up, so caches are filled and one-off preparation isn't measured
+    for _ in range(min(iterations, 1000)):
+        await operation()
+
+    timings = []
+
+    start = time.perf_counter_ns()
+
+    for _ in range(iterations):
+        began = time.perf_counter_ns()
+        await operation()
+        timings.append(time.perf_counter_ns() - began)
+
+    elapsed = time.perf_counter_ns() - start
+
+    timings.sort()
+
+    samples = min(iterations, 1000)
+
+    tracemalloc.start()
+
+    try:
+        initial, _ = tracemalloc.get_traced_memory()
+        allocated = 0
+
+        for _ in range(samples):
+            tracemalloc.reset_peak()
+            before, _ = tracemalloc.get_traced_memory()
+            await operation()
+            _, peak = tracemalloc.get_traced_memory()
+            allocated += peak - before
+
+        final, _ = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    return Result(
+        iterations=iterations,
+        throughput=iterations / (elapsed / 1e9),
+        p50=_percentile(timings, 0.50),
+        p99=_percentile(timings, 0.99),
+        allocated=allocated / samples,
+        retained=(final - initial) / samples,
+    )
+
+
+#######################################################################################
+# reporting
+#######################################################################################
+
+
+def _change(current: float, previous: float | None) -> str:
+    """
+    Change.
+
+    :param current: current value
+    :param previous: baseline value, if any
+
+    :returns: relative change formatted as a percentage
+    """
+    if not previous:
+        return ""
+
+    return f"{(current - previous) / previous * 100:+.1f}%"
+
+
+def report(
+    results: collections.abc.Mapping[str, Result],
+    baseline: collections.abc.Mapping[str, Result],
+) -> str:
+    """
+    Report.
+
+    :param results: results by case name
+    :param baseline: baseline results by case name
+
+    :returns: results formatted as a table
+    """
+    lines = [
+        f"{'case':<28} {'ops/s':>10} {'p50 us':>9} {'p99 us':>9} "
+        f"{'alloc B':>9} {'retain B':>9} {'d ops/s':>9} {'d p99':>9}"
+    ]
+
+    for name, result in results.items():
+        previous = baseline.get(name)
+        throughput = _change(
+            result.throughput, previous.throughput if previous else None
+        )
+        p99 = _change(result.p99, previous.p99 if previous else None)
+
+        lines.append(
+            f"{name:<28} {result.throughput:>10,.0f} {result.p50 / 1e3:>9.2f} "
+            f"{result.p99 / 1e3:>9.2f} {result.allocated:>9,.0f} "
+            f"{result.retained:>9,.0f} "
+            f"{throughput:>9} {p99:>9}"
+        )
+
+    return "\n".join(lines)
+
+
+def regressions(
+    results: collections.abc.Mapping[str, Result],
+    baseline: collections.abc.Mapping[str, Result],
+    tolerance: float,
+) -> list[str]:
+    """
+    Regressions.
+
+    :param results: results by case name
+    :param baseline: baseline results by case name
+    :param tolerance: allowed fractional drop in throughput
+
+    :returns: names of cases whose throughput dropped by more than the tolerance
+    """
+    return [
+        name
+        for name, result in results.items()
+        if name in baseline
+        and result.throughput < baseline[name].throughput * (1 - tolerance)
+    ]
+
+
+def load(path: pathlib.Path) -> dict[str, Result]:
+    """
+    Load.
+
+    :param path: path to a file written with `--save`
+
+    :returns: results by case name
+    """
+    data = json.loads(path.read_text(encoding="utf-8"))
+
+    return {name: Result(**result) for name, result in data["results"].items()}
+
+
+def save(path: pathlib.Path, results: collections.abc.Mapping[str, Result]) -> None:
+    """
+    Save.
+
+    :param path: path to write to
+    :param results: results by case name
+    """
+    data = {
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "results": {
+            name: dataclasses.asdict(result) for name, result in results.items()
+        },
+    }
+
+    path.write_text(json.dumps(data, indent=2) + "\n", encoding="utf-8")
+
+
+async def main(argv: collections.abc.Sequence[str] | None = None) -> int:
+    """
+    Main entry-point.
+
+    :param argv: command line arguments
+
+    :returns: exit status
+    """
+    parser = argparse.ArgumentParser(description="Benchmark the message bus.")
+    parser.add_argument("--iterations", type=int, default=10_000)
+    parser.add_argument(
+        "--filter", default="", help="only run cases whose name contains this"
+    )
+    parser.add_argument("--save", type=pathlib.Path, help="write results as JSON")
+    parser.add_argument(
+        "--baseline", type=pathlib.Path, help="compare with results saved earlier"
+    )
+    parser.add_argument(
+        "--tolerance",
+        type=float,
+        default=None,
+        help="exit with an error when throughput drops by more than this fraction",
+    )
+
+    args = parser.parse_args(argv)
+
+    baseline = load(args.baseline) if args.baseline else {}
+
+    results = {}
+
+    for name, setup in cases().items():
+        if args.filter in name:
+            results[name] = await measure(setup(), args.iterations)
+
+    print(report(results, baseline))
+
+    if args.save:
+        save(args.save, results)
+
+    if args.tolerance is not None and (
+        failed := regressions(results, baseline, args.tolerance)
+    ):
+        print(f"\nthroughput regressed: {', '.join(failed)}", file=sys.stderr)
+
+        return 1
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(asyncio.run(main()))
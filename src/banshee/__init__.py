@@ -2,34 +2,85 @@
 A message bus / command dispatcher implementation.
 """
 
-from banshee.builder import Builder
-from banshee.bus import Bus, MessageBus
-from banshee.context import Causation, Dispatch, HandleAfter, Identity
-from banshee.errors import ConfigurationError, DispatchError, MultipleErrors
-from banshee.message import HandleMessage, Message, Middleware, message_for
-from banshee.middleware.causation import CausationMiddleware
-from banshee.middleware.dispatch import DispatchMiddleware
-from banshee.middleware.gate import Gate, GateMiddleware
-from banshee.middleware.handle_after import HandleAfterMiddleware
-from banshee.middleware.identity import IdentityMiddleware
-from banshee.registry import Registry
-from banshee.request import (
-    Handler,
-    HandlerFactory,
-    HandlerLocator,
-    HandlerReference,
-    SimpleHandlerFactory,
-)
-from banshee.testing import MessageInfo, TraceableBus
+import importlib
+import typing
+
+if typing.TYPE_CHECKING:
+    from banshee.builder import Builder
+    from banshee.bus import Bus, MessageBus
+    from banshee.context import (
+        Causation,
+        Dispatch,
+        HandleAfter,
+        Identity,
+        Partition,
+    )
+    from banshee.deduplication import (
+        BloomDeduplicationStore,
+        DeduplicationStore,
+        LRUDeduplicationStore,
+    )
+    from banshee.errors import (
+        BusClosedError,
+        ConfigurationError,
+        DispatchError,
+        MultipleErrors,
+        QueueFullError,
+    )
+    from banshee.identifiers import CounterGenerator, IdGenerator, UUID7Generator
+    from banshee.message import HandleMessage, Message, Middleware, message_for
+    from banshee.metrics import HistogramSnapshot, Metrics, MetricsSnapshot
+    from banshee.middleware.batch import BatchMiddleware
+    from banshee.middleware.cache import CacheMiddleware, CacheStats
+    from banshee.middleware.causation import CausationMiddleware
+    from banshee.middleware.deduplication import DeduplicationMiddleware
+    from banshee.middleware.dispatch import DispatchHook, DispatchMiddleware
+    from banshee.middleware.gate import Gate, GateMiddleware
+    from banshee.middleware.handle_after import HandleAfterMiddleware
+    from banshee.middleware.identity import IdentityMiddleware
+    from banshee.middleware.metrics import MetricsMiddleware
+    from banshee.middleware.outbox import OutboxMiddleware
+    from banshee.middleware.partition import PartitionMiddleware
+    from banshee.middleware.single_flight import SingleFlightMiddleware
+    from banshee.outbox import (
+        OutboxEntry,
+        OutboxRelay,
+        PickleSerializer,
+        Serializer,
+        SQLiteOutbox,
+    )
+    from banshee.profiling import Profiler, ProfileRow
+    from banshee.queued import Backpressure, QueuedBus
+    from banshee.registry import Registry
+    from banshee.request import (
+        Handler,
+        HandlerFactory,
+        HandlerLocator,
+        HandlerReference,
+        HandlerScope,
+        Lifetime,
+        SimpleHandlerFactory,
+    )
+    from banshee.testing import MessageInfo, TraceableBus
 
 __all__ = (
+    "Backpressure",
+    "BatchMiddleware",
+    "BloomDeduplicationStore",
     "Builder",
     "Bus",
+    "BusClosedError",
+    "CacheMiddleware",
+    "CacheStats",
     "Causation",
     "CausationMiddleware",
     "ConfigurationError",
+    "CounterGenerator",
+    "DeduplicationMiddleware",
+    "DeduplicationStore",
     "Dispatch",
     "DispatchError",
+    "DispatchHook",
     "DispatchMiddleware",
     "Gate",
     "GateMiddleware",
@@ -40,15 +91,136 @@ __all__ = (
     "HandlerFactory",
     "HandlerLocator",
     "HandlerReference",
+    "HandlerScope",
+    "HistogramSnapshot",
+    "IdGenerator",
     "Identity",
     "IdentityMiddleware",
+    "Lifetime",
+    "LRUDeduplicationStore",
     "message_for",
     "Message",
     "MessageBus",
     "MessageInfo",
+    "Metrics",
+    "MetricsMiddleware",
+    "MetricsSnapshot",
     "Middleware",
     "MultipleErrors",
+    "OutboxEntry",
+    "OutboxMiddleware",
+    "OutboxRelay",
+    "Partition",
+    "PartitionMiddleware",
+    "PickleSerializer",
+    "Profiler",
+    "ProfileRow",
+    "QueuedBus",
+    "QueueFullError",
     "Registry",
+    "Serializer",
     "SimpleHandlerFactory",
+    "SingleFlightMiddleware",
+    "SQLiteOutbox",
     "TraceableBus",
+    "UUID7Generator",
 )
+
+# the module each public name is defined in, imported on first access so that
+# `import banshee` only loads the parts of the package that are used
+_EXPORTS = {
+    "Backpressure": "banshee.queued",
+    "BatchMiddleware": "banshee.middleware.batch",
+    "BloomDeduplicationStore": "banshee.deduplication",
+    "Builder": "banshee.builder",
+    "Bus": "banshee.bus",
+    "BusClosedError": "banshee.errors",
+    "CacheMiddleware": "banshee.middleware.cache",
+    "CacheStats": "banshee.middleware.cache",
+    "Causation": "banshee.context",
+    "CausationMiddleware": "banshee.middleware.causation",
+    "ConfigurationError": "banshee.errors",
+    "CounterGenerator": "banshee.identifiers",
+    "DeduplicationMiddleware": "banshee.middleware.deduplication",
+    "DeduplicationStore": "banshee.deduplication",
+    "Dispatch": "banshee.context",
+    "DispatchError": "banshee.errors",
+    "DispatchHook": "banshee.middleware.dispatch",
+    "DispatchMiddleware": "banshee.middleware.dispatch",
+    "Gate": "banshee.middleware.gate",
+    "GateMiddleware": "banshee.middleware.gate",
+    "HandleAfter": "banshee.context",
+    "HandleAfterMiddleware": "banshee.middleware.handle_after",
+    "HandleMessage": "banshee.message",
+    "Handler": "banshee.request",
+    "HandlerFactory": "banshee.request",
+    "HandlerLocator": "banshee.request",
+    "HandlerReference": "banshee.request",
+    "HandlerScope": "banshee.request",
+    "HistogramSnapshot": "banshee.metrics",
+    "IdGenerator": "banshee.identifiers",
+    "Identity": "banshee.context",
+    "IdentityMiddleware": "banshee.middleware.identity",
+    "Lifetime": "banshee.request",
+    "LRUDeduplicationStore": "banshee.deduplication",
+    "Message": "banshee.message",
+    "message_for": "banshee.message",
+    "MessageBus": "banshee.bus",
+    "MessageInfo": "banshee.testing",
+    "Metrics": "banshee.metrics",
+    "MetricsMiddleware": "banshee.middleware.metrics",
+    "MetricsSnapshot": "banshee.metrics",
+    "Middleware": "banshee.message",
+    "MultipleErrors": "banshee.errors",
+    "OutboxEntry": "banshee.outbox",
+    "OutboxMiddleware": "banshee.middleware.outbox",
+    "OutboxRelay": "banshee.outbox",
+    "Partition": "banshee.context",
+    "PartitionMiddleware": "banshee.middleware.partition",
+    "PickleSerializer": "banshee.outbox",
+    "Profiler": "banshee.profiling",
+    "ProfileRow": "banshee.profiling",
+    "QueuedBus": "banshee.queued",
+    "QueueFullError": "banshee.errors",
+    "Registry": "banshee.registry",
+    "Serializer": "banshee.outbox",
+    "SimpleHandlerFactory": "banshee.request",
+    "SingleFlightMiddleware": "banshee.middleware.single_flight",
+    "SQLiteOutbox": "banshee.outbox",
+    "TraceableBus": "banshee.testing",
+    "UUID7Generator": "banshee.identifiers",
+}
+
+
+def __getattr__(name: str) -> typing.Any:
+    """
+    Get attribute.
+
+    Import a public name from the module it's defined in.
+
+    :param name: attribute name
+
+    :returns: attribute value
+
+    :raises AttributeError: when the name is not public
+    """
+    try:
+        module = _EXPORTS[name]
+    except KeyError:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}") from None
+
+    value = getattr(importlib.import_module(module), name)
+
+    # cache it, so later lookups don't go through this function
+    globals()[name] = value
+
+    return value
+
+
+def __dir__() -> list[str]:
+    """
+    Directory.
+
+    :returns: names in the module, including those not yet imported
+    """
+    return sorted({*globals(), *__all__})
@@ -5,8 +5,10 @@ A builder for :class:`~banshee.message_bus.MessageBus` instances.
 import dataclasses
 
 import banshee.bus
+import banshee.errors
 import banshee.message
 import banshee.middleware.dispatch
+import banshee.profiling
 import banshee.registry
 import banshee.request
 
@@ -25,6 +27,9 @@ class Builder:
     )
     locator: banshee.request.HandlerLocator | None = None
     factory: banshee.request.HandlerFactory | None = None
+    concurrency: int | None = 1
+    hooks: tuple[banshee.middleware.dispatch.DispatchHook, ...] = ()
+    profiler: banshee.profiling.Profiler | None = None
 
     def with_middleware(self, middleware: banshee.message.Middleware) -> "Builder":
         """
@@ -62,6 +67,47 @@ class Builder:
         """
         return dataclasses.replace(self, factory=factory)
 
+    def with_concurrency(self, concurrency: int | None) -> "Builder":
+        """
+        With concurrency.
+
+        Set how many handlers for a single message may run at once.
+
+        :param concurrency: maximum number of concurrent handlers, or `None` for no
+            limit
+
+        :returns: builder instance with concurrency
+        """
+        return dataclasses.replace(self, concurrency=concurrency)
+
+    def with_dispatch_hook(
+        self,
+        hook: banshee.middleware.dispatch.DispatchHook,
+    ) -> "Builder":
+        """
+        With dispatch hook.
+
+        Add a hook to call after each handler is dispatched, such as a
+        :class:`~banshee.Metrics` instance.
+
+        :param hook: dispatch hook
+
+        :returns: builder instance with hook added
+        """
+        return dataclasses.replace(self, hooks=(*self.hooks, hook))
+
+    def with_profiler(self, profiler: banshee.profiling.Profiler | None) -> "Builder":
+        """
+        With profiler.
+
+        Record the time spent in each middleware of the message bus.
+
+        :param profiler: profiler instance, or `None` to disable profiling
+
+        :returns: builder instance with profiler
+        """
+        return dataclasses.replace(self, profiler=profiler)
+
     def build(self) -> banshee.bus.Bus:
         """
         Build.
@@ -82,7 +128,12 @@ class Builder:
         factory = self.factory or banshee.request.SimpleHandlerFactory()
 
         middleware.append(
-            banshee.middleware.dispatch.DispatchMiddleware(locator, factory)
+            banshee.middleware.dispatch.DispatchMiddleware(
+                locator,
+                factory,
+                concurrency=self.concurrency,
+                hooks=self.hooks,
+            )
         )
 
-        return banshee.bus.MessageBus(middleware)
+        return banshee.bus.MessageBus(middleware, profiler=self.profiler)
@@ -4,15 +4,23 @@ A command / event / query bus implementation.
 
 import abc
 import collections.abc
+import functools
 import typing
 
 import banshee.context
 import banshee.errors
 import banshee.message
+import banshee.request
+
+if typing.TYPE_CHECKING:
+    import banshee.profiling
 
 #: T
 T = typing.TypeVar("T")
 
+#: default maximum number of requests :meth:`Bus.handle_many` processes at once
+DEFAULT_LIMIT = 100
+
 
 @typing.runtime_checkable
 class Bus(typing.Protocol):
@@ -54,21 +62,137 @@ class Bus(typing.Protocol):
 
         :raises banshee.ConfigurationError: query does not map to exactly one handler
         """
-        message = await self.handle(query, contexts)
+        return _result_of(await self.handle(query, contexts))
+
+    @typing.overload
+    async def handle_many(
+        self,
+        requests: collections.abc.Iterable[typing.Any],
+        contexts: collections.abc.Iterable[typing.Any] | None = None,
+        *,
+        limit: int | None = ...,
+        return_exceptions: typing.Literal[False] = ...,
+    ) -> list[banshee.message.Message[typing.Any]]: ...
+
+    @typing.overload
+    async def handle_many(
+        self,
+        requests: collections.abc.Iterable[typing.Any],
+        contexts: collections.abc.Iterable[typing.Any] | None = None,
+        *,
+        limit: int | None = ...,
+        return_exceptions: bool,
+    ) -> list[banshee.message.Message[typing.Any] | Exception]: ...
+
+    async def handle_many(
+        self,
+        requests: collections.abc.Iterable[typing.Any],
+        contexts: collections.abc.Iterable[typing.Any] | None = None,
+        *,
+        limit: int | None = DEFAULT_LIMIT,
+        return_exceptions: bool = False,
+    ) -> list[typing.Any]:
+        """
+        Handle many.
+
+        Process several messages concurrently, each in its own :class:`asyncio.Task`.
 
-        dispatch_contexts = tuple(message.all(banshee.context.Dispatch))
+        By default the first error is raised and any unfinished messages are
+        cancelled, with `return_exceptions` errors are instead returned in place of
+        the message.
 
-        if not dispatch_contexts:
-            raise banshee.errors.ConfigurationError(
-                f"no handler for {type(message.request).__name__} found"
-            )
+        :param requests: request instances
+        :param contexts: additional context objects for every request
+        :param limit: maximum number of messages to process at once, or `None` for no
+            limit
+        :param return_exceptions: return errors rather than raising them
 
-        if len(dispatch_contexts) > 1:
-            raise banshee.errors.ConfigurationError(
-                f"multiple handlers for {type(message.request).__name__} found"
-            )
+        :returns: processed messages in the same order as the requests
+        """
+        # imported here, as asyncio is slow to import and most buses never need it
+        import banshee.concurrency  # pylint: disable=import-outside-toplevel
 
-        return dispatch_contexts[0].result
+        contexts = tuple(contexts or ())
+
+        return await banshee.concurrency.gather(
+            (functools.partial(self.handle, request, contexts) for request in requests),
+            limit,
+            return_exceptions,
+        )
+
+    async def query_many(
+        self,
+        queries: collections.abc.Iterable[typing.Any],
+        contexts: collections.abc.Iterable[typing.Any] | None = None,
+        *,
+        limit: int | None = DEFAULT_LIMIT,
+        return_exceptions: bool = False,
+    ) -> list[typing.Any]:
+        """
+        Query many.
+
+        Send several queries to the message bus concurrently and return the results,
+        see :meth:`handle_many`.
+
+        :param queries: query instances
+        :param contexts: additional context objects for every query
+        :param limit: maximum number of queries to process at once, or `None` for no
+            limit
+        :param return_exceptions: return errors rather than raising them
+
+        :returns: the results of the queries in the same order as the queries
+
+        :raises banshee.ConfigurationError: query does not map to exactly one handler
+        """
+        messages = await self.handle_many(
+            queries,
+            contexts,
+            limit=limit,
+            return_exceptions=return_exceptions,
+        )
+
+        results: list[typing.Any] = []
+
+        for message in messages:
+            if isinstance(message, Exception):
+                results.append(message)
+
+                continue
+
+            try:
+                results.append(_result_of(message))
+            except banshee.errors.ConfigurationError as error:
+                if not return_exceptions:
+                    raise
+
+                results.append(error)
+
+        return results
+
+
+def _result_of(message: banshee.message.Message[typing.Any]) -> typing.Any:
+    """
+    Get result.
+
+    :param message: a handled query message
+
+    :returns: the result of the query
+
+    :raises banshee.ConfigurationError: query does not map to exactly one handler
+    """
+    dispatch_contexts = tuple(message.all(banshee.context.Dispatch))
+
+    if not dispatch_contexts:
+        raise banshee.errors.ConfigurationError(
+            f"no handler for {type(message.request).__name__} found"
+        )
+
+    if len(dispatch_contexts) > 1:
+        raise banshee.errors.ConfigurationError(
+            f"multiple handlers for {type(message.request).__name__} found"
+        )
+
+    return dispatch_contexts[0].result
 
 
 class MessageBus(Bus):
@@ -78,6 +202,7 @@ class MessageBus(Bus):
     Composable message/query/command bus for processing requests.
 
     :param chain: iterable of middleware
+    :param profiler: profiler to record the time spent in each middleware
     """
 
     # pylint: disable=too-few-public-methods
@@ -85,16 +210,19 @@ class MessageBus(Bus):
     def __init__(
         self,
         middleware: collections.abc.Iterable[banshee.message.Middleware],
+        *,
+        profiler: "banshee.profiling.Profiler | None" = None,
     ) -> None:
         self.middleware = tuple(middleware)
+        self.profiler = profiler
+        self._handle = banshee.message.compile_chain(
+            profiler.instrument(self.middleware) if profiler else self.middleware
+        )
 
     async def handle(
         self,
         request: T | banshee.message.Message[T],
         contexts: collections.abc.Iterable[typing.Any] | None = None,
     ) -> banshee.message.Message[T]:
-        message = banshee.message.message_for(request, contexts)
-
-        handle = banshee.message.MiddlewareChain(iter(self.middleware))
-
-        return await handle(message)
+        with banshee.request.HandlerScope():
+            return await self._handle(banshee.message.message_for(request, contexts))
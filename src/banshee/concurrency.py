@@ -0,0 +1,102 @@
+"""
+Run coroutines concurrently.
+"""
+
+import asyncio
+import collections.abc
+import typing
+
+import banshee.errors
+
+T = typing.TypeVar("T")
+
+
+def check_limit(limit: int | None) -> int | None:
+    """
+    Check limit.
+
+    :param limit: maximum number of coroutines to run at once, or `None` for no limit
+
+    :returns: the limit
+
+    :raises banshee.ConfigurationError: when the limit is less than one
+    """
+    if limit is not None and limit < 1:
+        raise banshee.errors.ConfigurationError(
+            f"concurrency limit must be at least 1, got {limit}."
+        )
+
+    return limit
+
+
+async def gather(
+    functions: collections.abc.Iterable[
+        collections.abc.Callable[[], collections.abc.Awaitable[T]]
+    ],
+    limit: int | None = None,
+    return_exceptions: bool = False,
+) -> list[typing.Any]:
+    """
+    Gather.
+
+    Call each function and await the results concurrently, with at most `limit`
+    running at once, each in its own :class:`asyncio.Task`.
+
+    When any function raises, the rest are cancelled and the error is raised, unless
+    `return_exceptions` is set, in which case the error is returned in place of the
+    result, as with :func:`asyncio.gather`.
+
+    :param functions: functions returning an awaitable
+    :param limit: maximum number of awaitables to run at once, or `None` for no limit
+    :param return_exceptions: return errors rather than raising them
+
+    :returns: results in the same order as the functions
+    """
+    check_limit(limit)
+
+    semaphore = asyncio.Semaphore(limit) if limit is not None else None
+
+    async def _call(
+        function: collections.abc.Callable[[], collections.abc.Awaitable[T]],
+    ) -> T | Exception:
+        if not return_exceptions:
+            return await function()
+
+        try:
+            return await function()
+        except Exception as error:  # pylint: disable=broad-except
+            return error
+
+    async def _run(
+        function: collections.abc.Callable[[], collections.abc.Awaitable[T]],
+    ) -> T | Exception:
+        if semaphore is None:
+            return await _call(function)
+
+        async with semaphore:
+            return await _call(function)
+
+    tasks = [asyncio.ensure_future(_run(function)) for function in functions]
+
+    try:
+        return list(await asyncio.gather(*tasks))
+    except BaseException:
+        await cancel(tasks)
+
+        raise
+
+
+async def cancel(tasks: collections.abc.Iterable["asyncio.Future[typing.Any]"]) -> None:
+    """
+    Cancel.
+
+    Cancel the tasks and wait for them to finish, ignoring their results.
+
+    :param tasks: tasks to cancel
+    """
+    tasks = list(tasks)
+
+    for task in tasks:
+        task.cancel()
+
+    await asyncio.gather(*tasks, return_exceptions=True)
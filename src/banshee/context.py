@@ -2,6 +2,7 @@
 Additional context for requests.
 """
 
+import collections.abc
 import dataclasses
 import typing
 import uuid
@@ -65,3 +66,18 @@ class Causation:
     causation_id: uuid.UUID
     #: root identifier
     correlation_id: uuid.UUID
+
+
+@dataclasses.dataclass(frozen=True, slots=True)
+class Partition:
+    """
+    Partition context.
+
+    Sets the key the :class:`~banshee.PartitionMiddleware` orders the message by,
+    messages with equal keys are handled one at a time.
+
+    :param key: partition key
+    """
+
+    #: partition key
+    key: collections.abc.Hashable
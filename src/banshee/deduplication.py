@@ -0,0 +1,440 @@
+"""
+Remember the identities of handled messages.
+"""
+
+import abc
+import asyncio
+import collections
+import collections.abc
+import hashlib
+import logging
+import math
+import os
+import pickle
+import threading
+import time
+import typing
+import uuid
+
+import banshee.context
+import banshee.errors
+
+logger = logging.getLogger(__name__)
+
+_Contexts = tuple[banshee.context.Dispatch, ...]
+
+
+class DeduplicationStore(typing.Protocol):
+    """
+    Deduplication store.
+
+    Remember the unique identifiers of handled messages, with their
+    :class:`~banshee.Dispatch` contexts.
+    """
+
+    def get(self, unique_id: uuid.UUID) -> _Contexts | None:
+        """
+        Get.
+
+        :param unique_id: unique identifier of a message
+
+        :returns: the contexts of the message, or `None` when it hasn't been seen
+        """
+
+    def add(self, unique_id: uuid.UUID, contexts: _Contexts) -> None:
+        """
+        Add.
+
+        :param unique_id: unique identifier of a handled message
+        :param contexts: dispatch contexts added by the handlers
+        """
+
+
+class _FileStore(abc.ABC):
+    """
+    File store.
+
+    Periodically save the state of a store to a file, replacing it atomically.
+
+    When `save_interval` passes in a running event loop, a snapshot of the state is
+    written in a thread, so the loop isn't blocked on pickling and syncing the file.
+
+    :param path: path to the file, or `None` to keep the state in memory
+    :param save_interval: minimum seconds between saves, or `None` to only save when
+        :meth:`save` is called
+    """
+
+    # pylint: disable=too-few-public-methods,too-many-instance-attributes
+
+    def __init__(
+        self,
+        path: str | os.PathLike[str] | None,
+        save_interval: float | None,
+    ) -> None:
+        self.path = path
+        self.save_interval = save_interval
+
+        self._saved = time.monotonic()
+        self._changed = False
+        # only one write to the temporary file at a time, and never an older snapshot
+        # after a newer one
+        self._lock = threading.Lock()
+        self._snapshots = 0
+        self._written = 0
+        self._tasks: set["asyncio.Task[None]"] = set()
+
+    @abc.abstractmethod
+    def _dump(self) -> typing.Any:
+        """
+        Dump.
+
+        Snapshot the state, it's written later, possibly in another thread, so must
+        not change as the store is used.
+
+        :returns: the state to save, which must be picklable
+        """
+
+    def _read(self) -> typing.Any | None:
+        """
+        Read.
+
+        :returns: the saved state, or `None` when there isn't any
+        """
+        if self.path is None or not os.path.exists(self.path):
+            return None
+
+        try:
+            with open(self.path, "rb") as file:
+                return pickle.load(file)
+        except (OSError, EOFError, pickle.UnpicklingError):
+            logger.exception(
+                "error loading deduplication store from %(path)s.",
+                extra={"path": os.fspath(self.path)},
+            )
+
+            return None
+
+    def _snapshot(self) -> tuple[int, typing.Any]:
+        """
+        Snapshot.
+
+        :returns: the number of the snapshot and the state to save
+        """
+        self._saved = time.monotonic()
+        self._changed = False
+        self._snapshots += 1
+
+        return self._snapshots, self._dump()
+
+    def _write(
+        self,
+        path: str | os.PathLike[str],
+        snapshot: tuple[int, typing.Any],
+    ) -> None:
+        """
+        Write.
+
+        Errors are logged rather than raised, and the state is marked as changed, so
+        it's saved again later.
+
+        :param path: path to the file
+        :param snapshot: number of the snapshot and the state to save
+        """
+        number, state = snapshot
+
+        temporary = f"{os.fspath(path)}.tmp"
+
+        try:
+            with self._lock:
+                if number < self._written:
+                    return
+
+                with open(temporary, "wb") as file:
+                    pickle.dump(state, file, pickle.HIGHEST_PROTOCOL)
+
+                    file.flush()
+                    os.fsync(file.fileno())
+
+                os.replace(temporary, path)
+
+                self._written = number
+        except (OSError, pickle.PicklingError, TypeError, AttributeError):
+            logger.exception(
+                "error saving deduplication store to %(path)s.",
+                extra={"path": os.fspath(path)},
+            )
+
+            self._changed = True
+
+    def _touch(self) -> None:
+        """
+        Touch.
+
+        Mark the state as changed, saving it when `save_interval` has passed, in a
+        thread when there's a running event loop.
+        """
+        self._changed = True
+
+        if (
+            self.path is None
+            or self.save_interval is None
+            or time.monotonic() - self._saved < self.save_interval
+            or self._tasks
+        ):
+            return
+
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            self.save()
+
+            return
+
+        task = loop.create_task(
+            asyncio.to_thread(self._write, self.path, self._snapshot())
+        )
+
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    def save(self) -> None:
+        """
+        Save.
+
+        Write the state to the file, if it has changed, blocking until it's written.
+        Errors are logged rather than raised, so a store that can't be saved still
+        works in memory.
+        """
+        if self.path is None or not self._changed:
+            return
+
+        self._write(self.path, self._snapshot())
+
+
+class LRUDeduplicationStore(_FileStore, DeduplicationStore):
+    """
+    LRU deduplication store.
+
+    Remember the `max_size` most recently seen messages, with their contexts.
+
+    When a `path` is given the store is loaded from it, and saved to it at most every
+    `save_interval` seconds, with :mod:`pickle`, so handler results must be picklable.
+
+    :param max_size: maximum number of messages to remember
+    :param path: path to a file to persist the store to
+    :param save_interval: minimum seconds between saves, or `None` to only save when
+        :meth:`save` is called
+
+    :raises banshee.errors.ConfigurationError: when the size is invalid
+    """
+
+    def __init__(
+        self,
+        max_size: int = 10_000,
+        *,
+        path: str | os.PathLike[str] | None = None,
+        save_interval: float | None = 1.0,
+    ) -> None:
+        super().__init__(path, save_interval)
+
+        if max_size < 1:
+            raise banshee.errors.ConfigurationError(
+                f"max_size must be at least 1, got {max_size}."
+            )
+
+        self.max_size = max_size
+
+        self._entries: collections.OrderedDict[uuid.UUID, _Contexts]
+        self._entries = collections.OrderedDict((self._read() or [])[-max_size:])
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def _dump(self) -> typing.Any:
+        return list(self._entries.items())
+
+    def get(self, unique_id: uuid.UUID) -> _Contexts | None:
+        contexts = self._entries.get(unique_id)
+
+        if contexts is not None:
+            self._entries.move_to_end(unique_id)
+
+        return contexts
+
+    def add(self, unique_id: uuid.UUID, contexts: _Contexts) -> None:
+        self._entries[unique_id] = contexts
+        self._entries.move_to_end(unique_id)
+
+        while len(self._entries) > self.max_size:  # pylint: disable=while-used
+            self._entries.popitem(last=False)
+
+        self._touch()
+
+
+class BloomDeduplicationStore(_FileStore, DeduplicationStore):
+    """
+    Bloom filter deduplication store.
+
+    Remember messages seen in the last `window` seconds in a pair of Bloom filters,
+    using a fixed amount of memory however many messages are seen. Messages are
+    remembered for between one and two windows.
+
+    Contexts aren't stored, so duplicates are skipped without results, and around
+    `error_rate` of new messages are mistaken for duplicates once `capacity`
+    messages are seen in a window.
+
+    When a `path` is given the store is loaded from it, and saved to it at most every
+    `save_interval` seconds.
+
+    :param capacity: number of messages expected in each window
+    :param error_rate: chance of mistaking a new message for a duplicate
+    :param window: seconds to remember messages for
+    :param path: path to a file to persist the store to
+    :param save_interval: minimum seconds between saves, or `None` to only save when
+        :meth:`save` is called
+    :param clock: wall clock returning seconds, so windows carry over restarts
+
+    :raises banshee.errors.ConfigurationError: when the capacity, error rate or
+        window is invalid
+    """
+
+    # pylint: disable=too-many-instance-attributes
+
+    def __init__(
+        self,
+        capacity: int = 1_000_000,
+        error_rate: float = 0.001,
+        window: float = 3600.0,
+        *,
+        path: str | os.PathLike[str] | None = None,
+        save_interval: float | None = 1.0,
+        clock: collections.abc.Callable[[], float] = time.time,
+    ) -> None:
+        # pylint: disable=too-many-arguments
+
+        super().__init__(path, save_interval)
+
+        if capacity < 1:
+            raise banshee.errors.ConfigurationError(
+                f"capacity must be at least 1, got {capacity}."
+            )
+
+        if not 0 < error_rate < 1:
+            raise banshee.errors.ConfigurationError(
+                f"error_rate must be between 0 and 1, got {error_rate}."
+            )
+
+        if window <= 0:
+            raise banshee.errors.ConfigurationError(
+                f"window must be greater than 0, got {window}."
+            )
+
+        self.window = window
+        self.clock = clock
+
+        #: number of bits in each filter
+        self.size = math.ceil(-capacity * math.log(error_rate) / math.log(2) ** 2)
+        #: number of bits set for each message
+        self.hashes = max(1, round(self.size / capacity * math.log(2)))
+
+        self._current = bytearray((self.size + 7) // 8)
+        self._previous = bytearray(len(self._current))
+        self._started = clock()
+
+        self._load()
+
+    def _load(self) -> None:
+        """
+        Load.
+
+        Restore the filters from the file, when it was saved with the same settings.
+        """
+        state = self._read()
+
+        if state is None:
+            return
+
+        if (state["size"], state["hashes"], state["window"]) != (
+            self.size,
+            self.hashes,
+            self.window,
+        ):
+            logger.warning(
+                "ignoring deduplication store %(path)s saved with other settings.",
+                extra={"path": self.path},
+            )
+
+            return
+
+        self._current = bytearray(state["current"])
+        self._previous = bytearray(state["previous"])
+        self._started = state["started"]
+
+    def _dump(self) -> typing.Any:
+        return {
+            "size": self.size,
+            "hashes": self.hashes,
+            "window": self.window,
+            "started": self._started,
+            "current": bytes(self._current),
+            "previous": bytes(self._previous),
+        }
+
+    def _rotate(self) -> None:
+        """
+        Rotate.
+
+        Start a new window once the current one has ended, forgetting the messages
+        from the one before.
+        """
+        now = self.clock()
+
+        elapsed = now - self._started
+
+        if elapsed < self.window:
+            return
+
+        if elapsed < self.window * 2:
+            self._previous = self._current
+        else:
+            self._previous = bytearray(len(self._current))
+
+        self._current = bytearray(len(self._current))
+        self._started = now
+        self._changed = True
+
+    def _positions(self, unique_id: uuid.UUID) -> list[int]:
+        """
+        Positions.
+
+        :param unique_id: unique identifier of a message
+
+        :returns: the bits to set for the message
+        """
+        # hash, so identifiers that aren't random, such as time based ones, spread
+        # evenly, then derive each position from two halves of the digest
+        digest = hashlib.blake2b(unique_id.bytes, digest_size=16).digest()
+
+        first = int.from_bytes(digest[:8], "little")
+        second = int.from_bytes(digest[8:], "little") | 1
+
+        return [(first + i * second) % self.size for i in range(self.hashes)]
+
+    def get(self, unique_id: uuid.UUID) -> _Contexts | None:
+        self._rotate()
+
+        positions = self._positions(unique_id)
+
+        for bits in (self._current, self._previous):
+            if all(bits[i >> 3] & (1 << (i & 7)) for i in positions):
+                return ()
+
+        return None
+
+    def add(self, unique_id: uuid.UUID, contexts: _Contexts) -> None:
+        self._rotate()
+
+        for i in self._positions(unique_id):
+            self._current[i >> 3] |= 1 << (i & 7)
+
+        self._touch()
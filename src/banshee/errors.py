@@ -27,3 +27,19 @@ class ConfigurationError(RuntimeError):
 
     There was an error in how banshee was configured.
     """
+
+
+class QueueFullError(RuntimeError):
+    """
+    Queue full error.
+
+    A message could not be queued as the queue was full.
+    """
+
+
+class BusClosedError(RuntimeError):
+    """
+    Bus closed error.
+
+    A message was sent to a bus after it was closed.
+    """
@@ -2,6 +2,7 @@
 Integrations with :mod:`injector`.
 """
 
+import collections.abc
 import functools
 import inspect
 import typing
@@ -9,6 +10,7 @@ import typing
 import injector
 
 import banshee
+import banshee.request
 
 T = typing.TypeVar("T")
 
@@ -27,6 +29,9 @@ class InjectorHandlerFactory(banshee.HandlerFactory):
     Dependencies will be automatically added to the handler, before calling, and
     can even insert the :class:`~banshee.Bus` for recursive calls.
 
+    Each handler is inspected once, on its first dispatch, and the dependencies to
+    inject are cached by the references name.
+
     .. code-block::python
 
         @registry.subscribe_to(GreetCommand)
@@ -42,34 +47,88 @@ class InjectorHandlerFactory(banshee.HandlerFactory):
     def __init__(self, container: injector.Injector):
         self.container = container
 
+        self._prepared: dict[
+            str,
+            collections.abc.Callable[[], banshee.request.Handler[typing.Any]],
+        ] = {}
+
     def __call__(
         self,
         reference: banshee.HandlerReference[T],
     ) -> banshee.request.Handler[T]:
-        if not isinstance(reference.handler, type):
-            if not injector.is_decorated_with_inject(reference.handler):
-                injector.inject(reference.handler)
+        try:
+            create = self._prepared[reference.name]
+        except KeyError:
+            create = self._prepared[reference.name] = self._prepare(reference)
+
+        return typing.cast(banshee.request.Handler[T], create())
+
+    def _prepare(
+        self,
+        reference: banshee.HandlerReference[T],
+    ) -> collections.abc.Callable[[], banshee.request.Handler[T]]:
+        """
+        Prepare.
+
+        Inspect the handler once, returning a function to create a handler with its
+        dependencies injected, so repeat dispatches skip the reflection.
+
+        :param reference: reference to a handler
+
+        :returns: function to create a handler
+        """
+        handler = reference.resolve()
+        container = self.container
+
+        if not isinstance(handler, type):
+            if not injector.is_decorated_with_inject(handler):
+                injector.inject(handler)
+
+            # the request is passed as the first positional argument
+            request_name = next(iter(inspect.signature(handler).parameters), None)
+            bindings = tuple(
+                (name, interface)
+                for name, interface in injector.get_bindings(handler).items()
+                if name != request_name
+            )
 
-            @functools.wraps(reference.handler)
+            @functools.wraps(handler)
             async def _handler(request: T) -> typing.Any:
-                return await self.container.call_with_injection(
-                    callable=reference.handler,
-                    args=(request,),
+                return await handler(
+                    request,
+                    **{name: container.get(interface) for name, interface in bindings},
                 )
 
-            return _handler
+            return lambda: _handler
 
         # we only apply inject when constructor has arguments
         if (
-            hasattr(reference.handler, "__init__")
+            hasattr(handler, "__init__")
             and not injector.is_decorated_with_inject(
-                typing.cast(typing.Any, reference.handler).__init__
+                typing.cast(typing.Any, handler).__init__
             )
-            and inspect.signature(reference.handler).parameters
+            and inspect.signature(handler).parameters
         ):
-            injector.inject(reference.handler)
+            injector.inject(handler)
+
+        init = typing.cast(typing.Any, handler).__init__
+
+        if not injector.is_decorated_with_inject(init):
+            return typing.cast(
+                collections.abc.Callable[[], banshee.request.Handler[T]], handler
+            )
+
+        bindings = tuple(injector.get_bindings(init).items())
+
+        def _create() -> banshee.request.Handler[T]:
+            return typing.cast(
+                banshee.request.Handler[T],
+                handler(
+                    **{name: container.get(interface) for name, interface in bindings}
+                ),
+            )
 
-        return self.container.create_object(reference.handler)
+        return _create
 
 
 class BansheeModule(injector.Module):
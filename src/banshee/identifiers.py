@@ -0,0 +1,135 @@
+"""
+Generate unique identifiers for messages.
+"""
+
+import collections.abc
+import itertools
+import os
+import struct
+import time
+import typing
+import uuid
+
+_RAND_B_MASK = (1 << 62) - 1
+_COUNTER_MAX = (1 << 12) - 1
+# the version and variant bits of a UUIDv7
+_VERSION_7 = (0x7 << 76) | (0b10 << 62)
+
+
+class IdGenerator(typing.Protocol):
+    """
+    Identifier generator protocol.
+
+    Returns a new unique identifier each call, such as :func:`uuid.uuid4`.
+    """
+
+    # pylint: disable=too-few-public-methods
+
+    def __call__(self) -> uuid.UUID:
+        """
+        Generate.
+
+        :returns: a new unique identifier
+        """
+
+
+class UUID7Generator(IdGenerator):
+    """
+    UUIDv7 generator.
+
+    Generate time ordered identifiers in the UUIDv7 layout, a millisecond timestamp
+    followed by a counter and random bits, so identifiers sort in the order they
+    were generated and are inserted at the end of database indexes.
+
+    Random bits are read from :func:`os.urandom` `buffer_size` identifiers at a
+    time, rather than once per identifier like :func:`uuid.uuid4`. Identifiers
+    generated in the same millisecond increment a 12 bit counter, starting from a
+    random value, so they stay ordered, and when it runs out the timestamp is moved
+    forward.
+
+    Each generator should be used from a single thread.
+
+    :param buffer_size: number of identifiers to read random bits for at once
+    :param clock: clock returning nanoseconds since the epoch
+    """
+
+    # pylint: disable=too-few-public-methods
+
+    def __init__(
+        self,
+        buffer_size: int = 256,
+        clock: collections.abc.Callable[[], int] = time.time_ns,
+    ) -> None:
+        self.buffer_size = max(1, buffer_size)
+        self.clock = clock
+
+        self._pool: list[int] = []
+        self._timestamp = -1
+        self._counter = 0
+
+    def _refill(self) -> list[int]:
+        """
+        Refill.
+
+        Read random bits for the next `buffer_size` identifiers, with a single call
+        to :func:`os.urandom`.
+
+        :returns: the low 64 bits of each identifier, random apart from the variant
+        """
+        data = os.urandom(8 * self.buffer_size)
+
+        self._pool = [
+            (value & _RAND_B_MASK) | _VERSION_7
+            for (value,) in struct.iter_unpack("<Q", data)
+        ]
+
+        return self._pool
+
+    def __call__(self) -> uuid.UUID:
+        """
+        Generate.
+
+        :returns: a new identifier, greater than any generated before it
+        """
+        pool = self._pool or self._refill()
+
+        low = pool.pop()
+        timestamp = self.clock() // 1_000_000
+
+        if timestamp > self._timestamp:
+            self._timestamp = timestamp
+            # start below half way, leaving room to count up in this millisecond
+            self._counter = (pool or self._refill()).pop() & 0x7FF
+        elif self._counter < _COUNTER_MAX:
+            # same millisecond, or the clock went back, keep counting up
+            self._counter += 1
+        else:
+            self._timestamp += 1
+            self._counter = (pool or self._refill()).pop() & 0x7FF
+
+        return uuid.UUID(int=(self._timestamp << 80) | (self._counter << 64) | low)
+
+
+class CounterGenerator(IdGenerator):
+    """
+    Counter generator.
+
+    Generate sequential identifiers, ``00000000-0000-0000-0000-000000000001`` and so
+    on, which are cheap and predictable, for tests and benchmarks. They're only
+    unique within the generator.
+
+    :param start: first identifier, as an integer
+    """
+
+    # pylint: disable=too-few-public-methods
+
+    def __init__(self, start: int = 1) -> None:
+        self._counter = itertools.count(start)
+
+    def __call__(self) -> uuid.UUID:
+        """
+        Generate.
+
+        :returns: the next identifier
+        """
+        return uuid.UUID(int=next(self._counter))
@@ -5,6 +5,7 @@ Messages associating requests with extra context.
 import abc
 import collections.abc
 import dataclasses
+import itertools
 import typing
 
 #: Context Type
@@ -13,9 +14,147 @@ CT = typing.TypeVar("CT")
 #: Request Type
 T = typing.TypeVar("T")
 
+#: Marker for a lookup that found no context
+_MISSING: typing.Any = object()
+
+
+def _classes_of(value: object) -> collections.abc.Iterator[type]:
+    """
+    Classes of value.
+
+    :param value: context object
+
+    :returns: every class an :func:`isinstance` check would accept via the MRO
+    """
+    yield from type(value).__mro__
+
+    if value.__class__ is not type(value):
+        # objects like mocks can spoof their class, which isinstance respects
+        yield from value.__class__.__mro__
+
+
+def _is_plain_class(key: object) -> bool:
+    """
+    Is plain class.
+
+    :param key: context type
+
+    :returns: whether key is a class using the default metaclass
+    """
+    return type(key) is type  # pylint: disable=unidiomatic-typecheck
+
+
+@dataclasses.dataclass(slots=True)
+class _ContextChain:
+    """
+    Context chain.
+
+    A persistent linked list of contexts, each link holding the contexts added by a
+    single call to :meth:`Message.including` and sharing every earlier link with the
+    message it was created from.
+    """
+
+    #: link holding earlier contexts
+    parent: "_ContextChain | None"
+    #: contexts added by this link
+    values: tuple[typing.Any, ...]
+    #: every context up to and including this link, once materialised
+    contexts: tuple[typing.Any, ...] | None = None
+
+    def materialise(self) -> tuple[typing.Any, ...]:
+        """
+        Materialise.
+
+        :returns: every context in the order they were added
+        """
+        if self.contexts is not None:
+            return self.contexts
+
+        links = []
+        link: _ContextChain | None = self
+
+        # walk back until we find a link that has already been materialised
+        while link is not None and link.contexts is None:  # pylint: disable=while-used
+            links.append(link.values)
+            link = link.parent
+
+        if link is not None and link.contexts is not None:
+            links.append(link.contexts)
+
+        self.contexts = tuple(itertools.chain.from_iterable(reversed(links)))
+
+        return self.contexts
+
+
+@dataclasses.dataclass(slots=True)
+class _ContextIndex:
+    """
+    Context index.
+
+    Lookup table from context type to the most recent matching context.
+    """
+
+    #: most recent context for each class in the MRO of any context
+    classes: dict[type, typing.Any] = dataclasses.field(default_factory=dict)
+    #: cached lookups for keys that can only be checked with :func:`isinstance`
+    checks: dict[typing.Any, typing.Any] = dataclasses.field(default_factory=dict)
+
+    def add(self, values: collections.abc.Iterable[typing.Any]) -> "_ContextIndex":
+        """
+        Add contexts.
+
+        Only classes using the default metaclass are indexed, abstract base classes
+        and protocols can match through ``__instancecheck__`` so must be checked
+        directly.
+
+        :param values: context objects in the order they were added
+
+        :returns: the index
+        """
+        classes = self.classes
+        checks = self.checks
+
+        for value in values:
+            for cls in _classes_of(value):
+                if _is_plain_class(cls):
+                    classes[cls] = value
+
+            for key in checks:
+                if isinstance(value, key):
+                    checks[key] = value
+
+        return self
+
+    def copy(self) -> "_ContextIndex":
+        """
+        Copy.
+
+        :returns: a shallow copy of the index
+        """
+        return _ContextIndex(self.classes.copy(), self.checks.copy())
+
+
+class _MessageCache:  # pylint: disable=too-few-public-methods
+    """
+    Message cache.
+
+    Slots for the values a :class:`Message` derives from its contexts. They're kept
+    out of its dataclass fields, so they aren't compared, copied or pickled.
+    """
+
+    __slots__ = ("_chain", "_index")
+
+    # contexts are stored as a chain shared with the message this one was created
+    # from, so :meth:`Message.including` is constant time, the tuple is only built on
+    # access
+    _chain: _ContextChain | None
+
+    # lazily built lookup table from context type to most recent matching context
+    _index: _ContextIndex | None
+
 
 @dataclasses.dataclass(frozen=True, slots=True)
-class Message(typing.Generic[T]):
+class Message(_MessageCache, typing.Generic[T]):
     """
     Message.
 
@@ -32,6 +171,92 @@ class Message(typing.Generic[T]):
         kw_only=True,
     )
 
+    if not typing.TYPE_CHECKING:
+        # hidden from type checkers so they still report unknown attributes
+
+        def __getattr__(self, name: str) -> typing.Any:
+            if name in {"_chain", "_index"}:
+                # a subclass overriding __post_init__ may leave them unset
+                return None
+
+            # messages created by :meth:`including` leave contexts unset until used
+            if name != "contexts":
+                raise AttributeError(name)
+
+            contexts = self._chain.materialise()
+
+            object.__setattr__(self, "contexts", contexts)
+
+            return contexts
+
+    def __post_init__(self) -> None:
+        object.__setattr__(self, "_chain", None)
+        object.__setattr__(self, "_index", None)
+
+    def __getstate__(self) -> list[typing.Any]:
+        # the request, the contexts as a tuple, and any fields added by subclasses,
+        # but not the chain, which links back to every message this one came from
+        return [getattr(self, field.name) for field in dataclasses.fields(self)]
+
+    def __setstate__(self, state: list[typing.Any]) -> None:
+        for field, value in zip(dataclasses.fields(self), state):
+            object.__setattr__(self, field.name, value)
+
+        self.__post_init__()
+
+    def _get_chain(self) -> _ContextChain:
+        chain = self._chain
+
+        if chain is None:
+            contexts = tuple(self.contexts)
+
+            chain = _ContextChain(parent=None, values=contexts, contexts=contexts)
+
+            object.__setattr__(self, "_chain", chain)
+
+        return chain
+
+    def _get_index(self) -> _ContextIndex:
+        index = self._index
+
+        if index is None:
+            index = _ContextIndex().add(self.contexts)
+
+            object.__setattr__(self, "_index", index)
+
+        return index
+
+    def _lookup(self, key: typing.Any) -> typing.Any:
+        """
+        Lookup context.
+
+        :param key: context type
+
+        :returns: most recent matching context or :data:`_MISSING`
+        """
+        index = self._get_index()
+
+        value = index.classes.get(key, _MISSING)
+
+        if value is not _MISSING or _is_plain_class(key):
+            # every class using the default metaclass is indexed
+            return value
+
+        try:
+            return index.checks[key]
+        except KeyError:
+            pass
+
+        # abstract base classes, protocols, and tuples of types, are checked the slow
+        # way, but only once per message
+        value = next(
+            (v for v in reversed(self.contexts) if isinstance(v, key)), _MISSING
+        )
+
+        index.checks[key] = value
+
+        return value
+
     @typing.overload
     def get(self, key: type[CT]) -> CT | None:
         """
@@ -61,11 +286,13 @@ class Message(typing.Generic[T]):
 
         :returns: requested context or default
         """
-        try:
-            return self[key]
-        except KeyError:
+        value = self._lookup(key)
+
+        if value is _MISSING:
             return default
 
+        return typing.cast(CT, value)
+
     def all(self, key: type[CT]) -> collections.abc.Iterable[CT]:
         """
         All contexts.
@@ -87,14 +314,15 @@ class Message(typing.Generic[T]):
         return key in self
 
     def __getitem__(self, key: type[CT]) -> CT:
-        for value in reversed(self.contexts):
-            if isinstance(value, key):
-                return value
+        value = self._lookup(key)
+
+        if value is _MISSING:
+            raise KeyError(key)
 
-        raise KeyError(key)
+        return typing.cast(CT, value)
 
     def __contains__(self, key: type) -> bool:
-        return any(isinstance(value, key) for value in reversed(self.contexts))
+        return self._lookup(key) is not _MISSING
 
     def including(self, *values: object) -> "Message[T]":
         """
@@ -109,7 +337,27 @@ class Message(typing.Generic[T]):
         if not values:
             return self
 
-        return dataclasses.replace(self, contexts=self.contexts + tuple(values))
+        message: Message[T] = object.__new__(type(self))
+
+        object.__setattr__(message, "request", self.request)
+        object.__setattr__(
+            message,
+            "_chain",
+            _ContextChain(parent=self._get_chain(), values=values),
+        )
+        object.__setattr__(message, "_index", None)
+
+        if type(self) is not Message:  # pylint: disable=unidiomatic-typecheck
+            # copy any fields added by subclasses
+            for field in dataclasses.fields(self):
+                if field.name not in {"request", "contexts"}:
+                    object.__setattr__(message, field.name, getattr(self, field.name))
+
+        if self._index is not None:
+            # carry the index over rather than rebuilding it on the next lookup
+            object.__setattr__(message, "_index", self._index.copy().add(values))
+
+        return message
 
     def excluding(self, *key: type) -> "Message[T]":
         """
@@ -126,7 +374,33 @@ class Message(typing.Generic[T]):
         if self.contexts == contexts:
             return self
 
-        return dataclasses.replace(self, contexts=contexts)
+        message = dataclasses.replace(self, contexts=contexts)
+
+        if self._index is not None:
+            # removing contexts only changes lookups that matched a removed context
+            index = _ContextIndex()
+
+            for cls, value in self._index.classes.items():
+                if isinstance(value, key):
+                    value = next(
+                        (v for v in reversed(contexts) if isinstance(v, cls)),
+                        _MISSING,
+                    )
+
+                    if value is _MISSING:
+                        continue
+
+                index.classes[cls] = value
+
+            index.checks = {
+                k: v
+                for k, v in self._index.checks.items()
+                if v is _MISSING or not isinstance(v, key)
+            }
+
+            object.__setattr__(message, "_index", index)
+
+        return message
 
 
 def message_for(
@@ -204,6 +478,9 @@ class MiddlewareChain(HandleMessage):
 
     Dispatch a message by recursively calling middleware.
 
+    The chain is consumed as the message is processed, so a new chain is needed for
+    each message, see :func:`compile_chain` for a reusable alternative.
+
     :param iterator: iterator of middleware instances
     """
 
@@ -218,3 +495,67 @@ class MiddlewareChain(HandleMessage):
 
     async def __call__(self, message: Message[T]) -> Message[T]:
         return await next(self.iterator, self._final)(message, self)
+
+
+class MiddlewareLink(HandleMessage):
+    """
+    Middleware link.
+
+    A prebuilt link in a chain of middleware, calling its middleware with the next
+    link in the chain.
+
+    Links hold no state about the message being processed, so a chain can be built
+    once and then shared by every message, and any link may be called repeatedly,
+    such as when middleware postpones handling.
+
+    :param middleware: middleware instance
+    :param next_handle: next link in the chain
+    """
+
+    # pylint: disable=too-few-public-methods
+
+    __slots__ = ("middleware", "next_handle")
+
+    def __init__(self, middleware: Middleware, next_handle: HandleMessage) -> None:
+        self.middleware = middleware
+        self.next_handle = next_handle
+
+    async def __call__(self, message: Message[T]) -> Message[T]:
+        return await self.middleware(message, self.next_handle)
+
+
+class _FinalLink(MiddlewareLink):
+    """
+    Final link.
+
+    Ends the chain by returning the message unchanged.
+    """
+
+    # pylint: disable=too-few-public-methods
+
+    __slots__ = ()
+
+    def __init__(self) -> None:  # pylint: disable=super-init-not-called
+        pass
+
+    async def __call__(self, message: Message[T]) -> Message[T]:
+        return message
+
+
+def compile_chain(middleware: collections.abc.Iterable[Middleware]) -> MiddlewareLink:
+    """
+    Compile chain.
+
+    Link the middleware together ahead of time, so processing a message needs no
+    per message setup.
+
+    :param middleware: middleware instances in the order they should be called
+
+    :returns: the first link in the chain
+    """
+    handle: MiddlewareLink = _FinalLink()
+
+    for item in reversed(tuple(middleware)):
+        handle = MiddlewareLink(item, handle)
+
+    return handle
@@ -0,0 +1,352 @@
+"""
+Record request and handler metrics.
+"""
+
+import bisect
+import collections
+import collections.abc
+import dataclasses
+import typing
+
+import banshee.request
+
+#: default histogram bucket upper bounds, in nanoseconds, from 1µs to 10s
+DEFAULT_BUCKETS: tuple[int, ...] = tuple(
+    int(base * 10**exponent) for exponent in range(3, 10) for base in (1, 2.5, 5)
+) + (10_000_000_000,)
+
+#: request outcome when at least one handler was called
+SUCCESS = "success"
+#: request outcome when a handler or middleware raised an error
+FAILURE = "failure"
+#: request outcome when no handlers were found
+NO_HANDLERS = "no_handlers"
+
+
+def _name_for(request_type: type) -> str:
+    """
+    Name for request type.
+
+    :param request_type: type of request
+
+    :returns: name including the module, except for built-in types
+    """
+    if request_type.__module__ == "builtins":
+        return request_type.__qualname__
+
+    return f"{request_type.__module__}.{request_type.__qualname__}"
+
+
+@dataclasses.dataclass(frozen=True)
+class HistogramSnapshot:
+    """
+    Histogram snapshot.
+
+    The counts of a histogram at a point in time.
+
+    :param buckets: upper bound of each bucket in nanoseconds, inclusive
+    :param counts: number of values in each bucket, with a final bucket for values
+        larger than the last bound
+    :param total: sum of all values in nanoseconds
+    """
+
+    #: upper bound of each bucket in nanoseconds, inclusive
+    buckets: tuple[int, ...]
+    #: number of values in each bucket, with a final bucket for larger values
+    counts: tuple[int, ...]
+    #: sum of all values in nanoseconds
+    total: int
+
+    @property
+    def count(self) -> int:
+        """
+        Count.
+
+        :returns: number of values recorded
+        """
+        return sum(self.counts)
+
+    def quantile(self, q: float) -> float | None:
+        """
+        Quantile.
+
+        Estimate the value at a quantile, as the upper bound of the bucket it falls
+        in, so the estimate is never less than the true value.
+
+        :param q: quantile from `0.0` to `1.0`, such as `0.99` for p99
+
+        :returns: estimated value in nanoseconds, `inf` if it's larger than the last
+            bound, or `None` when the histogram is empty
+        """
+        count = self.count
+
+        if not count:
+            return None
+
+        rank = q * count
+        seen = 0
+
+        for bound, bucket_count in zip(self.buckets, self.counts):
+            seen += bucket_count
+
+            if seen >= rank:
+                return float(bound)
+
+        return float("inf")
+
+
+class Histogram:
+    """
+    Histogram.
+
+    Count values into fixed buckets, so recording is a binary search and an
+    increment.
+
+    :param buckets: upper bound of each bucket in nanoseconds, inclusive
+    """
+
+    __slots__ = ("buckets", "counts", "total")
+
+    def __init__(
+        self, buckets: collections.abc.Sequence[int] = DEFAULT_BUCKETS
+    ) -> None:
+        self.buckets = tuple(buckets)
+        self.counts = [0] * (len(self.buckets) + 1)
+        self.total = 0
+
+    def record(self, value: int) -> None:
+        """
+        Record.
+
+        :param value: value in nanoseconds
+        """
+        self.counts[bisect.bisect_left(self.buckets, value)] += 1
+        self.total += value
+
+    def snapshot(self) -> HistogramSnapshot:
+        """
+        Snapshot.
+
+        :returns: copy of the current counts
+        """
+        return HistogramSnapshot(
+            buckets=self.buckets,
+            counts=tuple(self.counts),
+            total=self.total,
+        )
+
+
+def _escape(value: str) -> str:
+    """
+    Escape.
+
+    :param value: label value
+
+    :returns: value escaped for the Prometheus text format
+    """
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _histogram_lines(
+    metric: str,
+    label: str,
+    histograms: collections.abc.Mapping[str, HistogramSnapshot],
+) -> collections.abc.Iterator[str]:
+    """
+    Histogram lines.
+
+    :param metric: metric name
+    :param label: label name for the histograms keys
+    :param histograms: histograms by label value
+
+    :returns: lines in the Prometheus text format, with durations in seconds
+    """
+    yield f"# TYPE {metric} histogram"
+
+    for key, histogram in histograms.items():
+        labels = f'{label}="{_escape(key)}"'
+        cumulative = 0
+
+        for bound, count in zip(histogram.buckets, histogram.counts):
+            cumulative += count
+
+            yield f'{metric}_bucket{{{labels},le="{bound / 1e9:g}"}} {cumulative}'
+
+        yield f'{metric}_bucket{{{labels},le="+Inf"}} {histogram.count}'
+        yield f"{metric}_sum{{{labels}}} {histogram.total / 1e9:g}"
+        yield f"{metric}_count{{{labels}}} {histogram.count}"
+
+
+def _counter_lines(
+    metric: str,
+    label: str,
+    counters: collections.abc.Mapping[str, collections.abc.Mapping[str, int]],
+) -> collections.abc.Iterator[str]:
+    """
+    Counter lines.
+
+    :param metric: metric name
+    :param label: label name for the counters keys
+    :param counters: counts for each outcome by label value
+
+    :returns: lines in the Prometheus text format
+    """
+    yield f"# TYPE {metric} counter"
+
+    for key, outcomes in counters.items():
+        for outcome, count in outcomes.items():
+            yield f'{metric}{{{label}="{_escape(key)}",outcome="{outcome}"}} {count}'
+
+
+@dataclasses.dataclass(frozen=True)
+class MetricsSnapshot:
+    """
+    Metrics snapshot.
+
+    The metrics recorded at a point in time.
+
+    :param requests: latency of each request type, by type name
+    :param handlers: latency of each handler, by handler name
+    :param request_outcomes: count of each outcome for each request type, by type name
+    :param handler_outcomes: count of each outcome for each handler, by handler name
+    """
+
+    #: latency of each request type, by type name
+    requests: dict[str, HistogramSnapshot]
+    #: latency of each handler, by handler name
+    handlers: dict[str, HistogramSnapshot]
+    #: count of each outcome for each request type, by type name
+    request_outcomes: dict[str, dict[str, int]]
+    #: count of each outcome for each handler, by handler name
+    handler_outcomes: dict[str, dict[str, int]]
+
+    def to_prometheus(self, prefix: str = "banshee") -> str:
+        """
+        To Prometheus.
+
+        Format the metrics in the Prometheus text exposition format, for example to
+        serve from a `/metrics` endpoint.
+
+        :param prefix: prefix for the metric names
+
+        :returns: metrics text
+        """
+        lines = [
+            *_histogram_lines(
+                f"{prefix}_request_duration_seconds", "request_type", self.requests
+            ),
+            *_counter_lines(
+                f"{prefix}_requests_total", "request_type", self.request_outcomes
+            ),
+            *_histogram_lines(
+                f"{prefix}_handler_duration_seconds", "handler", self.handlers
+            ),
+            *_counter_lines(
+                f"{prefix}_handler_calls_total", "handler", self.handler_outcomes
+            ),
+        ]
+
+        return "\n".join(lines) + "\n"
+
+
+class Metrics:
+    """
+    Metrics.
+
+    Latency histograms and outcome counters for requests, recorded by the
+    :class:`~banshee.MetricsMiddleware`, and for handlers, recorded as a
+    :class:`~banshee.DispatchMiddleware` hook.
+
+    :param buckets: upper bound of each histogram bucket in nanoseconds
+    """
+
+    def __init__(
+        self, buckets: collections.abc.Sequence[int] = DEFAULT_BUCKETS
+    ) -> None:
+        self.buckets = tuple(buckets)
+
+        self._requests: dict[type, Histogram] = {}
+        self._handlers: dict[str, Histogram] = {}
+        self._request_outcomes: collections.Counter[tuple[type, str]]
+        self._request_outcomes = collections.Counter()
+        self._handler_outcomes: collections.Counter[tuple[str, str]]
+        self._handler_outcomes = collections.Counter()
+
+    def record_request(self, request_type: type, duration: int, outcome: str) -> None:
+        """
+        Record request.
+
+        :param request_type: type of request
+        :param duration: time to handle the request in nanoseconds
+        :param outcome: one of :data:`SUCCESS`, :data:`FAILURE` or
+            :data:`NO_HANDLERS`
+        """
+        try:
+            histogram = self._requests[request_type]
+        except KeyError:
+            histogram = self._requests[request_type] = Histogram(self.buckets)
+
+        histogram.record(duration)
+
+        self._request_outcomes[request_type, outcome] += 1
+
+    def __call__(
+        self,
+        reference: banshee.request.HandlerReference[typing.Any],
+        duration: int,
+        error: Exception | None,
+        /,
+    ) -> None:
+        """
+        Record handler.
+
+        :param reference: reference to the handler
+        :param duration: time to create and call the handler in nanoseconds
+        :param error: error raised by the handler, if any
+        """
+        try:
+            histogram = self._handlers[reference.name]
+        except KeyError:
+            histogram = self._handlers[reference.name] = Histogram(self.buckets)
+
+        histogram.record(duration)
+
+        self._handler_outcomes[reference.name, FAILURE if error else SUCCESS] += 1
+
+    def reset(self) -> None:
+        """
+        Reset.
+
+        Clear everything recorded.
+        """
+        self._requests.clear()
+        self._handlers.clear()
+        self._request_outcomes.clear()
+        self._handler_outcomes.clear()
+
+    def snapshot(self) -> MetricsSnapshot:
+        """
+        Snapshot.
+
+        :returns: copy of the metrics recorded so far
+        """
+        request_outcomes: dict[str, dict[str, int]] = {}
+        handler_outcomes: dict[str, dict[str, int]] = {}
+
+        for (request_type, outcome), count in self._request_outcomes.items():
+            request_outcomes.setdefault(_name_for(request_type), {})[outcome] = count
+
+        for (name, outcome), count in self._handler_outcomes.items():
+            handler_outcomes.setdefault(name, {})[outcome] = count
+
+        return MetricsSnapshot(
+            requests={
+                _name_for(request_type): histogram.snapshot()
+                for request_type, histogram in self._requests.items()
+            },
+            handlers={
+                name: histogram.snapshot() for name, histogram in self._handlers.items()
+            },
+            request_outcomes=request_outcomes,
+            handler_outcomes=handler_outcomes,
+        )
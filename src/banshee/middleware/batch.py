@@ -0,0 +1,253 @@
+"""
+Coalesce requests for batch handlers.
+"""
+
+import asyncio
+import collections.abc
+import dataclasses
+import time
+import typing
+
+import banshee.context
+import banshee.errors
+import banshee.message
+import banshee.middleware.dispatch
+import banshee.request
+
+T = typing.TypeVar("T")
+
+
+@dataclasses.dataclass
+class _Batch:
+    """
+    Pending batch.
+    """
+
+    reference: banshee.request.HandlerReference[typing.Any]
+    requests: list[typing.Any] = dataclasses.field(default_factory=list)
+    futures: list["asyncio.Future[typing.Any]"] = dataclasses.field(
+        default_factory=list
+    )
+    timer: asyncio.TimerHandle | None = None
+
+
+class BatchMiddleware(banshee.message.Middleware):
+    """
+    Batch middleware.
+
+    Coalesce requests sent to batch handlers, those subscribed with `batch=True`, so
+    that requests arriving within `window` seconds of each other are passed to the
+    handler as a single list, up to `max_size` requests at a time.
+
+    Each message waits for its batch to be handled, and then gets a
+    :class:`~banshee.Dispatch` context with its own result, so the
+    :class:`~banshee.DispatchMiddleware` will skip the batch handler and any other
+    handlers are dispatched as normal.
+
+    Only requests sent concurrently, for example from handlers dispatched
+    concurrently, or via :meth:`~banshee.Bus.handle_many`, can share a batch.
+
+    Each hook is called once for each batch, after the handler is called with it,
+    with how long the whole batch took, see :class:`~banshee.DispatchHook`.
+
+    :param locator: locator to lookup associated handlers for a message
+    :param factory: factory to instantiate a concrete handler from a reference, the
+        same one as the bus, so handlers share lifetimes and dependencies
+    :param window: seconds to wait for more requests before calling the handler
+    :param max_size: maximum number of requests in a batch
+    :param hooks: hooks to call after each batch is dispatched
+    """
+
+    # pylint: disable=too-few-public-methods
+
+    def __init__(
+        self,
+        locator: banshee.request.HandlerLocator,
+        factory: banshee.request.HandlerFactory,
+        window: float = 0.0,
+        max_size: int = 100,
+        hooks: collections.abc.Iterable[banshee.middleware.dispatch.DispatchHook] = (),
+    ) -> None:
+        super().__init__()
+
+        if max_size < 1:
+            raise banshee.errors.ConfigurationError(
+                f"max_size must be at least 1, got {max_size}."
+            )
+
+        self.locator = locator
+        self.factory = factory
+        self.window = window
+        self.max_size = max_size
+        self.hooks = tuple(hooks)
+
+        self._batches: dict[str, _Batch] = {}
+        self._tasks: set["asyncio.Task[None]"] = set()
+
+    def _enqueue(
+        self,
+        reference: banshee.request.HandlerReference[T],
+        request: T,
+    ) -> "asyncio.Future[typing.Any]":
+        """
+        Enqueue.
+
+        :param reference: reference to a batch handler
+        :param request: request to add to the batch
+
+        :returns: future for the result of the request
+        """
+        loop = asyncio.get_running_loop()
+
+        batch = self._batches.get(reference.name)
+
+        if batch is None:
+            batch = self._batches[reference.name] = _Batch(reference)
+            batch.timer = loop.call_later(self.window, self._flush, batch)
+
+        future = loop.create_future()
+
+        batch.requests.append(request)
+        batch.futures.append(future)
+
+        if len(batch.requests) >= self.max_size:
+            self._flush(batch)
+
+        return future
+
+    def _flush(self, batch: _Batch) -> None:
+        """
+        Flush.
+
+        Stop collecting requests for the batch and start handling it.
+
+        :param batch: batch to flush
+        """
+        if self._batches.get(batch.reference.name) is not batch:
+            # already flushed
+            return
+
+        del self._batches[batch.reference.name]
+
+        if batch.timer:
+            batch.timer.cancel()
+
+        task = asyncio.get_running_loop().create_task(self._run(batch))
+
+        # keep a reference, so the task isn't garbage collected before it's done
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    async def _run(self, batch: _Batch) -> None:
+        """
+        Run.
+
+        Call the batch handler and resolve each requests future with its result.
+
+        :param batch: batch to handle
+        """
+        start = time.perf_counter_ns() if self.hooks else 0
+
+        try:
+            handler = typing.cast(
+                banshee.request.Handler[list[typing.Any]],
+                self.factory(batch.reference),
+            )
+
+            results = list(await handler(batch.requests))
+
+            if len(results) != len(batch.requests):
+                raise banshee.errors.ConfigurationError(
+                    f"batch handler {batch.reference.name} returned {len(results)} "
+                    f"results for {len(batch.requests)} requests."
+                )
+        except Exception as error:  # pylint: disable=broad-except
+            self._call_hooks(batch, start, error)
+
+            for future in batch.futures:
+                if not future.done():
+                    future.set_exception(error)
+
+            return
+
+        self._call_hooks(batch, start, None)
+
+        for future, result in zip(batch.futures, results):
+            if not future.done():
+                future.set_result(result)
+
+    def _call_hooks(
+        self,
+        batch: _Batch,
+        start: int,
+        error: Exception | None,
+    ) -> None:
+        """
+        Call hooks.
+
+        :param batch: batch that was dispatched
+        :param start: time the batch was dispatched in nanoseconds
+        :param error: error raised by the handler, if any
+        """
+        if not self.hooks:
+            return
+
+        duration = time.perf_counter_ns() - start
+
+        for hook in self.hooks:
+            hook(batch.reference, duration, error)
+
+    async def __call__(
+        self,
+        message: banshee.message.Message[T],
+        handle: banshee.message.HandleMessage,
+    ) -> banshee.message.Message[T]:
+        """
+        Handle message.
+
+        Add the request to a batch for each associated batch handler, and wait for
+        the results before forwarding it to the next handler in the chain.
+
+        :param message: message to process
+        :param handle: next middleware invoker
+
+        :returns: processed message
+
+        :raises banshee.errors.DispatchError: when one or more batch handlers fails
+        """
+        dispatched = {context.name for context in message.all(banshee.context.Dispatch)}
+
+        references = [
+            reference
+            for reference in self.locator.subscribers_for(message)
+            if reference.batch and reference.name not in dispatched
+        ]
+
+        if not references:
+            return await handle(message)
+
+        outcomes = await asyncio.gather(
+            *(self._enqueue(reference, message.request) for reference in references),
+            return_exceptions=True,
+        )
+
+        contexts = []
+        errors = []
+
+        for reference, outcome in zip(references, outcomes):
+            if isinstance(outcome, Exception):
+                errors.append(outcome)
+            elif isinstance(outcome, BaseException):
+                raise outcome
+            else:
+                contexts.append(
+                    banshee.context.Dispatch(name=reference.name, result=outcome)
+                )
+
+        if errors:
+            raise banshee.errors.DispatchError(
+                f"handling {type(message.request).__name__} failed.",
+                errors,
+            )
+
+        return await handle(message.including(*contexts))
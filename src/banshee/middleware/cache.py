@@ -0,0 +1,221 @@
+"""
+Cache query results.
+"""
+
+import collections
+import collections.abc
+import dataclasses
+import time
+import typing
+
+import banshee.context
+import banshee.errors
+import banshee.message
+
+T = typing.TypeVar("T")
+
+
+@dataclasses.dataclass
+class CacheStats:
+    """
+    Cache statistics.
+
+    Counters for the activity of a :class:`~banshee.CacheMiddleware`.
+
+    :param hits: requests answered from the cache
+    :param misses: requests passed on to the handlers
+    :param evictions: entries removed to make space for new entries
+    """
+
+    #: requests answered from the cache
+    hits: int = 0
+    #: requests passed on to the handlers
+    misses: int = 0
+    #: entries removed to make space for new entries
+    evictions: int = 0
+
+
+@dataclasses.dataclass(frozen=True, slots=True)
+class _Entry:
+    """
+    Cache entry.
+    """
+
+    contexts: tuple[banshee.context.Dispatch, ...]
+    expires: float | None
+
+
+class CacheMiddleware(banshee.message.Middleware):
+    """
+    Cache middleware.
+
+    Store the :class:`~banshee.Dispatch` contexts for queries, keyed by the request,
+    so repeated queries for an equal request are answered from the cache.
+
+    Only requests whose type is a key of `ttl` are cached, and they must be hashable,
+    such as a frozen :func:`~dataclasses.dataclass`.
+
+    On a hit the cached contexts are added to the message before it's forwarded to
+    the next handler in the chain, so the :class:`~banshee.DispatchMiddleware` will
+    skip the handlers.
+
+    Handling a request whose type is a key of `invalidates` clears every cached
+    result for the associated query types.
+
+    :param ttl: seconds to cache results for each query type, or `None` to cache
+        them until evicted
+    :param invalidates: query types to clear from the cache for each request type
+    :param max_size: maximum number of entries, the least recently used entries are
+        evicted first
+    :param clock: monotonic clock returning seconds
+    """
+
+    # pylint: disable=too-few-public-methods,too-many-instance-attributes
+
+    def __init__(
+        self,
+        ttl: collections.abc.Mapping[type, float | None],
+        invalidates: (
+            collections.abc.Mapping[type, collections.abc.Iterable[type]] | None
+        ) = None,
+        max_size: int = 1024,
+        clock: collections.abc.Callable[[], float] = time.monotonic,
+    ) -> None:
+        super().__init__()
+
+        if max_size < 1:
+            raise banshee.errors.ConfigurationError(
+                f"max_size must be at least 1, got {max_size}."
+            )
+
+        self.ttl = dict(ttl)
+        self.invalidates = {k: tuple(v) for k, v in (invalidates or {}).items()}
+        self.max_size = max_size
+        self.clock = clock
+        self.stats = CacheStats()
+
+        self._entries: collections.OrderedDict[tuple[type, typing.Any], _Entry]
+        self._entries = collections.OrderedDict()
+        self._keys: collections.defaultdict[type, set[tuple[type, typing.Any]]]
+        self._keys = collections.defaultdict(set)
+        # bumped on invalidation, so results fetched before it are not stored
+        self._generations: collections.Counter[type] = collections.Counter()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def invalidate(self, *types: type) -> None:
+        """
+        Invalidate.
+
+        Clear every cached result for the query types.
+
+        :param types: query types to clear
+        """
+        for request_type in types:
+            self._generations[request_type] += 1
+
+            for key in self._keys.pop(request_type, ()):
+                del self._entries[key]
+
+    def clear(self) -> None:
+        """
+        Clear.
+
+        Clear every cached result.
+        """
+        self.invalidate(*self._keys)
+
+    def _remove(self, key: tuple[type, typing.Any]) -> None:
+        del self._entries[key]
+
+        keys = self._keys[key[0]]
+        keys.discard(key)
+
+        if not keys:
+            del self._keys[key[0]]
+
+    def _store(
+        self,
+        key: tuple[type, typing.Any],
+        contexts: tuple[banshee.context.Dispatch, ...],
+    ) -> None:
+        ttl = self.ttl[key[0]]
+
+        if key in self._entries:
+            self._remove(key)
+
+        while len(self._entries) >= self.max_size:  # pylint: disable=while-used
+            self._remove(next(iter(self._entries)))
+
+            self.stats.evictions += 1
+
+        self._entries[key] = _Entry(
+            contexts=contexts,
+            expires=self.clock() + ttl if ttl is not None else None,
+        )
+        self._keys[key[0]].add(key)
+
+    async def __call__(
+        self,
+        message: banshee.message.Message[T],
+        handle: banshee.message.HandleMessage,
+    ) -> banshee.message.Message[T]:
+        """
+        Handle message.
+
+        Answer the message from the cache when possible, otherwise forward it to the
+        next handler in the chain and cache the result.
+
+        :param message: message to process
+        :param handle: next middleware invoker
+
+        :returns: processed message
+        """
+        request_type = type(message.request)
+
+        if request_type in self.invalidates:
+            try:
+                return await handle(message)
+            finally:
+                self.invalidate(*self.invalidates[request_type])
+
+        if request_type not in self.ttl:
+            return await handle(message)
+
+        key = (request_type, message.request)
+
+        try:
+            entry = self._entries.get(key)
+        except TypeError:
+            # unhashable requests can't be cached
+            return await handle(message)
+
+        if entry and (entry.expires is None or entry.expires > self.clock()):
+            self.stats.hits += 1
+
+            self._entries.move_to_end(key)
+
+            return await handle(message.including(*entry.contexts))
+
+        if entry:
+            self._remove(key)
+
+        self.stats.misses += 1
+
+        generation = self._generations[request_type]
+
+        dispatched = {context.name for context in message.all(banshee.context.Dispatch)}
+
+        result = await handle(message)
+
+        contexts = tuple(
+            context
+            for context in result.all(banshee.context.Dispatch)
+            if context.name not in dispatched
+        )
+
+        if contexts and generation == self._generations[request_type]:
+            self._store(key, contexts)
+
+        return result
@@ -3,7 +3,6 @@ Add causation and correlation identifiers to messages.
 """
 
 import contextvars
-import dataclasses
 import logging
 import typing
 import uuid
@@ -16,11 +15,6 @@ logger = logging.getLogger(__name__)
 T = typing.TypeVar("T")
 
 
-@dataclasses.dataclass
-class _CausationState:
-    stack: list[tuple[uuid.UUID, uuid.UUID]] = dataclasses.field(default_factory=list)
-
-
 class CausationMiddleware(banshee.message.Middleware):
     """
     Causation middleware.
@@ -42,14 +36,10 @@ class CausationMiddleware(banshee.message.Middleware):
     def __init__(self) -> None:
         super().__init__()
 
-        self._state: contextvars.ContextVar[_CausationState]
-        self._state = contextvars.ContextVar("_state")
-
-    def _get_state(self) -> _CausationState:
-        if not self._state.get(None):
-            self._state.set(_CausationState())
-
-        return self._state.get()
+        # the identity and correlation ids of the message currently being handled,
+        # held as an immutable value so concurrent tasks can't disturb each other
+        self._state: contextvars.ContextVar[tuple[uuid.UUID, uuid.UUID] | None]
+        self._state = contextvars.ContextVar("_state", default=None)
 
     async def __call__(
         self,
@@ -78,17 +68,17 @@ class CausationMiddleware(banshee.message.Middleware):
 
             return await handle(message)
 
-        state = self._get_state()
+        parent = self._state.get()
 
         context = message.get(banshee.context.Causation)
 
         if not context:
             # create a new context object as no existing one was found
-            if not state.stack:
+            if parent is None:
                 correlation_id = identity.unique_id
                 causation_id = identity.unique_id
             else:
-                causation_id, correlation_id = state.stack[-1]
+                causation_id, correlation_id = parent
 
             context = banshee.context.Causation(
                 causation_id=causation_id,
@@ -97,9 +87,9 @@ class CausationMiddleware(banshee.message.Middleware):
 
         message = message.including(context)
 
-        state.stack.append((identity.unique_id, correlation_id))
+        token = self._state.set((identity.unique_id, context.correlation_id))
 
         try:
             return await handle(message)
         finally:
-            state.stack.pop()
+            self._state.reset(token)
@@ -0,0 +1,98 @@
+"""
+Skip messages that have already been handled.
+"""
+
+import logging
+import typing
+
+import banshee.context
+import banshee.deduplication
+import banshee.message
+
+logger = logging.getLogger(__name__)
+
+T = typing.TypeVar("T")
+
+
+class DeduplicationMiddleware(banshee.message.Middleware):
+    """
+    Deduplication middleware.
+
+    Remember the :attr:`~banshee.Identity.unique_id` of each message handled
+    successfully, so a message delivered again, such as by an
+    :class:`~banshee.OutboxRelay` after a restart, isn't handled twice.
+
+    Duplicates aren't forwarded to the next handler in the chain, instead the
+    :class:`~banshee.Dispatch` contexts from the first time are added to the message,
+    when the store keeps them. Messages without an :class:`~banshee.Identity` context
+    are always forwarded.
+
+    Messages with a :class:`~banshee.HandleAfter` context are forwarded without being
+    remembered, as they're only postponed by a later middleware, such as the
+    :class:`~banshee.OutboxMiddleware`, and are handled when they're sent again.
+
+    :param store: store of seen identifiers, defaults to a
+        :class:`~banshee.LRUDeduplicationStore`
+    """
+
+    # pylint: disable=too-few-public-methods
+
+    def __init__(
+        self,
+        store: banshee.deduplication.DeduplicationStore | None = None,
+    ) -> None:
+        super().__init__()
+
+        if store is None:
+            store = banshee.deduplication.LRUDeduplicationStore()
+
+        self.store = store
+
+    async def __call__(
+        self,
+        message: banshee.message.Message[T],
+        handle: banshee.message.HandleMessage,
+    ) -> banshee.message.Message[T]:
+        """
+        Handle message.
+
+        Return duplicate messages with their stored contexts, otherwise forward the
+        message to the next handler in the chain and remember it.
+
+        :param message: message to process
+        :param handle: next middleware invoker
+
+        :returns: processed message
+        """
+        identity = message.get(banshee.context.Identity)
+
+        # postponed messages aren't handled yet, they're sent again when they are
+        if identity is None or message.has(banshee.context.HandleAfter):
+            return await handle(message)
+
+        dispatched = {context.name for context in message.all(banshee.context.Dispatch)}
+
+        contexts = self.store.get(identity.unique_id)
+
+        if contexts is not None:
+            logger.info(
+                "skipped duplicate %(request_class)s.",
+                extra={"request_class": type(message.request).__name__},
+            )
+
+            return message.including(
+                *(context for context in contexts if context.name not in dispatched)
+            )
+
+        result = await handle(message)
+
+        self.store.add(
+            identity.unique_id,
+            tuple(
+                context
+                for context in result.all(banshee.context.Dispatch)
+                if context.name not in dispatched
+            ),
+        )
+
+        return result
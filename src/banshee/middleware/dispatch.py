@@ -2,9 +2,13 @@
 Dispatch requests to handlers.
 """
 
+import collections.abc
+import functools
 import logging
+import time
 import typing
 
+import banshee.concurrency
 import banshee.context
 import banshee.message
 import banshee.request
@@ -14,6 +18,32 @@ logger = logging.getLogger(__name__)
 T = typing.TypeVar("T")
 
 
+class DispatchHook(typing.Protocol):
+    """
+    Dispatch hook protocol.
+
+    Called after each handler is dispatched, for example to record metrics, see
+    :class:`~banshee.Metrics`.
+    """
+
+    # pylint: disable=too-few-public-methods
+
+    def __call__(
+        self,
+        reference: banshee.request.HandlerReference[typing.Any],
+        duration: int,
+        error: Exception | None,
+        /,
+    ) -> None:
+        """
+        Dispatched.
+
+        :param reference: reference to the handler
+        :param duration: time to create and call the handler in nanoseconds
+        :param error: error raised by the handler, if any
+        """
+
+
 class DispatchMiddleware(banshee.message.Middleware):
     """
     Dispatch middleware.
@@ -27,10 +57,20 @@ class DispatchMiddleware(banshee.message.Middleware):
     and :class:`~banshee.Handler` instance to call.
 
     A :class:`~banshee.Dispatch` context will be added to the message for each
-    successful handler.
+    successful handler, in the order the locator returned them.
+
+    By default handlers are called one at a time, when `concurrency` is greater than
+    one, or `None`, handlers are instead called concurrently, each in their own
+    :class:`asyncio.Task`.
+
+    Each hook is called after a handler is dispatched, with how long it took, they're
+    only timed when there are hooks.
 
     :param locator: locator to lookup associated handlers for a message
     :param factory: factory to instantiate a concrete handler from a reference
+    :param concurrency: maximum number of handlers to call at once for each message,
+        or `None` for no limit
+    :param hooks: hooks to call after each handler is dispatched
     """
 
     # pylint: disable=too-few-public-methods
@@ -39,11 +79,70 @@ class DispatchMiddleware(banshee.message.Middleware):
         self,
         locator: banshee.request.HandlerLocator,
         factory: banshee.request.HandlerFactory,
+        concurrency: int | None = 1,
+        hooks: collections.abc.Iterable[DispatchHook] = (),
     ) -> None:
         super().__init__()
 
         self.locator = locator
         self.factory = factory
+        self.concurrency = banshee.concurrency.check_limit(concurrency)
+        self.hooks = tuple(hooks)
+
+    async def _dispatch(
+        self,
+        reference: banshee.request.HandlerReference[T],
+        request: T,
+    ) -> banshee.context.Dispatch | Exception:
+        """
+        Dispatch.
+
+        :param reference: reference to the handler
+        :param request: request to pass to the handler
+
+        :returns: context holding the handlers result, or the error it raised
+        """
+        start = time.perf_counter_ns() if self.hooks else 0
+
+        try:
+            handler = self.factory(reference)
+
+            if reference.batch:
+                # batch handlers take a list of requests, so send a batch of one
+                (result,) = await typing.cast(
+                    banshee.request.Handler[list[T]],
+                    handler,
+                )([request])
+            else:
+                result = await handler(request)
+        except Exception as error:  # pylint: disable=broad-except
+            if self.hooks:
+                self._call_hooks(reference, start, error)
+
+            return error
+
+        if self.hooks:
+            self._call_hooks(reference, start, None)
+
+        return banshee.context.Dispatch(name=reference.name, result=result)
+
+    def _call_hooks(
+        self,
+        reference: banshee.request.HandlerReference[T],
+        start: int,
+        error: Exception | None,
+    ) -> None:
+        """
+        Call hooks.
+
+        :param reference: reference to the handler
+        :param start: time the handler was dispatched in nanoseconds
+        :param error: error raised by the handler, if any
+        """
+        duration = time.perf_counter_ns() - start
+
+        for hook in self.hooks:
+            hook(reference, duration, error)
 
     async def __call__(
         self,
@@ -64,27 +163,41 @@ class DispatchMiddleware(banshee.message.Middleware):
         """
         extra = {"request_class": type(message.request).__name__}
 
-        errors = []
+        dispatched = {context.name for context in message.all(banshee.context.Dispatch)}
+
+        references = []
 
         for reference in self.locator.subscribers_for(message):
-            if any(
-                context.name == reference.name
-                for context in message.all(banshee.context.Dispatch)
-            ):
+            if reference.name in dispatched:
                 continue
 
-            try:
-                handler = self.factory(reference)
-                result = await handler(message.request)
-
-                message = message.including(
-                    banshee.context.Dispatch(
-                        name=reference.name,
-                        result=result,
-                    )
-                )
-            except Exception as error:  # pylint: disable=broad-except
-                errors.append(error)
+            dispatched.add(reference.name)
+            references.append(reference)
+
+        if self.concurrency == 1 or len(references) < 2:
+            outcomes = [
+                await self._dispatch(reference, message.request)
+                for reference in references
+            ]
+        else:
+            outcomes = await banshee.concurrency.gather(
+                (
+                    functools.partial(self._dispatch, reference, message.request)
+                    for reference in references
+                ),
+                self.concurrency,
+            )
+
+        contexts = []
+        errors = []
+
+        for outcome in outcomes:
+            if isinstance(outcome, Exception):
+                errors.append(outcome)
+            else:
+                contexts.append(outcome)
+
+        message = message.including(*contexts)
 
         if not message.has(banshee.context.Dispatch) and not errors:
             logger.info("no handlers for %(request_class)s found.", extra=extra)
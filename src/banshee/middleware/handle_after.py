@@ -2,18 +2,32 @@
 Postpone handling of nested requests.
 """
 
+import asyncio
 import collections
+import collections.abc
 import contextvars
 import dataclasses
+import functools
 import itertools
+import logging
 import typing
 
+import banshee.concurrency
 import banshee.context
 import banshee.errors
 import banshee.message
 
+logger = logging.getLogger(__name__)
+
 T = typing.TypeVar("T")
 
+_Postponed = tuple[banshee.message.Message[typing.Any], banshee.message.HandleMessage]
+
+#: runs a function returning an awaitable in the background
+Executor = collections.abc.Callable[
+    [collections.abc.Callable[[], collections.abc.Awaitable[None]]], typing.Any
+]
+
 
 @dataclasses.dataclass
 class _HandleAfterState:
@@ -22,9 +36,9 @@ class _HandleAfterState:
     """
 
     is_processing: bool = False
-    queue: collections.deque[
-        tuple[banshee.message.Message[typing.Any], banshee.message.HandleMessage]
-    ] = dataclasses.field(default_factory=collections.deque)
+    queue: collections.deque[_Postponed] = dataclasses.field(
+        default_factory=collections.deque
+    )
 
 
 class HandleAfterMiddleware(banshee.message.Middleware):
@@ -33,22 +47,257 @@ class HandleAfterMiddleware(banshee.message.Middleware):
 
     Postpone handling of specific messages until after the current handler has
     finished processing.
+
+    By default postponed messages are handled one at a time, when `concurrency` is
+    greater than one up to that many are handled at once, each in its own
+    :class:`asyncio.Task`. Either way messages postponed by a handler that fails are
+    dropped.
+
+    In background mode the postponed messages are handled in a background task once
+    the current handler has finished, rather than before the outer call returns.
+    Errors are passed to `on_error` as a :class:`~banshee.MultipleErrors`, and at
+    most `max_pending` background tasks run at once, further messages wait for one
+    to finish. Use :meth:`drain` to wait for them, such as on shutdown.
+
+    :param concurrency: maximum number of postponed messages to handle at once, or
+        `None` for no limit
+    :param background: handle postponed messages in the background
+    :param max_pending: maximum number of background tasks, or `None` for no limit
+    :param on_error: callback for errors from background tasks, by default they are
+        logged
+    :param executor: callable to run each background task, by default an
+        :class:`asyncio.Task` is created, setting it implies `background`
+
+    :raises banshee.errors.ConfigurationError: when `concurrency` or `max_pending` is
+        invalid
     """
 
-    # pylint: disable=too-few-public-methods
+    # pylint: disable=too-few-public-methods,too-many-instance-attributes
 
-    def __init__(self) -> None:
+    def __init__(
+        self,
+        *,
+        concurrency: int | None = 1,
+        background: bool = False,
+        max_pending: int | None = 100,
+        on_error: collections.abc.Callable[[Exception], typing.Any] | None = None,
+        executor: Executor | None = None,
+    ) -> None:
         super().__init__()
 
+        if max_pending is not None and max_pending < 1:
+            raise banshee.errors.ConfigurationError(
+                f"max_pending must be at least 1, got {max_pending}."
+            )
+
+        self.concurrency = banshee.concurrency.check_limit(concurrency)
+        self.background = background or executor is not None
+        self.max_pending = max_pending
+        self.on_error = on_error
+        self.executor = executor
+
         self._state: contextvars.ContextVar[_HandleAfterState]
         self._state = contextvars.ContextVar("_state")
 
+        self._slots = asyncio.Semaphore(max_pending) if max_pending else None
+        self._pending = 0
+        self._idle = asyncio.Event()
+        self._idle.set()
+        self._tasks: set["asyncio.Task[None]"] = set()
+
     def _get_state(self) -> _HandleAfterState:
         if not self._state.get(None):
             self._state.set(_HandleAfterState())
 
         return self._state.get()
 
+    async def _drain(self, state: _HandleAfterState) -> list[Exception]:
+        """
+        Drain.
+
+        Handle the postponed messages, including any they postpone in turn.
+
+        :param state: state holding the queue of postponed messages
+
+        :returns: errors raised while handling the messages
+        """
+        if self.concurrency != 1:
+            return await self._drain_concurrently(state)
+
+        errors: list[Exception] = []
+
+        while state.queue:  # pylint: disable=while-used
+            queued_message, queued_handle = state.queue.popleft()
+
+            count = len(state.queue)
+
+            try:
+                await queued_handle(queued_message)
+            except Exception as error:  # pylint: disable=broad-except
+                errors.append(error)
+
+                # drop any messages generated in the failed handler
+                state.queue = collections.deque(itertools.islice(state.queue, count))
+
+        return errors
+
+    async def _handle_postponed(
+        self,
+        message: banshee.message.Message[typing.Any],
+        handle: banshee.message.HandleMessage,
+    ) -> collections.deque[_Postponed]:
+        """
+        Handle postponed.
+
+        Handle a postponed message in its own task, collecting the messages it
+        postpones in turn.
+
+        :param message: postponed message
+        :param handle: next middleware invoker
+
+        :returns: messages postponed while handling the message
+        """
+        state = _HandleAfterState(is_processing=True)
+
+        self._state.set(state)
+
+        await handle(message)
+
+        return state.queue
+
+    async def _drain_concurrently(self, state: _HandleAfterState) -> list[Exception]:
+        """
+        Drain concurrently.
+
+        Handle the postponed messages with up to `concurrency` at once.
+
+        :param state: state holding the queue of postponed messages
+
+        :returns: errors raised while handling the messages
+        """
+        errors: list[Exception] = []
+        tasks: set[asyncio.Task[collections.deque[_Postponed]]] = set()
+
+        loop = asyncio.get_running_loop()
+
+        try:
+            while state.queue or tasks:  # pylint: disable=while-used
+                while state.queue and (  # pylint: disable=while-used
+                    self.concurrency is None or len(tasks) < self.concurrency
+                ):
+                    # each task runs in a copy of the current context, with its own
+                    # state, so it only collects the messages it postpones
+                    tasks.add(
+                        loop.create_task(self._handle_postponed(*state.queue.popleft()))
+                    )
+
+                done, tasks = await asyncio.wait(
+                    tasks, return_when=asyncio.FIRST_COMPLETED
+                )
+
+                for task in done:
+                    if error := task.exception():
+                        if not isinstance(error, Exception):
+                            raise error
+
+                        # drop any messages generated in the failed handler
+                        errors.append(error)
+                    else:
+                        state.queue.extend(task.result())
+        except BaseException:
+            await banshee.concurrency.cancel(tasks)
+
+            raise
+
+        return errors
+
+    async def _run(self, queue: collections.deque[_Postponed]) -> None:
+        """
+        Run.
+
+        Handle postponed messages in the background, reporting any errors.
+
+        :param queue: postponed messages
+        """
+        try:
+            state = _HandleAfterState(is_processing=True, queue=queue)
+
+            self._state.set(state)
+
+            errors = await self._drain(state)
+
+            state.is_processing = False
+
+            if errors:
+                error = banshee.errors.MultipleErrors(
+                    "errors while handling postponed messages.",
+                    errors,
+                )
+
+                if self.on_error:
+                    self.on_error(error)
+                else:
+                    logger.error(
+                        "errors while handling postponed messages.", exc_info=error
+                    )
+        finally:
+            self._release()
+
+    def _release(self) -> None:
+        """
+        Release.
+
+        Mark a background task as finished.
+        """
+        self._pending -= 1
+
+        if self._slots:
+            self._slots.release()
+
+        if not self._pending:
+            self._idle.set()
+
+    async def _spawn(self, queue: collections.deque[_Postponed]) -> None:
+        """
+        Spawn.
+
+        Start handling postponed messages in the background, waiting for a slot when
+        `max_pending` tasks are already running.
+
+        :param queue: postponed messages
+        """
+        if self._slots:
+            await self._slots.acquire()
+
+        self._pending += 1
+        self._idle.clear()
+
+        if self.executor:
+            try:
+                self.executor(functools.partial(self._run, queue))
+            except BaseException:
+                self._release()
+
+                raise
+
+            return
+
+        # the task runs in a copy of the current context, so its state is its own
+        task = asyncio.get_running_loop().create_task(self._run(queue))
+
+        # keep a reference, so the task isn't garbage collected before it's done
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    async def drain(self) -> None:
+        """
+        Drain.
+
+        Wait for every background task to finish, including those started while
+        waiting.
+        """
+        await self._idle.wait()
+
     async def __call__(
         self,
         message: banshee.message.Message[T],
@@ -102,22 +351,21 @@ class HandleAfterMiddleware(banshee.message.Middleware):
 
             raise
 
-        # all done, time to process all the deferred messages
+        if self.background:
+            # hand the deferred messages to a background task
+            queue = state.queue
 
-        errors: list[Exception] = []
+            state.queue = collections.deque()
+            state.is_processing = False
 
-        while state.queue:  # pylint: disable=while-used
-            queued_message, queued_handle = state.queue.popleft()
+            if queue:
+                await self._spawn(queue)
 
-            count = len(state.queue)
+            return result
 
-            try:
-                await queued_handle(queued_message)
-            except Exception as error:  # pylint: disable=broad-except
-                errors.append(error)
+        # all done, time to process all the deferred messages
 
-                # drop any messages generated in the failed handler
-                state.queue = collections.deque(itertools.islice(state.queue, count))
+        errors = await self._drain(state)
 
         # all done, unset the processing flag and stop deferring
         state.is_processing = False
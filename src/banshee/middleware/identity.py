@@ -6,6 +6,7 @@ import typing
 import uuid
 
 import banshee.context
+import banshee.identifiers
 import banshee.message
 
 T = typing.TypeVar("T")
@@ -18,10 +19,20 @@ class IdentityMiddleware(banshee.message.Middleware):
     Add unique identifiers for messages by adding an :class:`~banshee.context.Identity`
     context to each message with :attr:`~banshee.Identity.unique_id` set to a unique
     identifier.
+
+    Identifiers come from `generator`, by default :func:`uuid.uuid4`, use a
+    :class:`~banshee.UUID7Generator` for cheaper, time ordered identifiers.
+
+    :param generator: callable returning a new unique identifier
     """
 
     # pylint: disable=too-few-public-methods
 
+    def __init__(self, generator: banshee.identifiers.IdGenerator = uuid.uuid4) -> None:
+        super().__init__()
+
+        self.generator = generator
+
     async def __call__(
         self,
         message: banshee.message.Message[T],
@@ -40,7 +51,7 @@ class IdentityMiddleware(banshee.message.Middleware):
         """
         if not message.has(banshee.context.Identity):
             message = message.including(
-                banshee.context.Identity(unique_id=uuid.uuid4())
+                banshee.context.Identity(unique_id=self.generator())
             )
 
         return await handle(message)
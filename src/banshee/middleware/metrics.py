@@ -0,0 +1,74 @@
+"""
+Record request metrics.
+"""
+
+import time
+import typing
+
+import banshee.context
+import banshee.message
+import banshee.metrics
+
+T = typing.TypeVar("T")
+
+
+class MetricsMiddleware(banshee.message.Middleware):
+    """
+    Metrics middleware.
+
+    Record how long each request takes to handle, and whether it succeeded, failed,
+    or had no handlers, into a :class:`~banshee.Metrics` instance.
+
+    The time includes every middleware after this one in the chain, so add it first
+    to time the whole chain.
+
+    :param metrics: metrics to record into
+    """
+
+    # pylint: disable=too-few-public-methods
+
+    def __init__(self, metrics: banshee.metrics.Metrics) -> None:
+        super().__init__()
+
+        self.metrics = metrics
+
+    async def __call__(
+        self,
+        message: banshee.message.Message[T],
+        handle: banshee.message.HandleMessage,
+    ) -> banshee.message.Message[T]:
+        """
+        Handle message.
+
+        Forward the message to the next handler in the chain, and record how long it
+        took and the outcome.
+
+        :param message: message to process
+        :param handle: next middleware invoker
+
+        :returns: processed message
+        """
+        start = time.perf_counter_ns()
+
+        try:
+            result = await handle(message)
+        except Exception:
+            self.metrics.record_request(
+                type(message.request),
+                time.perf_counter_ns() - start,
+                banshee.metrics.FAILURE,
+            )
+
+            raise
+
+        self.metrics.record_request(
+            type(message.request),
+            time.perf_counter_ns() - start,
+            (
+                banshee.metrics.SUCCESS
+                if banshee.context.Dispatch in result
+                else banshee.metrics.NO_HANDLERS
+            ),
+        )
+
+        return result
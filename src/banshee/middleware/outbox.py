@@ -0,0 +1,85 @@
+"""
+Store postponed messages in an outbox.
+"""
+
+import contextvars
+import typing
+
+import banshee.context
+import banshee.message
+import banshee.outbox
+
+T = typing.TypeVar("T")
+
+
+class OutboxMiddleware(banshee.message.Middleware):
+    """
+    Outbox middleware.
+
+    A durable alternative to the :class:`~banshee.HandleAfterMiddleware`. Messages
+    sent from inside a handler with a :class:`~banshee.HandleAfter` context are
+    collected, and once the outer handler has finished successfully they are stored
+    in the outbox in a single transaction, for an :class:`~banshee.OutboxRelay` to
+    handle.
+
+    When a handler fails, the messages it postponed are discarded.
+
+    :param outbox: outbox to store postponed messages in
+    """
+
+    # pylint: disable=too-few-public-methods
+
+    def __init__(self, outbox: banshee.outbox.SQLiteOutbox) -> None:
+        super().__init__()
+
+        self.outbox = outbox
+
+        # messages postponed while handling the current outer message
+        self._postponed: contextvars.ContextVar[
+            list[banshee.message.Message[typing.Any]] | None
+        ]
+        self._postponed = contextvars.ContextVar("_postponed", default=None)
+
+    async def __call__(
+        self,
+        message: banshee.message.Message[T],
+        handle: banshee.message.HandleMessage,
+    ) -> banshee.message.Message[T]:
+        """
+        Handle message.
+
+        Collect the message if it's postponed, otherwise forward it to the next
+        handler in the chain, and then store the messages it postponed.
+
+        :param message: message to process
+        :param handle: next middleware invoker
+
+        :returns: processed message
+        """
+        postponed = self._postponed.get()
+
+        is_postponed = message.has(banshee.context.HandleAfter)
+
+        message = message.excluding(banshee.context.HandleAfter)
+
+        if postponed is not None:
+            if is_postponed:
+                postponed.append(message)
+
+                return message
+
+            # sent from inside a handler, but not postponed, so handle it nested
+            return await handle(message)
+
+        postponed = []
+
+        token = self._postponed.set(postponed)
+
+        try:
+            result = await handle(message)
+        finally:
+            self._postponed.reset(token)
+
+        await self.outbox.append(postponed)
+
+        return result
@@ -0,0 +1,117 @@
+"""
+Order messages that share a key.
+"""
+
+import asyncio
+import collections.abc
+import contextvars
+import typing
+
+import banshee.context
+import banshee.errors
+import banshee.message
+
+T = typing.TypeVar("T")
+
+
+class PartitionMiddleware(banshee.message.Middleware):
+    """
+    Partition middleware.
+
+    Hash a key for each message onto one of `partitions` serial lanes, so messages
+    with equal keys, such as commands for the same aggregate, are handled one at a
+    time in the order they arrive, while messages in other lanes run concurrently.
+
+    The key is taken from a :class:`~banshee.Partition` context when present,
+    otherwise from calling `key` with the request. Messages without a key aren't
+    ordered.
+
+    Messages sent while handling a message, such as from its handlers, are handled
+    straight away without waiting for a lane, even one held by another message, so
+    handlers in two lanes sending messages to each other's lanes can't deadlock.
+    They aren't ordered against other messages for their key.
+
+    :param key: callable returning the partition key for a request, or `None` for
+        no key
+    :param partitions: number of lanes
+
+    :raises banshee.errors.ConfigurationError: when the number of lanes is invalid
+    """
+
+    # pylint: disable=too-few-public-methods
+
+    def __init__(
+        self,
+        key: (
+            collections.abc.Callable[[typing.Any], collections.abc.Hashable | None]
+            | None
+        ) = None,
+        partitions: int = 16,
+    ) -> None:
+        super().__init__()
+
+        if partitions < 1:
+            raise banshee.errors.ConfigurationError(
+                f"partitions must be at least 1, got {partitions}."
+            )
+
+        self.key = key
+        self.partitions = partitions
+
+        # asyncio locks wake waiters in the order they started waiting
+        self._lanes = tuple(asyncio.Lock() for _ in range(partitions))
+        # whether a message is being handled in a lane in this context
+        self._holding = contextvars.ContextVar("_holding", default=False)
+
+    def lane_for(self, message: banshee.message.Message[typing.Any]) -> int | None:
+        """
+        Lane for.
+
+        :param message: message to find the lane for
+
+        :returns: index of the lane, or `None` when the message has no key
+        """
+        context = message.get(banshee.context.Partition)
+
+        if context is not None:
+            key = context.key
+        elif self.key is not None:
+            key = self.key(message.request)
+        else:
+            return None
+
+        if key is None:
+            return None
+
+        return hash(key) % self.partitions
+
+    async def __call__(
+        self,
+        message: banshee.message.Message[T],
+        handle: banshee.message.HandleMessage,
+    ) -> banshee.message.Message[T]:
+        """
+        Handle message.
+
+        Wait for the messages lane to be free, and then forward the message to the
+        next handler in the chain.
+
+        :param message: message to process
+        :param handle: next middleware invoker
+
+        :returns: processed message
+        """
+        lane = self.lane_for(message)
+
+        # waiting for a second lane while holding one could deadlock with a message
+        # holding that lane and waiting for this one
+        if lane is None or self._holding.get():
+            return await handle(message)
+
+        async with self._lanes[lane]:
+            token = self._holding.set(True)
+
+            try:
+                return await handle(message)
+            finally:
+                self._holding.reset(token)
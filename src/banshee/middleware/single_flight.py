@@ -0,0 +1,135 @@
+"""
+Coalesce concurrent identical requests.
+"""
+
+import asyncio
+import collections.abc
+import typing
+
+import banshee.context
+import banshee.message
+
+T = typing.TypeVar("T")
+
+
+class SingleFlightMiddleware(banshee.message.Middleware):
+    """
+    Single flight middleware.
+
+    Coalesce messages handled concurrently with equal requests, so only the first is
+    forwarded to the next handler in the chain, and the rest wait for it to finish
+    and share its :class:`~banshee.Dispatch` contexts, so the
+    :class:`~banshee.DispatchMiddleware` will skip the handlers.
+
+    Requests must be hashable to be coalesced, such as a frozen
+    :func:`~dataclasses.dataclass`, other requests are handled as normal.
+
+    If the first message fails, the error is raised for every waiting message, if
+    it's cancelled, the next waiting message takes its place.
+
+    :param types: request types to coalesce, or `None` for all types
+    """
+
+    # pylint: disable=too-few-public-methods
+
+    def __init__(self, types: collections.abc.Iterable[type] | None = None) -> None:
+        super().__init__()
+
+        self.types = frozenset(types) if types is not None else None
+
+        self._flights: dict[
+            tuple[type, typing.Any],
+            "asyncio.Future[tuple[banshee.context.Dispatch, ...]]",
+        ] = {}
+
+    async def _lead(
+        self,
+        key: tuple[type, typing.Any],
+        message: banshee.message.Message[T],
+        handle: banshee.message.HandleMessage,
+    ) -> banshee.message.Message[T]:
+        """
+        Lead.
+
+        Forward the message to the next handler in the chain, and share the new
+        dispatch contexts with any messages waiting on it.
+
+        :param key: key for the request
+        :param message: message to process
+        :param handle: next middleware invoker
+
+        :returns: processed message
+        """
+        future = self._flights[key] = asyncio.get_running_loop().create_future()
+
+        try:
+            dispatched = {
+                context.name for context in message.all(banshee.context.Dispatch)
+            }
+
+            result = await handle(message)
+
+            future.set_result(
+                tuple(
+                    context
+                    for context in result.all(banshee.context.Dispatch)
+                    if context.name not in dispatched
+                )
+            )
+
+            return result
+        except Exception as error:
+            future.set_exception(error)
+            # mark the error as retrieved, as there may be no one waiting for it
+            future.exception()
+
+            raise
+        finally:
+            future.cancel()
+
+            if self._flights.get(key) is future:
+                del self._flights[key]
+
+    async def __call__(
+        self,
+        message: banshee.message.Message[T],
+        handle: banshee.message.HandleMessage,
+    ) -> banshee.message.Message[T]:
+        """
+        Handle message.
+
+        Wait for a matching message in flight and share its result, otherwise
+        forward the message to the next handler in the chain.
+
+        :param message: message to process
+        :param handle: next middleware invoker
+
+        :returns: processed message
+        """
+        request_type = type(message.request)
+
+        if self.types is not None and request_type not in self.types:
+            return await handle(message)
+
+        key = (request_type, message.request)
+
+        while True:  # pylint: disable=while-used
+            try:
+                future = self._flights.get(key)
+            except TypeError:
+                # unhashable requests can't be coalesced
+                return await handle(message)
+
+            if future is None:
+                return await self._lead(key, message, handle)
+
+            try:
+                contexts = await asyncio.shield(future)
+            except asyncio.CancelledError:
+                if not future.cancelled():
+                    raise
+
+                # the message in flight was cancelled, so try again
+                continue
+
+            return await handle(message.including(*contexts))
@@ -0,0 +1,415 @@
+"""
+Store postponed messages durably until they are handled.
+"""
+
+import asyncio
+import collections.abc
+import dataclasses
+import logging
+import os
+import pickle
+import sqlite3
+import threading
+import time
+import typing
+
+import banshee.bus
+import banshee.errors
+import banshee.message
+
+logger = logging.getLogger(__name__)
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS banshee_outbox (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    payload BLOB NOT NULL,
+    attempts INTEGER NOT NULL DEFAULT 0,
+    created_at REAL NOT NULL
+);
+
+CREATE INDEX IF NOT EXISTS banshee_outbox_attempts ON banshee_outbox (attempts, id);
+"""
+
+
+class Serializer(typing.Protocol):
+    """
+    Serializer.
+
+    Convert messages to and from bytes for storage.
+    """
+
+    def dumps(self, message: banshee.message.Message[typing.Any]) -> bytes:
+        """
+        Dump message.
+
+        :param message: message to serialize
+
+        :returns: serialized message
+        """
+
+    def loads(self, data: bytes) -> banshee.message.Message[typing.Any]:
+        """
+        Load message.
+
+        :param data: serialized message
+
+        :returns: message
+        """
+
+
+class PickleSerializer(Serializer):
+    """
+    Pickle serializer.
+
+    Serialize the request and contexts of messages with :mod:`pickle`, so any
+    picklable request can be stored. Only load data written by your own application,
+    unpickling untrusted data can run arbitrary code.
+
+    :param protocol: pickle protocol version
+    """
+
+    def __init__(self, protocol: int = pickle.HIGHEST_PROTOCOL) -> None:
+        self.protocol = protocol
+
+    def dumps(self, message: banshee.message.Message[typing.Any]) -> bytes:
+        return pickle.dumps((message.request, tuple(message.contexts)), self.protocol)
+
+    def loads(self, data: bytes) -> banshee.message.Message[typing.Any]:
+        request, contexts = pickle.loads(data)
+
+        return banshee.message.message_for(request, contexts)
+
+
+@dataclasses.dataclass(frozen=True)
+class OutboxEntry:
+    """
+    Outbox entry.
+
+    A message waiting in the outbox.
+
+    :param id: position of the message in the outbox
+    :param message: stored message
+    :param attempts: number of times handling the message failed
+    """
+
+    #: position of the message in the outbox
+    id: int  # pylint: disable=invalid-name
+    #: stored message
+    message: banshee.message.Message[typing.Any]
+    #: number of times handling the message failed
+    attempts: int
+
+
+class SQLiteOutbox:
+    """
+    SQLite outbox.
+
+    Store messages in a SQLite database in write-ahead log mode, until they are
+    marked as done.
+
+    Database calls run in a thread, so they don't block the event loop.
+
+    :param path: path to the database file, it's created if it doesn't exist
+    :param serializer: serializer for messages, defaults to
+        :class:`~banshee.PickleSerializer`
+    """
+
+    def __init__(
+        self,
+        path: str | os.PathLike[str],
+        serializer: Serializer | None = None,
+    ) -> None:
+        self.path = path
+        self.serializer = serializer or PickleSerializer()
+
+        #: set whenever messages are appended
+        self.appended = asyncio.Event()
+
+        self._connection: sqlite3.Connection | None = None
+        self._lock = threading.Lock()
+
+    def _connect(self) -> sqlite3.Connection:
+        """
+        Connect.
+
+        Open the database on first use, the lock must be held.
+
+        :returns: database connection
+        """
+        if self._connection is None:
+            connection = sqlite3.connect(self.path, check_same_thread=False)
+
+            connection.execute("PRAGMA journal_mode=WAL")
+            # in WAL mode, commits survive an application crash, only losing the
+            # latest commits on power loss
+            connection.execute("PRAGMA synchronous=NORMAL")
+            connection.executescript(_SCHEMA)
+
+            self._connection = connection
+
+        return self._connection
+
+    def _execute(
+        self,
+        sql: str,
+        parameters: collections.abc.Iterable[collections.abc.Sequence[typing.Any]],
+    ) -> None:
+        """
+        Execute.
+
+        Run a statement once for each set of parameters, in a single transaction.
+
+        :param sql: statement
+        :param parameters: parameters for each execution
+        """
+        with self._lock:
+            connection = self._connect()
+
+            with connection:
+                connection.executemany(sql, parameters)
+
+    def _select(
+        self, sql: str, parameters: collections.abc.Sequence[typing.Any]
+    ) -> list[typing.Any]:
+        """
+        Select.
+
+        :param sql: query
+        :param parameters: query parameters
+
+        :returns: rows
+        """
+        with self._lock:
+            return self._connect().execute(sql, parameters).fetchall()
+
+    async def append(
+        self, messages: collections.abc.Iterable[banshee.message.Message[typing.Any]]
+    ) -> None:
+        """
+        Append.
+
+        Store messages in a single transaction.
+
+        :param messages: messages to store
+        """
+        now = time.time()
+
+        rows = [(self.serializer.dumps(message), now) for message in messages]
+
+        if not rows:
+            return
+
+        await asyncio.to_thread(
+            self._execute,
+            "INSERT INTO banshee_outbox (payload, created_at) VALUES (?, ?)",
+            rows,
+        )
+
+        self.appended.set()
+
+    async def pending(
+        self,
+        limit: int = 100,
+        max_attempts: int | None = None,
+    ) -> list[OutboxEntry]:
+        """
+        Pending.
+
+        :param limit: maximum number of messages to return
+        :param max_attempts: skip messages that have failed this many times
+
+        :returns: messages not yet done, those tried fewest times first, then oldest
+            first, so messages that keep failing don't hold up the rest
+        """
+        rows = await asyncio.to_thread(
+            self._select,
+            "SELECT id, payload, attempts FROM banshee_outbox WHERE attempts < ? "
+            "ORDER BY attempts, id LIMIT ?",
+            (max_attempts if max_attempts is not None else 2**63 - 1, limit),
+        )
+
+        return [
+            OutboxEntry(id=id_, message=self.serializer.loads(payload), attempts=count)
+            for id_, payload, count in rows
+        ]
+
+    async def complete(self, ids: collections.abc.Iterable[int]) -> None:
+        """
+        Complete.
+
+        Mark messages as done, removing them from the outbox.
+
+        :param ids: identifiers of the messages
+        """
+        await asyncio.to_thread(
+            self._execute,
+            "DELETE FROM banshee_outbox WHERE id = ?",
+            [(id_,) for id_ in ids],
+        )
+
+    async def fail(self, ids: collections.abc.Iterable[int]) -> None:
+        """
+        Fail.
+
+        Record a failed attempt to handle messages.
+
+        :param ids: identifiers of the messages
+        """
+        await asyncio.to_thread(
+            self._execute,
+            "UPDATE banshee_outbox SET attempts = attempts + 1 WHERE id = ?",
+            [(id_,) for id_ in ids],
+        )
+
+    async def count(self) -> int:
+        """
+        Count.
+
+        :returns: number of messages not yet done
+        """
+        rows = await asyncio.to_thread(
+            self._select, "SELECT COUNT(*) FROM banshee_outbox", ()
+        )
+
+        return typing.cast(int, rows[0][0])
+
+    def close(self) -> None:
+        """
+        Close.
+
+        Close the database connection, it's reopened if the outbox is used again.
+        """
+        with self._lock:
+            if self._connection is not None:
+                self._connection.close()
+
+                self._connection = None
+
+
+class OutboxRelay:
+    """
+    Outbox relay.
+
+    Handle the messages stored in an outbox with a bus, oldest first, and mark them
+    as done once handled. Messages that have failed before are retried after those
+    that haven't, so they don't hold up the rest.
+
+    Messages are marked done in batches, so after a crash or restart some messages
+    may be handled again, handlers should be idempotent. Failed messages stay in the
+    outbox and are retried on the next pass, until they have failed `max_attempts`
+    times. Run a single relay for each outbox.
+
+    :param outbox: outbox to read messages from
+    :param bus: bus to handle messages with
+    :param batch_size: maximum number of messages to handle in each pass
+    :param poll_interval: seconds to wait for new messages between passes
+    :param max_attempts: number of times to try a message, or `None` for no limit
+    :param on_error: callback for errors handling a message, by default they are
+        logged
+
+    :raises banshee.errors.ConfigurationError: when the batch size or attempts are
+        invalid
+    """
+
+    # pylint: disable=too-few-public-methods
+
+    def __init__(
+        self,
+        outbox: SQLiteOutbox,
+        bus: banshee.bus.Bus,
+        *,
+        batch_size: int = 100,
+        poll_interval: float = 1.0,
+        max_attempts: int | None = None,
+        on_error: (
+            collections.abc.Callable[
+                [banshee.message.Message[typing.Any], Exception], typing.Any
+            ]
+            | None
+        ) = None,
+    ) -> None:
+        # pylint: disable=too-many-arguments
+
+        if batch_size < 1:
+            raise banshee.errors.ConfigurationError(
+                f"batch_size must be at least 1, got {batch_size}."
+            )
+
+        if max_attempts is not None and max_attempts < 1:
+            raise banshee.errors.ConfigurationError(
+                f"max_attempts must be at least 1, got {max_attempts}."
+            )
+
+        self.outbox = outbox
+        self.bus = bus
+        self.batch_size = batch_size
+        self.poll_interval = poll_interval
+        self.max_attempts = max_attempts
+        self.on_error = on_error
+
+    async def relay(self) -> int:
+        """
+        Relay.
+
+        Handle a batch of messages from the outbox.
+
+        :returns: number of messages handled successfully
+        """
+        self.outbox.appended.clear()
+
+        entries = await self.outbox.pending(self.batch_size, self.max_attempts)
+
+        done: list[int] = []
+        failed: list[int] = []
+
+        try:
+            for entry in entries:
+                try:
+                    await self.bus.handle(entry.message)
+                except Exception as error:  # pylint: disable=broad-except
+                    failed.append(entry.id)
+
+                    if self.on_error:
+                        self.on_error(entry.message, error)
+                    else:
+                        extra = {"request_class": type(entry.message.request).__name__}
+
+                        logger.exception(
+                            "error relaying %(request_class)s.", extra=extra
+                        )
+                else:
+                    done.append(entry.id)
+        finally:
+            # record progress even when cancelled, to avoid handling messages again
+            await asyncio.shield(self._record(done, failed))
+
+        return len(done)
+
+    async def _record(self, done: list[int], failed: list[int]) -> None:
+        """
+        Record.
+
+        :param done: identifiers of messages handled successfully
+        :param failed: identifiers of messages that failed
+        """
+        if done:
+            await self.outbox.complete(done)
+
+        if failed:
+            await self.outbox.fail(failed)
+
+    async def run(self) -> None:
+        """
+        Run.
+
+        Relay messages until cancelled, waiting for new messages to be appended, or
+        `poll_interval` seconds, whenever the outbox is drained.
+        """
+        while True:  # pylint: disable=while-used
+            if await self.relay() < self.batch_size:
+                try:
+                    await asyncio.wait_for(
+                        self.outbox.appended.wait(), self.poll_interval
+                    )
+                except asyncio.TimeoutError:
+                    pass
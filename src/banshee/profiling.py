@@ -0,0 +1,275 @@
+"""
+Profile time spent in each middleware.
+"""
+
+import collections.abc
+import contextvars
+import dataclasses
+import time
+import typing
+
+import banshee.message
+
+T = typing.TypeVar("T")
+
+
+class _Frame:  # pylint: disable=too-few-public-methods
+    """
+    Frame.
+
+    Time spent in the middleware called by the current middleware.
+    """
+
+    __slots__ = ("children",)
+
+    def __init__(self) -> None:
+        self.children = 0
+
+
+class _Timing:  # pylint: disable=too-few-public-methods
+    """
+    Timing.
+
+    Running totals for a middleware and request type.
+    """
+
+    __slots__ = ("calls", "inclusive", "exclusive")
+
+    def __init__(self) -> None:
+        self.calls = 0
+        self.inclusive = 0
+        self.exclusive = 0
+
+
+_frame: contextvars.ContextVar[_Frame | None] = contextvars.ContextVar(
+    "_frame", default=None
+)
+
+
+@dataclasses.dataclass(frozen=True)
+class ProfileRow:
+    """
+    Profile row.
+
+    Time spent in a middleware for a request type.
+
+    :param request_type: name of the request type
+    :param position: position of the middleware in the chain, from zero
+    :param middleware: name of the middleware
+    :param calls: number of times the middleware was called
+    :param inclusive: total time in nanoseconds, including the rest of the chain
+    :param exclusive: total time in nanoseconds, excluding the rest of the chain
+    """
+
+    #: name of the request type
+    request_type: str
+    #: position of the middleware in the chain, from zero
+    position: int
+    #: name of the middleware
+    middleware: str
+    #: number of times the middleware was called
+    calls: int
+    #: total time in nanoseconds, including the rest of the chain
+    inclusive: int
+    #: total time in nanoseconds, excluding the rest of the chain
+    exclusive: int
+
+
+class _ProfiledMiddleware(banshee.message.Middleware):
+    """
+    Profiled middleware.
+
+    Time a middleware, subtracting the time spent in the middleware it calls.
+
+    :param profiler: profiler to record into
+    :param position: position of the middleware in the chain
+    :param middleware: middleware to time
+    """
+
+    # pylint: disable=too-few-public-methods
+
+    __slots__ = ("profiler", "position", "name", "middleware")
+
+    def __init__(
+        self,
+        profiler: "Profiler",
+        position: int,
+        middleware: banshee.message.Middleware,
+    ) -> None:
+        super().__init__()
+
+        self.profiler = profiler
+        self.position = position
+        self.name: str = getattr(middleware, "__name__", type(middleware).__name__)
+        self.middleware = middleware
+
+    async def __call__(
+        self,
+        message: banshee.message.Message[T],
+        handle: banshee.message.HandleMessage,
+    ) -> banshee.message.Message[T]:
+        parent = _frame.get()
+        frame = _Frame()
+        token = _frame.set(frame)
+        start = time.perf_counter_ns()
+
+        try:
+            return await self.middleware(message, handle)
+        finally:
+            inclusive = time.perf_counter_ns() - start
+
+            _frame.reset(token)
+
+            if parent is not None:
+                parent.children += inclusive
+
+            self.profiler.record(
+                type(message.request),
+                self.position,
+                self.name,
+                inclusive,
+                # children may overlap when run concurrently
+                max(inclusive - frame.children, 0),
+            )
+
+
+class Profiler:
+    """
+    Profiler.
+
+    Measure the time spent in each middleware of a :class:`~banshee.MessageBus`, for
+    each request type, both inclusive of the rest of the chain, and exclusive of it,
+    its self time.
+
+    Times are wall clock times, so they include time waiting on other tasks.
+
+    .. code-block:: python
+
+        profiler = banshee.Profiler()
+
+        bus = banshee.Builder().with_profiler(profiler) ... .build()
+
+        print(profiler.table())
+    """
+
+    def __init__(self) -> None:
+        self._timings: dict[tuple[type, int, str], _Timing] = {}
+
+    def instrument(
+        self,
+        middleware: collections.abc.Iterable[banshee.message.Middleware],
+    ) -> tuple[banshee.message.Middleware, ...]:
+        """
+        Instrument.
+
+        :param middleware: middleware instances in the order they are called
+
+        :returns: middleware instances wrapped to record their timings
+        """
+        return tuple(
+            _ProfiledMiddleware(self, position, item)
+            for position, item in enumerate(middleware)
+        )
+
+    def record(
+        self,
+        request_type: type,
+        position: int,
+        name: str,
+        inclusive: int,
+        exclusive: int,
+    ) -> None:
+        """
+        Record.
+
+        :param request_type: type of request
+        :param position: position of the middleware in the chain
+        :param name: name of the middleware
+        :param inclusive: time in nanoseconds, including the rest of the chain
+        :param exclusive: time in nanoseconds, excluding the rest of the chain
+        """
+        # pylint: disable=too-many-arguments
+
+        key = (request_type, position, name)
+
+        try:
+            timing = self._timings[key]
+        except KeyError:
+            timing = self._timings[key] = _Timing()
+
+        timing.calls += 1
+        timing.inclusive += inclusive
+        timing.exclusive += exclusive
+
+    def reset(self) -> None:
+        """
+        Reset.
+
+        Clear everything recorded.
+        """
+        self._timings.clear()
+
+    def rows(self) -> list[ProfileRow]:
+        """
+        Rows.
+
+        :returns: timings for each request type and middleware, in chain order
+        """
+        rows = [
+            ProfileRow(
+                request_type=request_type.__qualname__,
+                position=position,
+                middleware=name,
+                calls=timing.calls,
+                inclusive=timing.inclusive,
+                exclusive=timing.exclusive,
+            )
+            for (request_type, position, name), timing in self._timings.items()
+        ]
+
+        return sorted(rows, key=lambda row: (row.request_type, row.position))
+
+    def table(self) -> str:
+        """
+        Table.
+
+        :returns: timings formatted as a plain text table
+        """
+        header = (
+            "request type",
+            "#",
+            "middleware",
+            "calls",
+            "inclusive ms",
+            "self ms",
+            "self %",
+            "mean self µs",
+        )
+
+        lines = [header]
+
+        for row in self.rows():
+            share = row.exclusive / row.inclusive * 100 if row.inclusive else 0.0
+
+            lines.append(
+                (
+                    row.request_type,
+                    str(row.position),
+                    row.middleware,
+                    str(row.calls),
+                    f"{row.inclusive / 1e6:.3f}",
+                    f"{row.exclusive / 1e6:.3f}",
+                    f"{share:.1f}",
+                    f"{row.exclusive / row.calls / 1e3:.2f}",
+                )
+            )
+
+        widths = [max(len(line[i]) for line in lines) for i in range(len(header))]
+
+        return "\n".join(
+            "  ".join(
+                value.ljust(width) if i in {0, 2} else value.rjust(width)
+                for i, (value, width) in enumerate(zip(line, widths))
+            ).rstrip()
+            for line in lines
+        )
@@ -0,0 +1,376 @@
+"""
+Handle messages on a pool of worker tasks.
+"""
+
+import asyncio
+import collections.abc
+import contextvars
+import dataclasses
+import enum
+import logging
+import typing
+
+import banshee.bus
+import banshee.concurrency
+import banshee.errors
+import banshee.message
+
+logger = logging.getLogger(__name__)
+
+T = typing.TypeVar("T")
+
+
+class Backpressure(enum.Enum):
+    """
+    Backpressure.
+
+    What to do when a message is sent to a :class:`QueuedBus` whose queue is full.
+    """
+
+    #: wait for space in the queue
+    BLOCK = "block"
+    #: discard the message
+    DROP = "drop"
+    #: raise a :class:`~banshee.QueueFullError`
+    RAISE = "raise"
+
+
+@dataclasses.dataclass(frozen=True, slots=True)
+class _Item:
+    """
+    Queued message.
+    """
+
+    message: banshee.message.Message[typing.Any]
+    future: "asyncio.Future[banshee.message.Message[typing.Any]] | None"
+
+
+class QueuedBus(banshee.bus.Bus):
+    """
+    Queued bus.
+
+    A :class:`~banshee.Bus` decorator that puts messages on a bounded queue, which
+    a pool of worker tasks take them from to be handled by the inner bus, so a slow
+    handler doesn't hold up the task sending the message.
+
+    :meth:`handle` waits for the processed message, :meth:`submit` returns a future
+    for it as soon as the message is queued, and :meth:`post` doesn't wait at all,
+    logging any errors instead.
+
+    Messages are handled in the worker tasks, so context variables set in the task
+    sending a message, such as the causation of a message sent from a handler, are
+    not carried over.
+
+    Messages sent to :meth:`handle` from a worker, such as by a handler, are handled
+    straight away by the inner bus rather than queued, as waiting for a worker from
+    one could deadlock when every worker is waiting.
+
+    The workers are started when the first message is sent, or on entering the bus
+    as an async context manager. Call :meth:`close` to handle the remaining messages
+    and stop the workers.
+
+    :param inner: decorated instance
+    :param workers: number of worker tasks
+    :param max_size: maximum number of messages waiting in the queue, or `None` for
+        no limit
+    :param backpressure: what to do when the queue is full
+
+    :raises banshee.errors.ConfigurationError: when the workers or size are invalid
+    """
+
+    # pylint: disable=too-many-instance-attributes
+
+    def __init__(
+        self,
+        inner: banshee.bus.Bus,
+        *,
+        workers: int = 1,
+        max_size: int | None = 1000,
+        backpressure: Backpressure = Backpressure.BLOCK,
+    ) -> None:
+        if workers < 1:
+            raise banshee.errors.ConfigurationError(
+                f"workers must be at least 1, got {workers}."
+            )
+
+        if max_size is not None and max_size < 1:
+            raise banshee.errors.ConfigurationError(
+                f"max_size must be at least 1, got {max_size}."
+            )
+
+        self.inner = inner
+        self.workers = workers
+        self.max_size = max_size
+        self.backpressure = backpressure
+
+        self._queue: asyncio.Queue[_Item] = asyncio.Queue(max_size or 0)
+        self._tasks: set["asyncio.Task[None]"] = set()
+        # whether the current task is one of the workers
+        self._worker = contextvars.ContextVar("_worker", default=False)
+        # closed to new messages, and then stopped once the workers are cancelled
+        self._closed = False
+        self._stopped = False
+
+    def __len__(self) -> int:
+        return self._queue.qsize()
+
+    async def __aenter__(self) -> "QueuedBus":
+        self.start()
+
+        return self
+
+    async def __aexit__(self, *args: typing.Any) -> None:
+        await self.close()
+
+    @property
+    def closed(self) -> bool:
+        """
+        Closed.
+
+        :returns: whether :meth:`close` has been called
+        """
+        return self._closed
+
+    def start(self) -> None:
+        """
+        Start.
+
+        Start the worker tasks, if they aren't already running.
+
+        :raises banshee.errors.BusClosedError: when the bus is closed
+        """
+        if self._closed:
+            raise banshee.errors.BusClosedError("bus is closed.")
+
+        loop = asyncio.get_running_loop()
+
+        for _ in range(self.workers - len(self._tasks)):
+            # start from an empty context, so workers don't share the context of
+            # whichever task happened to start them
+            task = contextvars.Context().run(loop.create_task, self._work())
+
+            self._tasks.add(task)
+
+    async def close(self, timeout: float | None = None) -> None:
+        """
+        Close.
+
+        Stop accepting messages, wait for the queued messages to be handled, and then
+        stop the workers.
+
+        Any messages not handled within `timeout` are discarded, and waiting callers
+        get a :class:`~banshee.BusClosedError`.
+
+        :param timeout: seconds to wait for queued messages, or `None` to wait for
+            all of them
+        """
+        self._closed = True
+
+        try:
+            if self._tasks:
+                await asyncio.wait_for(self._queue.join(), timeout)
+        except asyncio.TimeoutError:
+            pass
+        finally:
+            await banshee.concurrency.cancel(self._tasks)
+
+            self._tasks.clear()
+            self._stopped = True
+
+            self._discard()
+
+    def _discard(self) -> None:
+        """
+        Discard.
+
+        Remove every message from the queue, failing their futures.
+        """
+        while not self._queue.empty():  # pylint: disable=while-used
+            item = self._queue.get_nowait()
+            self._queue.task_done()
+
+            if item.future is not None and not item.future.done():
+                item.future.set_exception(
+                    banshee.errors.BusClosedError(
+                        "bus closed before the message was handled."
+                    )
+                )
+
+    async def _put(
+        self,
+        message: banshee.message.Message[typing.Any],
+        future: "asyncio.Future[banshee.message.Message[typing.Any]] | None",
+    ) -> bool:
+        """
+        Put.
+
+        :param message: message to queue
+        :param future: future for the processed message, or `None` to not wait
+
+        :returns: whether the message was queued
+
+        :raises banshee.errors.BusClosedError: when the bus is closed
+        :raises banshee.errors.QueueFullError: when the queue is full and the
+            backpressure is :attr:`Backpressure.RAISE`
+        """
+        self.start()
+
+        item = _Item(message=message, future=future)
+
+        if self.backpressure is Backpressure.BLOCK:
+            await self._queue.put(item)
+
+            if self._stopped:
+                # the workers stopped while we were waiting for space
+                if future is not None:
+                    future.cancel()
+
+                self._discard()
+
+                raise banshee.errors.BusClosedError("bus is closed.")
+
+            return True
+
+        try:
+            self._queue.put_nowait(item)
+        except asyncio.QueueFull:
+            if self.backpressure is Backpressure.DROP:
+                return False
+
+            raise banshee.errors.QueueFullError(
+                f"queue is full, with {self.max_size} messages waiting."
+            ) from None
+
+        return True
+
+    async def _work(self) -> None:
+        """
+        Work.
+
+        Handle messages from the queue until cancelled.
+        """
+        self._worker.set(True)
+
+        while True:  # pylint: disable=while-used
+            item = await self._queue.get()
+
+            try:
+                await self._process(item)
+            finally:
+                self._queue.task_done()
+
+    async def _process(self, item: _Item) -> None:
+        """
+        Process.
+
+        :param item: queued message to handle
+        """
+        if item.future is not None and item.future.done():
+            # the caller stopped waiting, so there is no-one to handle it for
+            return
+
+        try:
+            result = await self.inner.handle(item.message)
+        except Exception as error:  # pylint: disable=broad-except
+            if item.future is None:
+                extra = {"request_class": type(item.message.request).__name__}
+
+                logger.exception("error handling %(request_class)s.", extra=extra)
+            elif not item.future.done():
+                item.future.set_exception(error)
+
+            return
+        except asyncio.CancelledError:
+            # the bus was closed while handling the message
+            if item.future is not None and not item.future.done():
+                item.future.set_exception(
+                    banshee.errors.BusClosedError(
+                        "bus closed before the message was handled."
+                    )
+                )
+
+            raise
+
+        if item.future is not None and not item.future.done():
+            item.future.set_result(result)
+
+    async def submit(
+        self,
+        request: T | banshee.message.Message[T],
+        contexts: collections.abc.Iterable[typing.Any] | None = None,
+    ) -> "asyncio.Future[banshee.message.Message[T]]":
+        """
+        Submit.
+
+        Queue a message, waiting for space if the backpressure is
+        :attr:`Backpressure.BLOCK`.
+
+        :param request: request instance
+        :param contexts: additional context objects
+
+        :returns: future for the processed message
+
+        :raises banshee.errors.BusClosedError: when the bus is closed
+        :raises banshee.errors.QueueFullError: when the queue is full, unless the
+            backpressure is :attr:`Backpressure.BLOCK`
+        """
+        message = banshee.message.message_for(request, contexts)
+
+        future: asyncio.Future[banshee.message.Message[typing.Any]]
+        future = asyncio.get_running_loop().create_future()
+
+        if not await self._put(message, future):
+            raise banshee.errors.QueueFullError(
+                f"queue is full, with {self.max_size} messages waiting."
+            )
+
+        return typing.cast("asyncio.Future[banshee.message.Message[T]]", future)
+
+    async def post(
+        self,
+        request: typing.Any,
+        contexts: collections.abc.Iterable[typing.Any] | None = None,
+    ) -> bool:
+        """
+        Post.
+
+        Queue a message without waiting for it to be handled, any errors handling it
+        are logged.
+
+        :param request: request instance
+        :param contexts: additional context objects
+
+        :returns: whether the message was queued, `False` when it was dropped
+
+        :raises banshee.errors.BusClosedError: when the bus is closed
+        :raises banshee.errors.QueueFullError: when the queue is full and the
+            backpressure is :attr:`Backpressure.RAISE`
+        """
+        return await self._put(banshee.message.message_for(request, contexts), None)
+
+    async def handle(
+        self,
+        request: T | banshee.message.Message[T],
+        contexts: collections.abc.Iterable[typing.Any] | None = None,
+    ) -> banshee.message.Message[T]:
+        """
+        Handle.
+
+        Queue a message and wait for it to be handled, see :meth:`submit`. When
+        called from a worker the message is handled straight away instead.
+
+        :param request: request instance
+        :param contexts: additional context objects
+
+        :returns: processed message
+
+        :raises banshee.errors.BusClosedError: when the bus is closed
+        :raises banshee.errors.QueueFullError: when the queue is full, unless the
+            backpressure is :attr:`Backpressure.BLOCK`
+        """
+        if self._worker.get():
+            return await self.inner.handle(request, contexts)
+
+        future = await self.submit(request, contexts)
+
+        return await future
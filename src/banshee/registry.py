@@ -2,13 +2,16 @@
 A registry of handlers.
 """
 
+import asyncio
 import collections
 import collections.abc
 import inspect
+import sys
 import types
 import typing
 
 import banshee.errors
+import banshee.message
 import banshee.request
 
 T = typing.TypeVar("T")
@@ -18,22 +21,73 @@ H = typing.TypeVar(
 )
 
 
+def _path_for(cls: type) -> str:
+    """
+    Path for class.
+
+    :param cls: class for which to get an import string
+
+    :returns: import string, such as `"package.module:attr"`
+    """
+    return f"{cls.__module__}:{cls.__qualname__}"
+
+
+def _loaded(path: str) -> object | None:
+    """
+    Get loaded object.
+
+    Get the object for an import string, only if its module is already imported.
+
+    :param path: import string, such as `"package.module:attr"`
+
+    :returns: object, or `None` if it's not loaded
+    """
+    module_name, attr = banshee.request.split_import_string(path)
+
+    target: object | None = sys.modules.get(module_name)
+
+    for part in attr.split("."):
+        target = getattr(target, part, None)
+
+    return target
+
+
 class Registry(banshee.request.HandlerLocator):
     """
     Registry.
 
     Provides a means to register and lookup objects.
+
+    Subscribers are resolved once for each concrete request type and cached, the
+    cache is cleared on each new subscription.
+
+    Handlers and request types may be given as import strings, such as
+    `"package.module:attr"`, so modules are only imported when needed. Handlers are
+    imported on first dispatch, or ahead of time by :meth:`warm_up`, and request types
+    are matched by name without being imported. Virtual subclasses of an abstract base
+    class given as an import string only match once its module has been imported.
     """
 
-    __slots__ = ("_subscriptions",)
+    __slots__ = ("_subscriptions", "_polymorphic", "_resolved", "_modules")
 
     _subscriptions: collections.defaultdict[
-        type,
+        type | str,
+        list[banshee.request.HandlerReference[typing.Any]],
+    ]
+    _polymorphic: collections.defaultdict[
+        type | str,
         list[banshee.request.HandlerReference[typing.Any]],
     ]
+    _resolved: dict[type, tuple[banshee.request.HandlerReference[typing.Any], ...]]
+    # number of imported modules when subscribers were resolved while a polymorphic
+    # import string wasn't loaded, so the cache is cleared once more are imported
+    _modules: int | None
 
     def __init__(self) -> None:
         self._subscriptions = collections.defaultdict(list)
+        self._polymorphic = collections.defaultdict(list)
+        self._resolved = {}
+        self._modules = None
 
     def _name_for(self, target: object) -> str:
         """
@@ -91,9 +145,13 @@ class Registry(banshee.request.HandlerLocator):
 
     def subscribe(
         self,
-        handler: type | collections.abc.Callable[..., typing.Any],
-        to: type,
+        handler: type | collections.abc.Callable[..., typing.Any] | str,
+        to: type | str,
         name: str | None = None,
+        *,
+        batch: bool = False,
+        polymorphic: bool = False,
+        lifetime: banshee.request.Lifetime = banshee.request.Lifetime.TRANSIENT,
     ) -> None:
         """
         Subscribe.
@@ -103,21 +161,63 @@ class Registry(banshee.request.HandlerLocator):
         When no name is provided, then the registry will try and infer a unique name
         based on the module and name of the decorated function or class.
 
-        :param handler: callable or type to act as subscriber
-        :param to: type of request for subscription
+        Batch handlers take a list of requests and return a list of results in the
+        same order, see :class:`~banshee.BatchMiddleware`.
+
+        Polymorphic subscriptions also receive requests of any subclass of the type,
+        including virtual subclasses of an :class:`abc.ABC`.
+
+        The handler and the request type may be import strings, such as
+        `"package.module:attr"`, see :class:`Registry`.
+
+        The lifetime controls how long an instance of a handler class is reused for,
+        see :class:`~banshee.Lifetime`.
+
+        :param handler: callable or type to act as subscriber, or an import string
+        :param to: type of request for subscription, or an import string
         :param name: optional unique name for the handler
+        :param batch: whether the handler takes a list of requests
+        :param polymorphic: whether the handler receives requests of subclasses
+        :param lifetime: how long an instance of a handler class is reused for
+
+        :raises banshee.errors.ConfigurationError: when a polymorphic subscription is
+            not to a class, or an import string is invalid
         """
-        self._subscriptions[to].append(
+        # pylint: disable=too-many-arguments
+
+        if isinstance(handler, str):
+            # import strings are named the same as the object they import
+            name = name or ".".join(banshee.request.split_import_string(handler))
+
+        if isinstance(to, str):
+            banshee.request.split_import_string(to)
+        elif polymorphic and (not inspect.isclass(to) or typing.get_args(to)):
+            raise banshee.errors.ConfigurationError(
+                f"polymorphic subscription to {self._name_for(to)} must be to a class."
+            )
+
+        subscriptions = self._polymorphic if polymorphic else self._subscriptions
+
+        subscriptions[to].append(
             banshee.request.HandlerReference(
                 name=name or self._name_for(handler),
                 handler=handler,
+                batch=batch,
+                lifetime=lifetime,
             )
         )
 
+        self._resolved.clear()
+        self._modules = None
+
     def subscribe_to(
         self,
-        to: type,
+        to: type | str,
         name: str | None = None,
+        *,
+        batch: bool = False,
+        polymorphic: bool = False,
+        lifetime: banshee.request.Lifetime = banshee.request.Lifetime.TRANSIENT,
     ) -> collections.abc.Callable[[H], H]:
         """
         Subscribe to.
@@ -128,14 +228,24 @@ class Registry(banshee.request.HandlerLocator):
         When no name is provided, then the registry will try and infer a unique name
         based on the module and name of the decorated function or class.
 
-        :param to: type of request for subscription
+        :param to: type of request for subscription, or an import string
         :param name: optional unique name for the handler
+        :param batch: whether the handler takes a list of requests
+        :param polymorphic: whether the handler receives requests of subclasses
+        :param lifetime: how long an instance of a handler class is reused for
 
         :returns: decorator function
         """
 
         def _decorator(handler: H, /) -> H:
-            self.subscribe(handler, to=to, name=name)
+            self.subscribe(
+                handler,
+                to=to,
+                name=name,
+                batch=batch,
+                polymorphic=polymorphic,
+                lifetime=lifetime,
+            )
 
             return handler
 
@@ -145,4 +255,100 @@ class Registry(banshee.request.HandlerLocator):
         self,
         message: banshee.message.Message[T],
     ) -> collections.abc.Iterable[banshee.request.HandlerReference[T]]:
-        return tuple(self._subscriptions.get(type(message.request), []))
+        request_type = type(message.request)
+
+        if self._modules is not None and self._modules != len(sys.modules):
+            # an abstract base class subscribed to by import string may now be loaded
+            self._resolved.clear()
+            self._modules = None
+
+        try:
+            return self._resolved[request_type]
+        except KeyError:
+            pass
+
+        references = self._resolved[request_type] = self._resolve(request_type)
+
+        return references
+
+    def _resolve(
+        self,
+        request_type: type,
+    ) -> tuple[banshee.request.HandlerReference[typing.Any], ...]:
+        """
+        Resolve.
+
+        Find the subscribers for a type, its own subscribers first, followed by the
+        polymorphic subscribers for each class in its method resolution order, and
+        then those for any abstract base classes it's a virtual subclass of.
+
+        Subscriptions to an import string are matched by the name of each class.
+
+        :param request_type: type of request
+
+        :returns: references to the subscribed handlers
+        """
+        references = [
+            *self._subscriptions.get(request_type, []),
+            *self._subscriptions.get(_path_for(request_type), []),
+        ]
+
+        mro = inspect.getmro(request_type)
+        keys: set[type | str] = {*mro, *(_path_for(cls) for cls in mro)}
+
+        for cls in mro:
+            references.extend(self._polymorphic.get(cls, []))
+            references.extend(self._polymorphic.get(_path_for(cls), []))
+
+        for key, subscriptions in self._polymorphic.items():
+            if key in keys:
+                continue
+
+            # an abstract base class must be loaded to have virtual subclasses
+            target = _loaded(key) if isinstance(key, str) else key
+
+            if target is None:
+                self._modules = len(sys.modules)
+
+            if isinstance(target, type) and issubclass(request_type, target):
+                references.extend(subscriptions)
+
+        return tuple(references)
+
+    async def warm_up(self) -> None:
+        """
+        Warm up.
+
+        Import every handler subscribed as an import string, yielding to the event
+        loop between each, so it can run in the background once the application is
+        serving requests.
+
+        .. code-block:: python
+
+            asyncio.create_task(registry.warm_up())
+
+        :raises banshee.errors.MultipleErrors: when any handler can't be imported,
+            those handlers will be imported again on dispatch
+        """
+        references = [
+            reference
+            for subscriptions in (
+                *self._subscriptions.values(),
+                *self._polymorphic.values(),
+            )
+            for reference in subscriptions
+            if reference.lazy
+        ]
+
+        errors = []
+
+        for reference in references:
+            try:
+                reference.resolve()
+            except Exception as error:  # pylint: disable=broad-except
+                errors.append(error)
+
+            await asyncio.sleep(0)
+
+        if errors:
+            raise banshee.errors.MultipleErrors("warming up handlers failed.", errors)
@@ -4,9 +4,13 @@ Handlers and wiring.
 
 import abc
 import collections.abc
+import contextvars
 import dataclasses
+import enum
+import importlib
 import typing
 
+import banshee.errors
 import banshee.message
 
 #: T
@@ -16,6 +20,100 @@ P = typing.ParamSpec("P")
 #: T
 T_contra = typing.TypeVar("T_contra", contravariant=True)
 
+_scope: contextvars.ContextVar[dict[str, typing.Any] | None] = contextvars.ContextVar(
+    "_scope", default=None
+)
+
+
+class Lifetime(enum.Enum):
+    """
+    Lifetime.
+
+    How long a handler instance created from a class is reused for.
+    """
+
+    #: create a new instance for each dispatch
+    TRANSIENT = "transient"
+    #: create a single instance for each factory
+    SINGLETON = "singleton"
+    #: create a single instance for each root message, see :class:`HandlerScope`
+    SCOPED = "scoped"
+
+
+class HandlerScope:
+    """
+    Handler scope.
+
+    A context manager to reuse :attr:`Lifetime.SCOPED` handler instances until the
+    scope is closed. When a scope is already open, for example for a message sent
+    from a handler, that scope is used.
+
+    The :class:`~banshee.MessageBus` opens a scope for each root message.
+
+    .. code-block:: python
+
+        with HandlerScope():
+            ...
+    """
+
+    __slots__ = ("_token",)
+
+    def __init__(self) -> None:
+        self._token: contextvars.Token[dict[str, typing.Any] | None] | None = None
+
+    def __enter__(self) -> None:
+        if _scope.get() is None:
+            self._token = _scope.set({})
+
+    def __exit__(self, *args: object) -> None:
+        if self._token is not None:
+            _scope.reset(self._token)
+
+            self._token = None
+
+
+def split_import_string(path: str) -> tuple[str, str]:
+    """
+    Split import string.
+
+    :param path: import string, such as `"package.module:attr"`
+
+    :returns: module name and attribute path
+
+    :raises banshee.errors.ConfigurationError: when the import string is invalid
+    """
+    module_name, _, attr = path.partition(":")
+
+    if not module_name or not attr:
+        raise banshee.errors.ConfigurationError(
+            f"invalid import string {path!r}, expected 'package.module:attr'."
+        )
+
+    return module_name, attr
+
+
+def import_string(path: str) -> typing.Any:
+    """
+    Import string.
+
+    Import an object from a `"package.module:attr"` string, where `attr` may be a
+    dotted path to a nested attribute.
+
+    :param path: import string
+
+    :returns: imported object
+
+    :raises banshee.errors.ConfigurationError: when the import string is invalid
+    """
+    module_name, attr = split_import_string(path)
+
+    target: typing.Any = importlib.import_module(module_name)
+
+    for part in attr.split("."):
+        target = getattr(target, part)
+
+    return target
+
 
 @dataclasses.dataclass
 class HandlerReference(typing.Generic[T]):
@@ -26,14 +124,53 @@ class HandlerReference(typing.Generic[T]):
     callable, that when passed to a :class:`~banshee.HandlerFactory` will result in an
     instantiated :class:`Handler`.
 
+    The handler may be an import string, such as `"package.module:attr"`, which is
+    imported the first time it's resolved, see :meth:`resolve`.
+
     :param name: unique handler name
-    :param handler: handler type or callable
+    :param handler: handler type or callable, or an import string for one
+    :param batch: whether the handler takes a list of requests, returning a list of
+        results in the same order
+    :param lifetime: how long an instance of a handler class is reused for
     """
 
     # pylint: disable=too-few-public-methods
 
     name: str
-    handler: type | collections.abc.Callable[..., typing.Any]
+    handler: type | collections.abc.Callable[..., typing.Any] | str
+    batch: bool = False
+    lifetime: Lifetime = Lifetime.TRANSIENT
+
+    _target: type | collections.abc.Callable[..., typing.Any] | None = (
+        dataclasses.field(default=None, init=False, repr=False, compare=False)
+    )
+
+    @property
+    def lazy(self) -> bool:
+        """
+        Lazy.
+
+        Whether the handler is an import string.
+        """
+        return isinstance(self.handler, str)
+
+    def resolve(self) -> type | collections.abc.Callable[..., typing.Any]:
+        """
+        Resolve.
+
+        Get the handler type or callable, importing it on the first call when the
+        handler is an import string.
+
+        :returns: handler type or callable
+        """
+        if self._target is None:
+            self._target = (
+                import_string(self.handler)
+                if isinstance(self.handler, str)
+                else self.handler
+            )
+
+        return self._target
 
 
 class Handler(typing.Protocol[T_contra]):
@@ -112,6 +249,9 @@ class SimpleHandlerFactory(HandlerFactory):
     This factory assumes that the reference is itself a valid handler, allowing
     handlers to be directly registered with the registry.
 
+    Classes are instantiated without arguments, and reused according to the
+    references :class:`Lifetime`, cached by the references name.
+
     .. code-block:: python
 
         @registry.subscribe_to(GreetCommand)
@@ -121,10 +261,31 @@ class SimpleHandlerFactory(HandlerFactory):
 
     # pylint: disable=too-few-public-methods
 
+    def __init__(self) -> None:
+        self._singletons: dict[str, typing.Any] = {}
+
     def __call__(self, reference: HandlerReference[T], /) -> Handler[T]:
-        handler = reference.handler
+        handler = reference.resolve()
+
+        if not isinstance(handler, type):
+            return typing.cast(Handler[T], handler)
+
+        instances: dict[str, typing.Any] | None = None
+
+        if reference.lifetime is Lifetime.SINGLETON:
+            instances = self._singletons
+        elif reference.lifetime is Lifetime.SCOPED:
+            instances = _scope.get()
+
+        if instances is None:
+            # transient, or scoped outside of a scope
+            return typing.cast(Handler[T], handler())
+
+        try:
+            return typing.cast(Handler[T], instances[reference.name])
+        except KeyError:
+            pass
 
-        if isinstance(handler, type):
-            handler = handler()
+        instance = instances[reference.name] = handler()
 
-        return typing.cast(Handler[T], handler)
+        return typing.cast(Handler[T], instance)
@@ -2,18 +2,34 @@
 Tools for tracing messages.
 """
 
+import collections
 import collections.abc
 import dataclasses
 import datetime
-import inspect
+import functools
+import hashlib
+import random
+import sys
+import types
 import typing
+import uuid
 
 import banshee.bus
+import banshee.concurrency
+import banshee.context
+import banshee.errors
 import banshee.message
 
 #: Request Type
 T = typing.TypeVar("T")
 
+#: filename, function and line number of a caller
+_Caller = tuple[str, str, int]
+
+_NO_CALLER: _Caller = ("", "", 0)
+
+_HASH_SPACE = 2**64
+
 
 @dataclasses.dataclass(frozen=True)
 class MessageInfo:
@@ -24,13 +40,16 @@ class MessageInfo:
 
     :param request: request object
     :param contexts: request message contexts
-    :param filename: filename where call originated
-    :param function: function where call originated
-    :param lineno: line in file where call originated
+    :param filename: filename where call originated, or empty when not captured
+    :param function: function where call originated, or empty when not captured
+    :param lineno: line in file where call originated, or `0` when not captured
     :param timestamp: timestamp of call
     :param result_contexts: result message contexts
+    :param correlation_id: correlation identifier, when known
     """
 
+    # pylint: disable=too-many-instance-attributes
+
     #: request object
     request: object
 
@@ -52,6 +71,9 @@ class MessageInfo:
     #: result message contexts
     result_contexts: tuple[object, ...] | None = None
 
+    #: correlation identifier, when known
+    correlation_id: uuid.UUID | None = None
+
 
 class TraceableBus(banshee.bus.Bus):
     """
@@ -60,21 +82,93 @@ class TraceableBus(banshee.bus.Bus):
     A :class:`~banshee.Bus` decorator that stores information about the processing of
     each message passed to the wrapped instance.
 
+    The caller of each message is found by walking the stack, which can be turned off
+    with `capture_caller` to reduce the overhead of tracing.
+
+    For long running processes, `max_messages` keeps only the most recent messages,
+    and `sample_rate` keeps only a proportion of them. With `sample_by_correlation`
+    messages are sampled by their correlation identifier, so every message caused by
+    a sampled message is kept, see :class:`~banshee.CausationMiddleware`.
+
     :param inner: decorated instance
+    :param capture_caller: whether to record where each message was sent from
+    :param max_messages: maximum number of messages to keep, or `None` for no limit
+    :param sample_rate: proportion of messages to keep, from `0.0` to `1.0`
+    :param sample_by_correlation: whether to sample by correlation identifier
+
+    :raises banshee.errors.ConfigurationError: when the limit or rate is invalid
     """
 
-    def __init__(self, inner: banshee.bus.Bus) -> None:
+    def __init__(
+        self,
+        inner: banshee.bus.Bus,
+        *,
+        capture_caller: bool = True,
+        max_messages: int | None = None,
+        sample_rate: float = 1.0,
+        sample_by_correlation: bool = False,
+    ) -> None:
+        if max_messages is not None and max_messages < 1:
+            raise banshee.errors.ConfigurationError(
+                f"max_messages must be at least 1, got {max_messages}."
+            )
+
+        if not 0.0 <= sample_rate <= 1.0:
+            raise banshee.errors.ConfigurationError(
+                f"sample_rate must be between 0.0 and 1.0, got {sample_rate}."
+            )
+
         self.inner = inner
-        self._messages: list[MessageInfo] = []
+        self.capture_caller = capture_caller
+        self.sample_rate = sample_rate
+        self.sample_by_correlation = sample_by_correlation
+        self._messages: collections.deque[MessageInfo]
+        self._messages = collections.deque(maxlen=max_messages)
+        # snapshot of the messages, built on access until the next message is recorded
+        self._snapshot: tuple[MessageInfo, ...] | None = None
 
     @property
     def messages(self) -> collections.abc.Sequence[MessageInfo]:
         """
         Messages.
 
+        A snapshot, that doesn't change as further messages are handled. The snapshot
+        is reused until a message is recorded, use :meth:`iter_messages` to avoid
+        copying.
+
         :returns: sequence containing information about each message processed.
         """
-        return tuple(self._messages)
+        if self._snapshot is None:
+            self._snapshot = tuple(self._messages)
+
+        return self._snapshot
+
+    def iter_messages(
+        self,
+        request_type: type | tuple[type, ...] | None = None,
+        correlation_id: uuid.UUID | None = None,
+    ) -> collections.abc.Iterator[MessageInfo]:
+        """
+        Iterate messages.
+
+        Iterate over the recorded messages, oldest first, optionally only those
+        matching a request type or correlation identifier, without copying them.
+        Messages must not be handled while iterating, use :attr:`messages` for that.
+
+        :param request_type: only messages with requests of this type, or types
+        :param correlation_id: only messages with this correlation identifier
+
+        :returns: iterator of matching messages
+        """
+        messages: collections.abc.Iterable[MessageInfo] = self._messages
+
+        if request_type is not None:
+            messages = (x for x in messages if isinstance(x.request, request_type))
+
+        if correlation_id is not None:
+            messages = (x for x in messages if x.correlation_id == correlation_id)
+
+        return iter(messages)
 
     def reset(self) -> None:
         """
@@ -82,21 +176,51 @@ class TraceableBus(banshee.bus.Bus):
 
         Clear everything in :attr:`messages`.
         """
-        self._messages = []
+        self._messages.clear()
+        self._snapshot = None
 
-    def _get_caller_frame(self) -> inspect.FrameInfo:
-        stack = inspect.stack()
+    def _is_sampled(self, correlation_id: uuid.UUID | None) -> bool:
+        """
+        Is sampled.
 
-        for frame_info in stack:
-            name = frame_info.frame.f_globals.get("__name__", "")
+        :param correlation_id: correlation identifier of the message, when known
 
-            if name.startswith("banshee."):
-                continue
+        :returns: whether to keep the message
+        """
+        if self.sample_rate >= 1.0:
+            return True
+
+        if self.sample_by_correlation and correlation_id is not None:
+            # hash, so identifiers that aren't random, such as time based ones, are
+            # sampled evenly
+            digest = hashlib.blake2b(correlation_id.bytes, digest_size=8).digest()
+
+            return int.from_bytes(digest, "little") < self.sample_rate * _HASH_SPACE
+
+        return random.random() < self.sample_rate
+
+    def _get_caller(self) -> _Caller:
+        """
+        Get caller.
+
+        Find the first frame outside of banshee, reading only what's recorded.
+
+        :returns: filename, function and line number of the caller
+        """
+        if not self.capture_caller:
+            return _NO_CALLER
+
+        frame: types.FrameType | None
+        frame = sys._getframe(1)  # pylint: disable=protected-access
+
+        while frame is not None:  # pylint: disable=while-used
+            if not frame.f_globals.get("__name__", "").startswith("banshee."):
+                return frame.f_code.co_filename, frame.f_code.co_name, frame.f_lineno
 
-            return frame_info
+            frame = frame.f_back
 
-        # something went wrong so default to frame before caller.
-        return stack[1]  # pragma: no cover
+        # something went wrong so default to no caller.
+        return _NO_CALLER  # pragma: no cover
 
     async def handle(
         self,
@@ -105,22 +229,81 @@ class TraceableBus(banshee.bus.Bus):
     ) -> banshee.message.Message[T]:
         message = banshee.message.message_for(request, contexts)
 
-        frame_info = self._get_caller_frame()
+        return await self._handle(message, self._get_caller())
 
-        info = MessageInfo(
-            request=message.request,
-            contexts=message.contexts,
-            filename=frame_info.filename,
-            function=frame_info.function,
-            lineno=frame_info.lineno,
-            timestamp=datetime.datetime.utcnow(),
+    async def handle_many(
+        self,
+        requests: collections.abc.Iterable[typing.Any],
+        contexts: collections.abc.Iterable[typing.Any] | None = None,
+        *,
+        limit: int | None = banshee.bus.DEFAULT_LIMIT,
+        return_exceptions: bool = False,
+    ) -> list[typing.Any]:
+        # find the caller up front, as the messages are handled in separate tasks
+        caller = self._get_caller()
+
+        contexts = tuple(contexts or ())
+
+        return await banshee.concurrency.gather(
+            (
+                functools.partial(
+                    self._handle,
+                    banshee.message.message_for(request, contexts),
+                    caller,
+                )
+                for request in requests
+            ),
+            limit,
+            return_exceptions,
         )
 
-        try:
-            message = await self.inner.handle(message)
+    async def _handle(
+        self,
+        message: banshee.message.Message[T],
+        caller: _Caller,
+    ) -> banshee.message.Message[T]:
+        """
+        Handle.
 
-            info = dataclasses.replace(info, result_contexts=message.contexts)
-        finally:
-            self._messages.append(info)
+        :param message: message to process
+        :param caller: filename, function and line number the message was sent from
+
+        :returns: processed message
+        """
+        timestamp = datetime.datetime.utcnow()
+        result: banshee.message.Message[T] | None = None
 
-        return message
+        try:
+            result = await self.inner.handle(message)
+        finally:
+            contexts = result.contexts if result is not None else message.contexts
+            correlation_id = next(
+                (
+                    context.correlation_id
+                    for context in reversed(tuple(contexts))
+                    if isinstance(context, banshee.context.Causation)
+                ),
+                None,
+            )
+
+            if self._is_sampled(correlation_id):
+                filename, function, lineno = caller
+
+                self._snapshot = None
+
+                self._messages.append(
+                    MessageInfo(
+                        request=message.request,
+                        contexts=message.contexts,
+                        filename=filename,
+                        function=function,
+                        lineno=lineno,
+                        timestamp=timestamp,
+                        result_contexts=(
+                            result.contexts if result is not None else None
+                        ),
+                        correlation_id=correlation_id,
+                    )
+                )
+
+        return result
@@ -8,11 +8,19 @@ from tests.fixture.middleware import (
     mock_middleware,
     mock_recursive_handle_message,
 )
-from tests.fixture.request import mock_factory, mock_handler, mock_locator
+from tests.fixture.request import (
+    Query1,
+    Query2,
+    mock_factory,
+    mock_handler,
+    mock_locator,
+)
 
 __all__ = (
     "Dummy1",
     "Dummy2",
+    "Query1",
+    "Query2",
     "mock_factory",
     "mock_handle_message",
     "mock_handler",
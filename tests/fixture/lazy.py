@@ -0,0 +1,48 @@
+"""
+Lazily imported fixtures.
+
+A module that is only imported via import strings, so tests can check when it is
+imported.
+"""
+
+import abc
+import dataclasses
+import typing
+
+
+class Event(abc.ABC):  # pylint: disable=too-few-public-methods
+    """
+    Event.
+
+    An abstract request for polymorphic subscriptions.
+    """
+
+
+class Named(abc.ABC):  # pylint: disable=too-few-public-methods
+    """
+    Named.
+
+    An abstract request matching any class with a `name` attribute.
+    """
+
+    @classmethod
+    def __subclasshook__(cls, subclass: type) -> bool:
+        return hasattr(subclass, "name") or NotImplemented
+
+
+@dataclasses.dataclass(frozen=True)
+class Query:
+    """
+    Query.
+
+    A simple request for use in tests.
+    """
+
+
+async def handler(_: typing.Any, /) -> str:
+    """
+    Handle a request.
+
+    A simple handler for use in tests.
+    """
+    return "lazy"
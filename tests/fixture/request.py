@@ -2,6 +2,7 @@
 Pipeline related fixtures.
 """
 
+import dataclasses
 import typing
 import unittest.mock
 
@@ -10,6 +11,28 @@ import banshee
 T = typing.TypeVar("T")
 
 
+@dataclasses.dataclass(frozen=True)
+class Query1:
+    """
+    Dummy query.
+
+    A simple hashable request for use in tests.
+    """
+
+    value: int
+
+
+@dataclasses.dataclass(frozen=True)
+class Query2:
+    """
+    Dummy query.
+
+    A simple hashable request for use in tests.
+    """
+
+    value: int
+
+
 def mock_handler(return_value: typing.Any = None) -> typing.Any:
     """
     Mock handle message.
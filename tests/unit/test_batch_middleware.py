@@ -0,0 +1,331 @@
+"""
+Tests for :class:`banshee.BatchMiddleware`
+"""
+
+import asyncio
+import typing
+import unittest.mock
+
+import pytest
+
+import banshee
+
+import tests.fixture
+
+
+class _Request:  # pylint: disable=too-few-public-methods
+    def __init__(self, value: int) -> None:
+        self.value = value
+
+
+def mock_batch_handler() -> typing.Any:
+    """
+    Mock batch handler.
+
+    Returns the value of each request doubled.
+    """
+
+    async def handler(requests: list[_Request], /) -> list[int]:
+        await asyncio.sleep(0)
+
+        return [request.value * 2 for request in requests]
+
+    return unittest.mock.create_autospec(handler, spec_set=True, side_effect=handler)
+
+
+@pytest.mark.asyncio
+async def test_it_should_pass_through_when_no_batch_handlers() -> None:
+    """
+    it should pass through when no batch handlers
+    """
+    handler = tests.fixture.mock_handler()
+
+    locator = tests.fixture.mock_locator(
+        [banshee.HandlerReference[_Request]("test", handler)]
+    )
+
+    message = banshee.message_for(_Request(1))
+
+    fake_handle = tests.fixture.mock_handle_message()
+    middleware = banshee.BatchMiddleware(locator, tests.fixture.mock_factory())
+
+    result = await middleware(message, fake_handle)
+
+    fake_handle.assert_awaited_once_with(message)
+    handler.assert_not_awaited()
+
+    assert result == message
+
+
+@pytest.mark.asyncio
+async def test_it_should_coalesce_concurrent_requests() -> None:
+    """
+    it should coalesce concurrent requests
+    """
+    handler = mock_batch_handler()
+
+    locator = tests.fixture.mock_locator(
+        [banshee.HandlerReference[_Request]("test", handler, batch=True)]
+    )
+
+    requests = [_Request(i) for i in range(5)]
+
+    fake_handle = tests.fixture.mock_handle_message()
+    middleware = banshee.BatchMiddleware(locator, tests.fixture.mock_factory())
+
+    results = await asyncio.gather(
+        *(middleware(banshee.message_for(v), fake_handle) for v in requests)
+    )
+
+    handler.assert_awaited_once_with(requests)
+
+    assert [v[banshee.Dispatch].name for v in results] == ["test"] * 5
+    assert [v[banshee.Dispatch].result for v in results] == [0, 2, 4, 6, 8]
+
+    assert fake_handle.await_count == 5
+
+
+@pytest.mark.asyncio
+async def test_it_should_limit_batch_size() -> None:
+    """
+    it should limit batch size
+    """
+    handler = mock_batch_handler()
+
+    locator = tests.fixture.mock_locator(
+        [banshee.HandlerReference[_Request]("test", handler, batch=True)]
+    )
+
+    requests = [_Request(i) for i in range(5)]
+
+    middleware = banshee.BatchMiddleware(
+        locator,
+        tests.fixture.mock_factory(),
+        max_size=2,
+    )
+
+    results = await asyncio.gather(
+        *(
+            middleware(banshee.message_for(v), tests.fixture.mock_handle_message())
+            for v in requests
+        )
+    )
+
+    assert handler.await_args_list == [
+        unittest.mock.call(requests[0:2]),
+        unittest.mock.call(requests[2:4]),
+        unittest.mock.call(requests[4:5]),
+    ]
+
+    assert [v[banshee.Dispatch].result for v in results] == [0, 2, 4, 6, 8]
+
+
+@pytest.mark.asyncio
+async def test_it_should_wait_for_window() -> None:
+    """
+    it should wait for window
+    """
+    handler = mock_batch_handler()
+
+    locator = tests.fixture.mock_locator(
+        [banshee.HandlerReference[_Request]("test", handler, batch=True)]
+    )
+
+    middleware = banshee.BatchMiddleware(
+        locator,
+        tests.fixture.mock_factory(),
+        window=0.05,
+    )
+
+    async def _later(request: _Request) -> banshee.Message[_Request]:
+        await asyncio.sleep(0.01)
+
+        return await middleware(
+            banshee.message_for(request),
+            tests.fixture.mock_handle_message(),
+        )
+
+    requests = [_Request(1), _Request(2)]
+
+    await asyncio.gather(
+        middleware(
+            banshee.message_for(requests[0]),
+            tests.fixture.mock_handle_message(),
+        ),
+        _later(requests[1]),
+    )
+
+    handler.assert_awaited_once_with(requests)
+
+
+@pytest.mark.asyncio
+async def test_it_should_skip_dispatched_handlers() -> None:
+    """
+    it should skip dispatched handlers
+    """
+    handler = mock_batch_handler()
+
+    locator = tests.fixture.mock_locator(
+        [banshee.HandlerReference[_Request]("test", handler, batch=True)]
+    )
+
+    message = banshee.message_for(
+        _Request(1),
+        contexts=[banshee.Dispatch(name="test", result=None)],
+    )
+
+    fake_handle = tests.fixture.mock_handle_message()
+    middleware = banshee.BatchMiddleware(locator, tests.fixture.mock_factory())
+
+    await middleware(message, fake_handle)
+
+    handler.assert_not_awaited()
+    fake_handle.assert_awaited_once_with(message)
+
+
+@pytest.mark.asyncio
+async def test_it_should_raise_for_every_request_on_error() -> None:
+    """
+    it should raise for every request on error
+    """
+    handler = mock_batch_handler()
+    handler.side_effect = RuntimeError("boom!")
+
+    locator = tests.fixture.mock_locator(
+        [banshee.HandlerReference[_Request]("test", handler, batch=True)]
+    )
+
+    fake_handle = tests.fixture.mock_handle_message()
+    middleware = banshee.BatchMiddleware(locator, tests.fixture.mock_factory())
+
+    results = await asyncio.gather(
+        *(middleware(banshee.message_for(_Request(i)), fake_handle) for i in range(3)),
+        return_exceptions=True,
+    )
+
+    handler.assert_awaited_once()
+    fake_handle.assert_not_awaited()
+
+    for result in results:
+        assert isinstance(result, banshee.DispatchError)
+        assert result.exceptions[0].args[0] == "boom!"
+
+
+@pytest.mark.asyncio
+async def test_it_should_raise_when_batch_handler_returns_wrong_result_count() -> None:
+    """
+    it should raise when batch handler returns wrong result count
+    """
+    handler = mock_batch_handler()
+    handler.side_effect = None
+    handler.return_value = [1, 2, 3]
+
+    locator = tests.fixture.mock_locator(
+        [banshee.HandlerReference[_Request]("test", handler, batch=True)]
+    )
+
+    middleware = banshee.BatchMiddleware(locator, tests.fixture.mock_factory())
+
+    with pytest.raises(banshee.DispatchError) as error:
+        await middleware(
+            banshee.message_for(_Request(1)),
+            tests.fixture.mock_handle_message(),
+        )
+
+    assert isinstance(error.value.exceptions[0], banshee.ConfigurationError)
+    assert error.value.exceptions[0].args[0] == (
+        "batch handler test returned 3 results for 1 requests."
+    )
+
+
+@pytest.mark.asyncio
+async def test_it_should_batch_queries_through_bus() -> None:
+    """
+    it should batch queries through bus
+    """
+    registry = banshee.Registry()
+
+    handler = mock_batch_handler()
+
+    registry.subscribe(handler, to=_Request, name="test", batch=True)
+
+    factory = banshee.SimpleHandlerFactory()
+
+    bus = (
+        banshee.Builder()
+        .with_locator(registry)
+        .with_factory(factory)
+        .with_middleware(banshee.BatchMiddleware(registry, factory))
+        .build()
+    )
+
+    results = await bus.query_many([_Request(i) for i in range(4)])
+
+    assert results == [0, 2, 4, 6]
+    handler.assert_awaited_once()
+
+
+@pytest.mark.asyncio
+async def test_it_should_share_singletons_with_the_bus_factory() -> None:
+    """
+    it should share singletons with the bus factory
+    """
+
+    class _Handler:  # pylint: disable=too-few-public-methods
+        def __init__(self) -> None:
+            self.batches: list[int] = []
+
+        async def __call__(self, requests: list[_Request]) -> list[int]:
+            self.batches.append(len(requests))
+
+            return [request.value for request in requests]
+
+    registry = banshee.Registry()
+    registry.subscribe(
+        _Handler, to=_Request, batch=True, lifetime=banshee.Lifetime.SINGLETON
+    )
+
+    factory = banshee.SimpleHandlerFactory()
+
+    bus = (
+        banshee.Builder()
+        .with_locator(registry)
+        .with_factory(factory)
+        .with_middleware(banshee.BatchMiddleware(registry, factory))
+        .build()
+    )
+
+    await bus.query_many([_Request(i) for i in range(2)])
+    await bus.query_many([_Request(i) for i in range(3)])
+
+    (reference,) = registry.subscribers_for(banshee.message_for(_Request(0)))
+
+    assert typing.cast(_Handler, factory(reference)).batches == [2, 3]
+
+
+@pytest.mark.asyncio
+async def test_it_should_call_hooks_for_each_batch() -> None:
+    """
+    it should call hooks for each batch
+    """
+    handler = mock_batch_handler()
+
+    reference = banshee.HandlerReference[_Request]("test", handler, batch=True)
+
+    locator = tests.fixture.mock_locator([reference])
+
+    metrics = banshee.Metrics()
+
+    fake_handle = tests.fixture.mock_handle_message()
+    middleware = banshee.BatchMiddleware(
+        locator, tests.fixture.mock_factory(), hooks=[metrics]
+    )
+
+    await asyncio.gather(
+        *(middleware(banshee.message_for(_Request(i)), fake_handle) for i in range(3))
+    )
+
+    snapshot = metrics.snapshot()
+
+    assert snapshot.handlers["test"].count == 1
+    assert snapshot.handler_outcomes == {"test": {"success": 1}}
@@ -100,3 +100,57 @@ def test_build_should_error_when_locator_is_not_provided() -> None:
 
     with pytest.raises(banshee.ConfigurationError, match="No locator provided."):
         builder.build()
+
+
+def test_with_concurrency_should_set_dispatch_concurrency() -> None:
+    """
+    with_concurrency() should set dispatch concurrency.
+    """
+    builder1 = banshee.Builder(locator=tests.fixture.mock_locator())
+
+    builder2 = builder1.with_concurrency(4)
+
+    bus = builder2.build()
+
+    assert builder1.concurrency == 1
+    assert builder2.concurrency == 4
+    assert isinstance(bus, banshee.bus.MessageBus)
+    assert isinstance(bus.middleware[0], banshee.DispatchMiddleware)
+    assert bus.middleware[0].concurrency == 4
+
+
+def test_with_dispatch_hook_should_add_dispatch_hook() -> None:
+    """
+    with_dispatch_hook() should add dispatch hook.
+    """
+    metrics = banshee.Metrics()
+
+    builder1 = banshee.Builder(locator=tests.fixture.mock_locator())
+
+    builder2 = builder1.with_dispatch_hook(metrics)
+
+    bus = builder2.build()
+
+    assert not builder1.hooks
+    assert builder2.hooks == (metrics,)
+    assert isinstance(bus, banshee.bus.MessageBus)
+    assert isinstance(bus.middleware[0], banshee.DispatchMiddleware)
+    assert bus.middleware[0].hooks == (metrics,)
+
+
+def test_with_profiler_should_set_profiler() -> None:
+    """
+    with_profiler() should set profiler.
+    """
+    profiler = banshee.Profiler()
+
+    builder1 = banshee.Builder(locator=tests.fixture.mock_locator())
+
+    builder2 = builder1.with_profiler(profiler)
+
+    bus = builder2.build()
+
+    assert builder1.profiler is None
+    assert builder2.profiler is profiler
+    assert isinstance(bus, banshee.bus.MessageBus)
+    assert bus.profiler is profiler
@@ -0,0 +1,227 @@
+"""
+Tests for :class:`banshee.CacheMiddleware`
+"""
+
+import dataclasses
+import typing
+
+import pytest
+
+import banshee
+
+import tests.fixture
+
+
+@dataclasses.dataclass(frozen=True)
+class _Query:
+    value: int
+
+
+@dataclasses.dataclass(frozen=True)
+class _OtherQuery:
+    value: int
+
+
+@dataclasses.dataclass(frozen=True)
+class _Event:
+    pass
+
+
+class _Clock:  # pylint: disable=too-few-public-methods
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def mock_dispatch_handle() -> typing.Any:
+    """
+    Mock handle message.
+
+    Adds a dispatch context with a result counting the number of dispatches, unless the
+    message was already dispatched, as with :class:`banshee.DispatchMiddleware`.
+    """
+    fake_handle = tests.fixture.mock_handle_message()
+    calls = 0
+
+    async def _handle(message: banshee.Message[typing.Any]) -> typing.Any:
+        nonlocal calls
+
+        if banshee.Dispatch in message:
+            return message
+
+        calls += 1
+
+        return message.including(banshee.Dispatch(name="test", result=calls))
+
+    fake_handle.side_effect = _handle
+
+    return fake_handle
+
+
+@pytest.mark.asyncio
+async def test_it_should_pass_through_uncached_types() -> None:
+    """
+    it should pass through uncached types
+    """
+    fake_handle = mock_dispatch_handle()
+
+    middleware = banshee.CacheMiddleware(ttl={_OtherQuery: None})
+
+    result1 = await middleware(banshee.message_for(_Query(1)), fake_handle)
+    result2 = await middleware(banshee.message_for(_Query(1)), fake_handle)
+
+    assert result1[banshee.Dispatch].result == 1
+    assert result2[banshee.Dispatch].result == 2
+    assert middleware.stats == banshee.CacheStats()
+
+
+@pytest.mark.asyncio
+async def test_it_should_add_cached_contexts_on_hit() -> None:
+    """
+    it should add cached contexts on hit
+    """
+    fake_handle = mock_dispatch_handle()
+
+    middleware = banshee.CacheMiddleware(ttl={_Query: None})
+
+    result1 = await middleware(banshee.message_for(_Query(1)), fake_handle)
+    result2 = await middleware(banshee.message_for(_Query(1)), fake_handle)
+    result3 = await middleware(banshee.message_for(_Query(2)), fake_handle)
+
+    assert result1[banshee.Dispatch].result == 1
+    assert result3[banshee.Dispatch].result == 2
+
+    # the cached context is added before handling, so the handlers can be skipped
+    fake_handle.assert_any_await(
+        banshee.message_for(_Query(1), [banshee.Dispatch(name="test", result=1)])
+    )
+    assert result2.all(banshee.Dispatch)
+
+    assert middleware.stats == banshee.CacheStats(hits=1, misses=2)
+
+
+@pytest.mark.asyncio
+async def test_it_should_expire_entries_after_ttl() -> None:
+    """
+    it should expire entries after ttl
+    """
+    clock = _Clock()
+
+    fake_handle = mock_dispatch_handle()
+
+    middleware = banshee.CacheMiddleware(ttl={_Query: 10}, clock=clock)
+
+    await middleware(banshee.message_for(_Query(1)), fake_handle)
+
+    clock.now = 9.9
+
+    result = await middleware(banshee.message_for(_Query(1)), fake_handle)
+
+    assert result[banshee.Dispatch].result == 1
+
+    clock.now = 10.0
+
+    result = await middleware(banshee.message_for(_Query(1)), fake_handle)
+
+    assert result[banshee.Dispatch].result == 2
+    assert middleware.stats == banshee.CacheStats(hits=1, misses=2)
+
+
+@pytest.mark.asyncio
+async def test_it_should_evict_least_recently_used_entries() -> None:
+    """
+    it should evict least recently used entries
+    """
+    fake_handle = mock_dispatch_handle()
+
+    middleware = banshee.CacheMiddleware(ttl={_Query: None}, max_size=2)
+
+    await middleware(banshee.message_for(_Query(1)), fake_handle)
+    await middleware(banshee.message_for(_Query(2)), fake_handle)
+    # use the first entry, so the second becomes least recently used
+    await middleware(banshee.message_for(_Query(1)), fake_handle)
+    await middleware(banshee.message_for(_Query(3)), fake_handle)
+
+    assert len(middleware) == 2
+    assert middleware.stats == banshee.CacheStats(hits=1, misses=3, evictions=1)
+
+    result1 = await middleware(banshee.message_for(_Query(1)), fake_handle)
+    result2 = await middleware(banshee.message_for(_Query(2)), fake_handle)
+
+    assert result1[banshee.Dispatch].result == 1
+    assert result2[banshee.Dispatch].result == 4
+
+
+@pytest.mark.asyncio
+async def test_it_should_invalidate_entries_on_event() -> None:
+    """
+    it should invalidate entries on event
+    """
+    fake_handle = mock_dispatch_handle()
+
+    middleware = banshee.CacheMiddleware(
+        ttl={_Query: None, _OtherQuery: None},
+        invalidates={_Event: [_Query]},
+    )
+
+    await middleware(banshee.message_for(_Query(1)), fake_handle)
+    await middleware(banshee.message_for(_OtherQuery(1)), fake_handle)
+
+    await middleware(banshee.message_for(_Event()), fake_handle)
+
+    result1 = await middleware(banshee.message_for(_Query(1)), fake_handle)
+    result2 = await middleware(banshee.message_for(_OtherQuery(1)), fake_handle)
+
+    assert result1[banshee.Dispatch].result == 4
+    assert result2[banshee.Dispatch].result == 2
+
+
+@pytest.mark.asyncio
+async def test_it_should_not_store_results_from_before_invalidation() -> None:
+    """
+    it should not store results from before invalidation
+    """
+    middleware = banshee.CacheMiddleware(ttl={_Query: None})
+
+    fake_handle = mock_dispatch_handle()
+
+    async def _handle(message: banshee.Message[typing.Any]) -> typing.Any:
+        # the query is invalidated while its handler is running
+        middleware.invalidate(_Query)
+
+        return message.including(banshee.Dispatch(name="test", result=None))
+
+    await middleware(banshee.message_for(_Query(1)), _handle)
+
+    assert len(middleware) == 0
+
+    await middleware(banshee.message_for(_Query(1)), fake_handle)
+
+    assert len(middleware) == 1
+
+    middleware.clear()
+
+    assert len(middleware) == 0
+
+
+@pytest.mark.asyncio
+async def test_it_should_pass_through_unhashable_requests() -> None:
+    """
+    it should pass through unhashable requests
+    """
+
+    @dataclasses.dataclass
+    class _Unhashable:
+        value: list[int]
+
+    fake_handle = mock_dispatch_handle()
+
+    middleware = banshee.CacheMiddleware(ttl={_Unhashable: None})
+
+    await middleware(banshee.message_for(_Unhashable([])), fake_handle)
+    result = await middleware(banshee.message_for(_Unhashable([])), fake_handle)
+
+    assert result[banshee.Dispatch].result == 2
+    assert len(middleware) == 0
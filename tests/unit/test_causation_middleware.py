@@ -158,3 +158,53 @@ async def test_it_should_only_consider_current_asyncio_task() -> None:
     }
 
     assert set(results) == expected
+
+
+@pytest.mark.asyncio
+async def test_it_should_isolate_concurrent_nested_messages() -> None:
+    """
+    it should isolate concurrent nested messages.
+    """
+    root_id = uuid.uuid4()
+    child_ids = [uuid.uuid4() for _ in range(5)]
+
+    middleware = banshee.CausationMiddleware()
+
+    results: dict[uuid.UUID, banshee.Causation] = {}
+
+    async def _leaf(message: banshee.Message[T]) -> banshee.Message[T]:
+        await asyncio.sleep(0)
+
+        results[message[banshee.Identity].unique_id] = message[banshee.Causation]
+
+        return message
+
+    async def _child(message: banshee.Message[T]) -> banshee.Message[T]:
+        # each child sends a grandchild after yielding to its siblings
+        await asyncio.sleep(0)
+
+        grandchild = banshee.message_for(object(), [banshee.Identity(uuid.uuid4())])
+
+        result = await middleware(grandchild, _leaf)
+
+        assert (
+            result[banshee.Causation].causation_id
+            == message[banshee.Identity].unique_id
+        )
+
+        return message
+
+    async def _root(message: banshee.Message[T]) -> banshee.Message[T]:
+        await asyncio.gather(
+            *(
+                middleware(banshee.message_for(object(), [banshee.Identity(v)]), _child)
+                for v in child_ids
+            )
+        )
+
+        return message
+
+    await middleware(banshee.message_for(object(), [banshee.Identity(root_id)]), _root)
+
+    assert len(results) == 5
+    assert {v.correlation_id for v in results.values()} == {root_id}
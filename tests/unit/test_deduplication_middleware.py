@@ -0,0 +1,281 @@
+"""
+Tests for :class:`banshee.DeduplicationMiddleware`
+"""
+
+import asyncio
+import dataclasses
+import pathlib
+import typing
+import uuid
+
+import pytest
+
+import banshee
+
+
+class _Handle:  # pylint: disable=too-few-public-methods
+    """
+    Handle.
+
+    Counts calls, adding a dispatch context to each message.
+    """
+
+    def __init__(self) -> None:
+        self.calls = 0
+
+    async def __call__(
+        self, message: banshee.Message[typing.Any]
+    ) -> banshee.Message[typing.Any]:
+        self.calls += 1
+
+        return message.including(banshee.Dispatch(name="handler", result=self.calls))
+
+
+def _message(unique_id: uuid.UUID) -> banshee.Message[typing.Any]:
+    return banshee.message_for("request", [banshee.Identity(unique_id=unique_id)])
+
+
+@pytest.mark.asyncio
+async def test_it_should_skip_duplicates() -> None:
+    """
+    it should skip duplicates
+    """
+    middleware = banshee.DeduplicationMiddleware()
+    handle = _Handle()
+
+    unique_id = uuid.uuid4()
+
+    first = await middleware(_message(unique_id), handle)
+    second = await middleware(_message(unique_id), handle)
+
+    assert handle.calls == 1
+    assert list(first.all(banshee.Dispatch)) == list(second.all(banshee.Dispatch))
+    assert list(second.all(banshee.Dispatch)) == [
+        banshee.Dispatch(name="handler", result=1)
+    ]
+
+
+@pytest.mark.asyncio
+async def test_it_should_handle_messages_without_identity() -> None:
+    """
+    it should handle messages without identity
+    """
+    middleware = banshee.DeduplicationMiddleware()
+    handle = _Handle()
+
+    await middleware(banshee.message_for("request"), handle)
+    await middleware(banshee.message_for("request"), handle)
+
+    assert handle.calls == 2
+
+
+@pytest.mark.asyncio
+async def test_it_should_handle_again_after_a_failure() -> None:
+    """
+    it should handle again after a failure
+    """
+    middleware = banshee.DeduplicationMiddleware()
+
+    unique_id = uuid.uuid4()
+
+    async def fail(
+        message: banshee.Message[typing.Any],
+    ) -> banshee.Message[typing.Any]:
+        raise RuntimeError("failed")
+
+    with pytest.raises(RuntimeError):
+        await middleware(_message(unique_id), fail)
+
+    handle = _Handle()
+
+    await middleware(_message(unique_id), handle)
+
+    assert handle.calls == 1
+
+
+@dataclasses.dataclass(frozen=True)
+class _Command:
+    name: str
+
+
+@dataclasses.dataclass(frozen=True)
+class _Event:
+    name: str
+
+
+@pytest.mark.asyncio
+async def test_it_should_handle_messages_relayed_from_the_outbox(
+    tmp_path: pathlib.Path,
+) -> None:
+    """
+    it should handle messages relayed from the outbox
+    """
+    outbox = banshee.SQLiteOutbox(tmp_path / "outbox.db")
+
+    handled: list[_Event] = []
+
+    async def handle_command(command: _Command) -> None:
+        await bus.handle(_Event(name=command.name), contexts=[banshee.HandleAfter()])
+
+    async def handle_event(event: _Event) -> None:
+        handled.append(event)
+
+    registry = banshee.Registry()
+    registry.subscribe(handle_command, to=_Command)
+    registry.subscribe(handle_event, to=_Event)
+
+    bus = (
+        banshee.Builder()
+        .with_middleware(banshee.IdentityMiddleware())
+        .with_middleware(banshee.DeduplicationMiddleware())
+        .with_middleware(banshee.OutboxMiddleware(outbox))
+        .with_locator(registry)
+        .build()
+    )
+
+    await bus.handle(_Command(name="created"))
+
+    relay = banshee.OutboxRelay(outbox, bus)
+
+    entries = await outbox.pending()
+
+    assert await relay.relay() == 1
+    assert handled == [_Event(name="created")]
+
+    # delivered again, such as after a crash before it was removed
+    await outbox.append([entry.message for entry in entries])
+
+    assert await relay.relay() == 1
+    assert handled == [_Event(name="created")]
+
+
+def test_it_should_evict_the_least_recently_used() -> None:
+    """
+    it should evict the least recently used
+    """
+    store = banshee.LRUDeduplicationStore(max_size=2)
+
+    first, second, third = uuid.uuid4(), uuid.uuid4(), uuid.uuid4()
+
+    store.add(first, ())
+    store.add(second, ())
+
+    assert store.get(first) == ()
+
+    store.add(third, ())
+
+    assert len(store) == 2
+    assert store.get(second) is None
+    assert store.get(first) == ()
+
+
+def test_it_should_persist_the_lru_store(tmp_path: pathlib.Path) -> None:
+    """
+    it should persist the lru store
+    """
+    path = tmp_path / "seen.pickle"
+
+    unique_id = uuid.uuid4()
+    contexts = (banshee.Dispatch(name="handler", result=1),)
+
+    store = banshee.LRUDeduplicationStore(path=path, save_interval=0)
+
+    store.add(unique_id, contexts)
+
+    assert banshee.LRUDeduplicationStore(path=path).get(unique_id) == contexts
+
+
+@pytest.mark.asyncio
+async def test_it_should_save_in_a_thread_in_an_event_loop(
+    tmp_path: pathlib.Path,
+) -> None:
+    """
+    it should save in a thread in an event loop
+    """
+    path = tmp_path / "seen.pickle"
+
+    unique_id = uuid.uuid4()
+    contexts = (banshee.Dispatch(name="handler", result=1),)
+
+    store = banshee.LRUDeduplicationStore(path=path, save_interval=0)
+
+    store.add(unique_id, contexts)
+
+    # the save is scheduled, rather than written while adding
+    assert not path.exists()
+
+    for _ in range(100):
+        if path.exists():
+            break
+
+        await asyncio.sleep(0.01)
+
+    assert banshee.LRUDeduplicationStore(path=path).get(unique_id) == contexts
+
+
+def test_it_should_remember_ids_in_the_bloom_filter() -> None:
+    """
+    it should remember ids in the bloom filter
+    """
+    store = banshee.BloomDeduplicationStore(capacity=1000, error_rate=0.01)
+
+    seen = [uuid.uuid4() for _ in range(1000)]
+
+    for unique_id in seen:
+        store.add(unique_id, ())
+
+    assert all(store.get(unique_id) == () for unique_id in seen)
+
+    false_positives = sum(store.get(uuid.uuid4()) is not None for _ in range(1000))
+
+    assert false_positives < 50
+
+
+def test_it_should_forget_ids_after_two_windows() -> None:
+    """
+    it should forget ids after two windows
+    """
+    now = [0.0]
+
+    store = banshee.BloomDeduplicationStore(
+        capacity=100, window=10, clock=lambda: now[0]
+    )
+
+    unique_id = uuid.uuid4()
+
+    store.add(unique_id, ())
+
+    now[0] = 15
+
+    assert store.get(unique_id) == ()
+
+    now[0] = 30
+
+    assert store.get(unique_id) is None
+
+
+def test_it_should_persist_the_bloom_filter(tmp_path: pathlib.Path) -> None:
+    """
+    it should persist the bloom filter
+    """
+    path = tmp_path / "seen.bloom"
+
+    unique_id = uuid.uuid4()
+
+    store = banshee.BloomDeduplicationStore(capacity=100, path=path, save_interval=None)
+
+    store.add(unique_id, ())
+    store.save()
+
+    assert banshee.BloomDeduplicationStore(capacity=100, path=path).get(unique_id) == ()
+    assert (
+        banshee.BloomDeduplicationStore(capacity=200, path=path).get(unique_id) is None
+    )
+
+
+def test_it_should_error_when_the_error_rate_is_invalid() -> None:
+    """
+    it should error when the error rate is invalid
+    """
+    with pytest.raises(banshee.ConfigurationError):
+        banshee.BloomDeduplicationStore(error_rate=1)
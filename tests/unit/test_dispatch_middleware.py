@@ -1,8 +1,12 @@
 """
 Tests for :class:`banshee.DispatchMiddleware`
 """
+
+import asyncio
 import logging
+import time
 import typing
+import unittest.mock
 
 import pytest
 
@@ -190,3 +194,250 @@ async def test_it_should_raise_after_all_handlers_on_error() -> None:
     assert len(error.value.exceptions) == 1
     assert isinstance(error.value.exceptions[0], RuntimeError)
     assert error.value.exceptions[0].args[0] == "somme handler error"
+
+
+def slow_handler(
+    result: typing.Any,
+    delay: float,
+    running: list[int] | None = None,
+) -> typing.Any:
+    """
+    Slow handler.
+    """
+
+    async def handler(_: typing.Any, /) -> typing.Any:
+        if running is not None:
+            running.append(running[-1] + 1 if running else 1)
+
+        await asyncio.sleep(delay)
+
+        if running is not None:
+            running.append(running[-1] - 1)
+
+        return result
+
+    return unittest.mock.create_autospec(handler, spec_set=True, side_effect=handler)
+
+
+@pytest.mark.asyncio
+async def test_it_should_call_handlers_concurrently_when_enabled() -> None:
+    """
+    it should call handlers concurrently when enabled
+    """
+    handlers = [slow_handler(i, 0.01 * (5 - i)) for i in range(5)]
+
+    locator = tests.fixture.mock_locator(
+        [
+            banshee.HandlerReference[_Request](f"test-{i}", handler)
+            for i, handler in enumerate(handlers)
+        ]
+    )
+
+    request = _Request()
+    message = banshee.message_for(request)
+
+    fake_handle = tests.fixture.mock_handle_message()
+    middleware = banshee.DispatchMiddleware(
+        locator,
+        tests.fixture.mock_factory(),
+        concurrency=None,
+    )
+
+    start = time.perf_counter()
+
+    result = await middleware(message, fake_handle)
+
+    # total time is the slowest handler, not the sum of all handlers
+    assert time.perf_counter() - start < 0.1
+
+    for handler in handlers:
+        handler.assert_awaited_once_with(request)
+
+    # contexts are in subscription order, not completion order
+    contexts = tuple(result.all(banshee.Dispatch))
+
+    assert [v.name for v in contexts] == [f"test-{i}" for i in range(5)]
+    assert [v.result for v in contexts] == list(range(5))
+
+
+@pytest.mark.asyncio
+async def test_it_should_limit_concurrent_handlers() -> None:
+    """
+    it should limit concurrent handlers
+    """
+    running: list[int] = []
+
+    locator = tests.fixture.mock_locator(
+        [
+            banshee.HandlerReference[_Request](f"test-{i}", slow_handler(i, 0, running))
+            for i in range(6)
+        ]
+    )
+
+    middleware = banshee.DispatchMiddleware(
+        locator,
+        tests.fixture.mock_factory(),
+        concurrency=2,
+    )
+
+    result = await middleware(
+        banshee.message_for(_Request()),
+        tests.fixture.mock_handle_message(),
+    )
+
+    assert max(running) == 2
+    assert len(tuple(result.all(banshee.Dispatch))) == 6
+
+
+@pytest.mark.asyncio
+async def test_it_should_not_call_dispatched_handlers_concurrently() -> None:
+    """
+    it should not call dispatched handlers concurrently
+    """
+
+    handler1 = tests.fixture.mock_handler()
+    handler2 = tests.fixture.mock_handler()
+    handler3 = tests.fixture.mock_handler()
+
+    locator = tests.fixture.mock_locator(
+        [
+            banshee.HandlerReference[_Request]("test-one", handler1),
+            banshee.HandlerReference[_Request]("test-two", handler2),
+            banshee.HandlerReference[_Request]("test-three", handler3),
+        ]
+    )
+
+    message = banshee.message_for(
+        _Request(),
+        contexts=[banshee.Dispatch(name="test-one", result=None)],
+    )
+
+    middleware = banshee.DispatchMiddleware(
+        locator,
+        tests.fixture.mock_factory(),
+        concurrency=None,
+    )
+
+    await middleware(message, tests.fixture.mock_handle_message())
+
+    handler1.assert_not_awaited()
+    handler2.assert_awaited_once()
+    handler3.assert_awaited_once()
+
+
+@pytest.mark.asyncio
+async def test_it_should_raise_after_all_concurrent_handlers_on_error() -> None:
+    """
+    it should raise after all concurrent handlers on error
+    """
+
+    handler1 = tests.fixture.mock_handler()
+    handler2 = tests.fixture.mock_handler()
+    handler3 = tests.fixture.mock_handler()
+
+    handler1.side_effect = [RuntimeError("error one")]
+    handler3.side_effect = [RuntimeError("error three")]
+
+    locator = tests.fixture.mock_locator(
+        [
+            banshee.HandlerReference[_Request]("test-one", handler1),
+            banshee.HandlerReference[_Request]("test-two", handler2),
+            banshee.HandlerReference[_Request]("test-three", handler3),
+        ]
+    )
+
+    middleware = banshee.DispatchMiddleware(
+        locator,
+        tests.fixture.mock_factory(),
+        concurrency=None,
+    )
+
+    with pytest.raises(
+        banshee.DispatchError,
+        match="handling _Request failed.",
+    ) as error:
+        await middleware(
+            banshee.message_for(_Request()),
+            tests.fixture.mock_handle_message(),
+        )
+
+    handler1.assert_awaited_once()
+    handler2.assert_awaited_once()
+    handler3.assert_awaited_once()
+
+    assert [v.args[0] for v in error.value.exceptions] == ["error one", "error three"]
+
+
+def test_it_should_reject_invalid_concurrency() -> None:
+    """
+    it should reject invalid concurrency
+    """
+    with pytest.raises(banshee.ConfigurationError, match="at least 1, got 0"):
+        banshee.DispatchMiddleware(
+            tests.fixture.mock_locator(),
+            tests.fixture.mock_factory(),
+            concurrency=0,
+        )
+
+
+@pytest.mark.asyncio
+async def test_it_should_call_batch_handlers_with_a_list() -> None:
+    """
+    it should call batch handlers with a list
+    """
+    handler = tests.fixture.mock_handler(["result"])
+
+    locator = tests.fixture.mock_locator(
+        [banshee.HandlerReference[_Request]("test", handler, batch=True)]
+    )
+
+    request = _Request()
+
+    middleware = banshee.DispatchMiddleware(locator, tests.fixture.mock_factory())
+
+    result = await middleware(
+        banshee.message_for(request),
+        tests.fixture.mock_handle_message(),
+    )
+
+    handler.assert_awaited_once_with([request])
+
+    assert result[banshee.Dispatch].result == "result"
+
+
+@pytest.mark.asyncio
+async def test_it_should_call_hooks_after_each_handler() -> None:
+    """
+    it should call hooks after each handler
+    """
+    error = RuntimeError("failed")
+
+    reference1 = banshee.HandlerReference[_Request](
+        "test1", tests.fixture.mock_handler("result")
+    )
+    reference2 = banshee.HandlerReference[_Request](
+        "test2", unittest.mock.AsyncMock(side_effect=error)
+    )
+
+    hook = unittest.mock.Mock()
+
+    middleware = banshee.DispatchMiddleware(
+        tests.fixture.mock_locator([reference1, reference2]),
+        tests.fixture.mock_factory(),
+        hooks=[hook],
+    )
+
+    with pytest.raises(banshee.DispatchError):
+        await middleware(
+            banshee.message_for(_Request()),
+            tests.fixture.mock_handle_message(),
+        )
+
+    assert hook.call_args_list == [
+        unittest.mock.call(reference1, unittest.mock.ANY, None),
+        unittest.mock.call(reference2, unittest.mock.ANY, error),
+    ]
+
+    for call in hook.call_args_list:
+        assert isinstance(call.args[1], int)
+        assert call.args[1] >= 0
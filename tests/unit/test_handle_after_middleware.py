@@ -216,3 +216,222 @@ async def test_it_should_only_consider_current_asyncio_task() -> None:
     }
 
     assert set(results) == expected
+
+
+def _background_handle(
+    middleware: banshee.HandleAfterMiddleware,
+    handled: list[typing.Any],
+    release: asyncio.Event,
+    error: Exception | None = None,
+) -> banshee.HandleMessage:
+    """
+    Background handle.
+
+    Handle an outer message by postponing an inner message, which waits for the
+    release event, and then raises the error if given.
+    """
+
+    async def _handle(message: banshee.Message[T]) -> banshee.Message[T]:
+        if message.request == "outer":
+            await middleware(
+                banshee.message_for("inner", contexts=[banshee.HandleAfter()]),
+                _handle,
+            )
+        else:
+            await release.wait()
+
+            if error:
+                raise error
+
+        handled.append(message.request)
+
+        return message
+
+    return _handle
+
+
+@pytest.mark.asyncio
+async def test_it_should_postpone_handling_to_background_task() -> None:
+    """
+    it should postpone handling to background task
+    """
+    handled: list[typing.Any] = []
+    release = asyncio.Event()
+
+    middleware = banshee.HandleAfterMiddleware(background=True)
+
+    handle = _background_handle(middleware, handled, release)
+
+    result = await middleware(banshee.message_for("outer"), handle)
+
+    assert result == banshee.message_for("outer")
+    assert handled == ["outer"]
+
+    release.set()
+
+    await middleware.drain()
+
+    assert handled == ["outer", "inner"]
+
+
+@pytest.mark.asyncio
+async def test_it_should_report_background_errors_to_callback() -> None:
+    """
+    it should report background errors to callback
+    """
+    errors: list[Exception] = []
+    release = asyncio.Event()
+    release.set()
+
+    middleware = banshee.HandleAfterMiddleware(background=True, on_error=errors.append)
+
+    handle = _background_handle(middleware, [], release, RuntimeError("boom!"))
+
+    await middleware(banshee.message_for("outer"), handle)
+    await middleware.drain()
+
+    assert len(errors) == 1
+    assert isinstance(errors[0], banshee.MultipleErrors)
+    assert errors[0].exceptions[0].args == ("boom!",)
+
+
+@pytest.mark.asyncio
+async def test_it_should_limit_background_tasks() -> None:
+    """
+    it should limit background tasks
+    """
+    handled: list[typing.Any] = []
+    release = asyncio.Event()
+
+    middleware = banshee.HandleAfterMiddleware(background=True, max_pending=1)
+
+    handle = _background_handle(middleware, handled, release)
+
+    await middleware(banshee.message_for("outer"), handle)
+
+    second = asyncio.ensure_future(middleware(banshee.message_for("outer"), handle))
+
+    await asyncio.sleep(0.01)
+
+    # waiting for the first background task to finish
+    assert not second.done()
+
+    release.set()
+
+    await second
+    await middleware.drain()
+
+    assert handled == ["outer", "outer", "inner", "inner"]
+
+
+@pytest.mark.asyncio
+async def test_it_should_run_background_tasks_with_executor() -> None:
+    """
+    it should run background tasks with executor
+    """
+    handled: list[typing.Any] = []
+    release = asyncio.Event()
+    release.set()
+
+    functions: list[typing.Any] = []
+
+    middleware = banshee.HandleAfterMiddleware(executor=functions.append)
+
+    handle = _background_handle(middleware, handled, release)
+
+    await middleware(banshee.message_for("outer"), handle)
+
+    assert len(functions) == 1
+    assert handled == ["outer"]
+
+    await functions[0]()
+    await middleware.drain()
+
+    assert handled == ["outer", "inner"]
+
+
+def test_it_should_error_when_max_pending_is_invalid() -> None:
+    """
+    it should error when max_pending is invalid
+    """
+    with pytest.raises(banshee.ConfigurationError):
+        banshee.HandleAfterMiddleware(background=True, max_pending=0)
+
+
+@pytest.mark.asyncio
+async def test_it_should_handle_postponed_messages_concurrently() -> None:
+    """
+    it should handle postponed messages concurrently
+    """
+    events: list[tuple[str, typing.Any]] = []
+
+    middleware = banshee.HandleAfterMiddleware(concurrency=2)
+
+    async def _handle(message: banshee.Message[T]) -> banshee.Message[T]:
+        if message.request == "outer":
+            for request in ("first", "second", "third"):
+                await middleware(
+                    banshee.message_for(request, contexts=[banshee.HandleAfter()]),
+                    _handle,
+                )
+
+            return message
+
+        events.append(("start", message.request))
+
+        await asyncio.sleep(0)
+
+        events.append(("end", message.request))
+
+        return message
+
+    await middleware(banshee.message_for("outer"), _handle)
+
+    assert events[:2] == [("start", "first"), ("start", "second")]
+    assert ("start", "third") in events[2:]
+    assert len(events) == 6
+
+
+@pytest.mark.asyncio
+async def test_it_should_drop_messages_from_failed_handlers_concurrently() -> None:
+    """
+    it should drop messages from failed handlers concurrently
+    """
+    handled: list[typing.Any] = []
+
+    middleware = banshee.HandleAfterMiddleware(concurrency=None)
+
+    async def _postpone(request: str) -> None:
+        await middleware(
+            banshee.message_for(request, contexts=[banshee.HandleAfter()]), _handle
+        )
+
+    async def _handle(message: banshee.Message[T]) -> banshee.Message[T]:
+        match message.request:
+            case "outer":
+                await _postpone("failing")
+                await _postpone("working")
+            case "failing":
+                await _postpone("dropped")
+
+                raise RuntimeError("boom!")
+            case "working":
+                await _postpone("kept")
+
+        handled.append(message.request)
+
+        return message
+
+    with pytest.raises(banshee.MultipleErrors) as error:
+        await middleware(banshee.message_for("outer"), _handle)
+
+    assert [str(e) for e in error.value.exceptions] == ["boom!"]
+    assert sorted(handled) == ["kept", "outer", "working"]
+
+
+def test_it_should_error_when_concurrency_is_invalid() -> None:
+    """
+    it should error when concurrency is invalid
+    """
+    with pytest.raises(banshee.ConfigurationError):
+        banshee.HandleAfterMiddleware(concurrency=0)
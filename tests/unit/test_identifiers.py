@@ -0,0 +1,69 @@
+"""
+Tests for :class:`banshee.UUID7Generator` and :class:`banshee.CounterGenerator`
+"""
+
+import uuid
+
+import banshee
+
+
+def test_it_should_generate_uuid7_identifiers() -> None:
+    """
+    it should generate uuid7 identifiers.
+    """
+    generator = banshee.UUID7Generator(clock=lambda: 1_700_000_000_123_456_789)
+
+    unique_id = generator()
+
+    assert unique_id.version == 7
+    assert unique_id.variant == uuid.RFC_4122
+    assert unique_id.int >> 80 == 1_700_000_000_123
+
+
+def test_it_should_generate_ordered_identifiers() -> None:
+    """
+    it should generate ordered identifiers.
+    """
+    generator = banshee.UUID7Generator(buffer_size=16)
+
+    unique_ids = [generator() for _ in range(10_000)]
+
+    assert unique_ids == sorted(unique_ids)
+    assert len(set(unique_ids)) == len(unique_ids)
+
+
+def test_it_should_stay_ordered_when_the_clock_stands_still() -> None:
+    """
+    it should stay ordered when the clock stands still.
+    """
+    generator = banshee.UUID7Generator(clock=lambda: 1_000_000)
+
+    unique_ids = [generator() for _ in range(10_000)]
+
+    assert unique_ids == sorted(unique_ids)
+    # the counter ran out, so the timestamp was moved forward
+    assert unique_ids[-1].int >> 80 > 1
+
+
+def test_it_should_stay_ordered_when_the_clock_goes_back() -> None:
+    """
+    it should stay ordered when the clock goes back.
+    """
+    now = [5_000_000]
+
+    generator = banshee.UUID7Generator(clock=lambda: now[0])
+
+    first = generator()
+
+    now[0] = 1_000_000
+
+    assert generator() > first
+
+
+def test_it_should_generate_sequential_identifiers() -> None:
+    """
+    it should generate sequential identifiers.
+    """
+    generator = banshee.CounterGenerator()
+
+    assert [generator(), generator()] == [uuid.UUID(int=1), uuid.UUID(int=2)]
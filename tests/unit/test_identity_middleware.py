@@ -73,3 +73,18 @@ async def test_it_should_add_a_unique_identity_context_to_messages() -> None:
         unique_ids.add(result[banshee.Identity].unique_id)
 
     assert len(unique_ids) == 10
+
+
+@pytest.mark.asyncio
+async def test_it_should_use_the_generator() -> None:
+    """
+    it should use the generator.
+    """
+    middleware = banshee.IdentityMiddleware(banshee.CounterGenerator(start=42))
+
+    result = await middleware(
+        banshee.message_for(object()),
+        tests.fixture.mock_handle_message(),
+    )
+
+    assert result[banshee.Identity].unique_id == uuid.UUID(int=42)
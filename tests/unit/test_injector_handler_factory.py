@@ -0,0 +1,119 @@
+"""
+Tests for :class:`banshee.extra.injector.InjectorHandlerFactory`
+"""
+
+import typing
+import unittest.mock
+
+import injector
+import pytest
+
+import banshee
+import banshee.extra.injector
+
+
+class _Dependency:  # pylint: disable=too-few-public-methods
+    pass
+
+
+async def _function_handler(request: str, dependency: _Dependency) -> typing.Any:
+    return request, dependency
+
+
+class _ClassHandler:  # pylint: disable=too-few-public-methods
+    def __init__(self, dependency: _Dependency) -> None:
+        self.dependency = dependency
+
+    async def __call__(self, request: str) -> typing.Any:
+        return request, self.dependency
+
+
+class _PlainHandler:  # pylint: disable=too-few-public-methods
+    async def __call__(self, request: str) -> typing.Any:
+        return request
+
+
+def factory_for() -> tuple[banshee.extra.injector.InjectorHandlerFactory, _Dependency]:
+    """
+    Factory for tests.
+
+    :returns: factory, and the dependency bound in its container
+    """
+    dependency = _Dependency()
+
+    container = injector.Injector(
+        lambda binder: binder.bind(_Dependency, to=dependency)
+    )
+
+    return banshee.extra.injector.InjectorHandlerFactory(container), dependency
+
+
+@pytest.mark.asyncio
+async def test_it_should_inject_functions() -> None:
+    """
+    it should inject functions
+    """
+    factory, dependency = factory_for()
+
+    reference: banshee.HandlerReference[str] = banshee.HandlerReference(
+        name="test", handler=_function_handler
+    )
+
+    handler = factory(reference)
+
+    assert await handler("foo") == ("foo", dependency)
+    assert factory(reference) is handler
+
+
+@pytest.mark.asyncio
+async def test_it_should_inject_classes() -> None:
+    """
+    it should inject classes
+    """
+    factory, dependency = factory_for()
+
+    reference: banshee.HandlerReference[str] = banshee.HandlerReference(
+        name="test", handler=_ClassHandler
+    )
+
+    handler = factory(reference)
+
+    assert isinstance(handler, _ClassHandler)
+    assert await handler("foo") == ("foo", dependency)
+    assert factory(reference) is not handler
+
+
+@pytest.mark.asyncio
+async def test_it_should_instantiate_classes_without_dependencies() -> None:
+    """
+    it should instantiate classes without dependencies
+    """
+    factory, _ = factory_for()
+
+    reference: banshee.HandlerReference[str] = banshee.HandlerReference(
+        name="test", handler=_PlainHandler
+    )
+
+    handler = factory(reference)
+
+    assert isinstance(handler, _PlainHandler)
+    assert await handler("foo") == "foo"
+
+
+def test_it_should_only_inspect_handlers_once() -> None:
+    """
+    it should only inspect handlers once
+    """
+    factory, _ = factory_for()
+
+    reference: banshee.HandlerReference[str] = banshee.HandlerReference(
+        name="test", handler=_ClassHandler
+    )
+
+    with unittest.mock.patch.object(
+        injector, "get_bindings", wraps=injector.get_bindings
+    ) as get_bindings:
+        factory(reference)
+        factory(reference)
+
+    get_bindings.assert_called_once()
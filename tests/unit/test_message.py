@@ -2,7 +2,10 @@
 Tests for :class:`banshee.Message`
 """
 
+import abc
+import copy
 import dataclasses
+import pickle
 
 import pytest
 
@@ -377,3 +380,193 @@ def test_excluding_removes_contexts_from_returned_instance() -> None:
     assert len(message2.contexts) == 1
 
     assert message2.contexts[0] == context
+
+
+class _Base:  # pylint: disable=too-few-public-methods
+    pass
+
+
+class _Child(_Base):  # pylint: disable=too-few-public-methods
+    pass
+
+
+class _Abstract(abc.ABC):  # pylint: disable=too-few-public-methods
+    pass
+
+
+_Abstract.register(tests.fixture.Dummy2)
+
+# hide the abstract base class from mypy as it's unaware of virtual subclasses
+_ABSTRACT: type = _Abstract
+
+
+def test_get_should_return_most_recent_subclass_context() -> None:
+    """
+    get() should return most recent subclass context.
+    """
+    context1 = _Base()
+    context2 = _Child()
+
+    message = banshee.Message(object(), contexts=(context1, context2))
+
+    assert message.get(_Base) is context2
+    assert message.get(_Child) is context2
+
+
+def test_get_should_return_most_recent_virtual_subclass_context() -> None:
+    """
+    get() should return most recent virtual subclass context.
+    """
+    context1 = tests.fixture.Dummy2()
+    context2 = tests.fixture.Dummy2()
+
+    message = banshee.Message(object(), contexts=(context1, tests.fixture.Dummy1()))
+
+    assert message.get(_ABSTRACT) is context1
+    assert message.including(context2).get(_ABSTRACT) is context2
+
+
+def test_including_should_keep_lookups_up_to_date() -> None:
+    """
+    including() should keep lookups up to date.
+    """
+    context1 = _Base()
+    context2 = _Child()
+    context3 = tests.fixture.Dummy2()
+
+    message1 = banshee.Message(object(), contexts=(context1,))
+
+    # prime lookups on the original message
+    assert message1.get(_Base) is context1
+    assert message1.get(_Child) is None
+    assert message1.get(_ABSTRACT) is None
+
+    message2 = message1.including(context2, context3)
+
+    assert message2.get(_Base) is context2
+    assert message2.get(_Child) is context2
+    assert message2.get(_ABSTRACT) is context3
+    assert message1.get(_Base) is context1
+    assert message1.get(_Child) is None
+    assert message1.get(_ABSTRACT) is None
+
+
+def test_excluding_should_keep_lookups_up_to_date() -> None:
+    """
+    excluding() should keep lookups up to date.
+    """
+    context1 = _Base()
+    context2 = _Child()
+    context3 = tests.fixture.Dummy2()
+
+    message1 = banshee.Message(object(), contexts=(context3, context1, context2))
+
+    # prime lookups on the original message
+    assert message1.get(_Base) is context2
+    assert message1.get(_ABSTRACT) is context3
+
+    message2 = message1.excluding(_Child, tests.fixture.Dummy2)
+
+    assert message2.get(_Base) is context1
+    assert message2.get(_Child) is None
+    assert message2.get(_ABSTRACT) is None
+    assert message2.get(object) is context1
+    assert message1.get(_Base) is context2
+
+
+def test_including_should_preserve_order_across_successive_calls() -> None:
+    """
+    including() should preserve order across successive calls.
+    """
+    contexts = [tests.fixture.Dummy1() for _ in range(10)]
+
+    message1 = banshee.Message(object(), contexts=tuple(contexts[:2]))
+
+    message2 = message1
+
+    for context in contexts[2:]:
+        message2 = message2.including(context)
+
+    message3 = message2.including(tests.fixture.Dummy2())
+
+    assert message2.contexts == tuple(contexts)
+    assert message3.contexts == (*contexts, message3.contexts[-1])
+    assert message2.get(tests.fixture.Dummy1) is contexts[-1]
+
+
+def test_including_should_compare_equal_to_message_with_same_contexts() -> None:
+    """
+    including() should compare equal to message with same contexts.
+    """
+    request = object()
+    context1 = tests.fixture.Dummy1()
+    context2 = tests.fixture.Dummy2()
+
+    message1 = banshee.Message(request).including(context1).including(context2)
+    message2 = banshee.Message(request, contexts=(context1, context2))
+
+    assert message1 == message2
+    assert hash(message1) == hash(message2)
+    assert repr(message1) == repr(message2)
+
+
+def test_including_should_be_picklable() -> None:
+    """
+    including() should be picklable.
+    """
+    message1 = banshee.Message("request").including(
+        banshee.Dispatch(name="test", result=1)
+    )
+
+    message2 = pickle.loads(pickle.dumps(message1))
+
+    assert message2 == message1
+    assert message2[banshee.Dispatch].result == 1
+
+
+def test_including_should_pickle_only_contexts() -> None:
+    """
+    including() should pickle only contexts.
+    """
+    message1 = banshee.Message("request")
+
+    for value in range(1000):
+        message1 = message1.including(value)
+
+    message2 = pickle.loads(pickle.dumps(message1))
+
+    assert message2 == message1
+    assert message2[int] == 999
+    assert copy.deepcopy(message1) == message1
+    assert len(pickle.dumps(message1)) == len(
+        pickle.dumps(banshee.Message("request", contexts=tuple(range(1000))))
+    )
+    assert dataclasses.astuple(message1) == ("request", tuple(range(1000)))
+
+
+@dataclasses.dataclass(frozen=True)
+class _ExtendedMessage(banshee.Message[str]):
+    extra: int = 0
+
+
+def test_including_should_keep_subclass_fields() -> None:
+    """
+    including() should keep subclass fields.
+    """
+    message = _ExtendedMessage("request", extra=7).including(tests.fixture.Dummy1())
+
+    assert isinstance(message, _ExtendedMessage)
+    assert message.extra == 7
+    assert message.get(tests.fixture.Dummy1) is not None
+
+
+def test_subclasses_should_be_picklable() -> None:
+    """
+    subclasses should be picklable.
+    """
+    message1 = _ExtendedMessage("request", extra=7).including(tests.fixture.Dummy1())
+
+    message2 = pickle.loads(pickle.dumps(message1))
+
+    assert message2 == message1
+    assert message2.extra == 7
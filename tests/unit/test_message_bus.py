@@ -2,6 +2,7 @@
 Tests for :class:`banshee.bus.MessageBus`
 """
 
+import asyncio
 import typing
 
 import conjecture
@@ -34,7 +35,7 @@ async def test_handle_should_dispatch_request_to_middleware() -> None:
 
     middleware.assert_awaited_once_with(
         banshee.message_for(request),
-        conjecture.instance_of(banshee.message.MiddlewareChain),
+        conjecture.instance_of(banshee.message.MiddlewareLink),
     )
 
 
@@ -56,7 +57,7 @@ async def test_handle_should_dispatch_request_with_context() -> None:
 
     middleware.assert_awaited_once_with(
         banshee.message_for(request, contexts=[context1, context2]),
-        conjecture.instance_of(banshee.message.MiddlewareChain),
+        conjecture.instance_of(banshee.message.MiddlewareLink),
     )
 
 
@@ -152,3 +153,167 @@ async def test_query_should_raise_when_handled_more_than_once() -> None:
         match="multiple handlers for _Request found",
     ):
         await bus.query(_Request())
+
+
+def echo_middleware(
+    delays: dict[typing.Any, float] | None = None,
+    running: list[int] | None = None,
+) -> banshee.Middleware:
+    """
+    Echo middleware.
+
+    Dispatches each request to a fake handler returning the request.
+    """
+    T = typing.TypeVar("T")
+
+    async def middleware(
+        message: banshee.Message[T],
+        handle: banshee.HandleMessage,  # pylint: disable=unused-argument
+    ) -> banshee.Message[T]:
+        if running is not None:
+            running.append(running[-1] + 1 if running else 1)
+
+        await asyncio.sleep((delays or {}).get(message.request, 0))
+
+        if running is not None:
+            running.append(running[-1] - 1)
+
+        if isinstance(message.request, Exception):
+            raise message.request
+
+        message = message.including(
+            banshee.Dispatch(name="echo", result=message.request)
+        )
+
+        return await handle(message)
+
+    return middleware
+
+
+@pytest.mark.asyncio
+async def test_handle_many_should_return_messages_in_order() -> None:
+    """
+    handle_many() should return messages in order
+    """
+    context = tests.fixture.Dummy1()
+
+    bus = banshee.bus.MessageBus([echo_middleware({0: 0.02, 1: 0.01})])
+
+    results = await bus.handle_many([0, 1, 2], contexts=[context])
+
+    assert [v.request for v in results] == [0, 1, 2]
+    assert all(v[tests.fixture.Dummy1] is context for v in results)
+
+
+@pytest.mark.asyncio
+async def test_handle_many_should_limit_messages_in_flight() -> None:
+    """
+    handle_many() should limit messages in flight
+    """
+    running: list[int] = []
+
+    bus = banshee.bus.MessageBus([echo_middleware(running=running)])
+
+    results = await bus.handle_many(range(10), limit=3)
+
+    assert len(results) == 10
+    assert max(running) == 3
+
+
+@pytest.mark.asyncio
+async def test_handle_many_should_raise_first_error() -> None:
+    """
+    handle_many() should raise first error
+    """
+    error = RuntimeError("boom!")
+
+    bus = banshee.bus.MessageBus([echo_middleware({2: 1})])
+
+    with pytest.raises(RuntimeError, match="boom!"):
+        await asyncio.wait_for(bus.handle_many([1, error, 2]), 0.5)
+
+
+@pytest.mark.asyncio
+async def test_handle_many_should_return_errors_when_requested() -> None:
+    """
+    handle_many() should return errors when requested
+    """
+    error = RuntimeError("boom!")
+
+    bus = banshee.bus.MessageBus([echo_middleware()])
+
+    results = await bus.handle_many([1, error, 2], return_exceptions=True)
+
+    assert isinstance(results[0], banshee.Message)
+    assert results[1] is error
+    assert isinstance(results[2], banshee.Message)
+
+
+@pytest.mark.asyncio
+async def test_query_many_should_return_handler_results() -> None:
+    """
+    query_many() should return handler results
+    """
+    bus = banshee.bus.MessageBus([echo_middleware({"a": 0.01})])
+
+    assert await bus.query_many(["a", "b", "c"]) == ["a", "b", "c"]
+
+
+@pytest.mark.asyncio
+async def test_query_many_should_return_errors_when_requested() -> None:
+    """
+    query_many() should return errors when requested
+    """
+    error = RuntimeError("boom!")
+
+    bus = banshee.bus.MessageBus([echo_middleware()])
+
+    results = await bus.query_many(["a", error], return_exceptions=True)
+
+    assert results == ["a", error]
+
+
+@pytest.mark.asyncio
+async def test_query_many_should_raise_when_not_handled() -> None:
+    """
+    query_many() should raise when not handled
+    """
+    bus = banshee.bus.MessageBus([tests.fixture.mock_middleware()])
+
+    with pytest.raises(
+        banshee.ConfigurationError,
+        match="no handler for _Request found",
+    ):
+        await bus.query_many([_Request()])
+
+
+@pytest.mark.asyncio
+async def test_handle_should_scope_handlers_to_root_message() -> None:
+    """
+    handle() should scope handlers to root message
+    """
+    factory = banshee.SimpleHandlerFactory()
+    reference: banshee.HandlerReference[typing.Any] = banshee.HandlerReference(
+        name="test", handler=object, lifetime=banshee.Lifetime.SCOPED
+    )
+    instances = []
+
+    async def middleware(
+        message: banshee.Message[typing.Any],
+        handle: banshee.HandleMessage,
+    ) -> banshee.Message[typing.Any]:
+        instances.append(factory(reference))
+
+        if message.request == "root":
+            await bus.handle("nested")
+
+        return await handle(message)
+
+    bus = banshee.MessageBus(middleware=[middleware])
+
+    await bus.handle("root")
+    await bus.handle("root")
+
+    assert instances[0] is instances[1]
+    assert instances[2] is instances[3]
+    assert instances[0] is not instances[2]
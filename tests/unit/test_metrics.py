@@ -0,0 +1,109 @@
+"""
+Tests for :class:`banshee.Metrics`
+"""
+
+import banshee
+import banshee.metrics
+
+
+class _Request:  # pylint: disable=too-few-public-methods
+    pass
+
+
+def test_histogram_should_count_values_into_buckets() -> None:
+    """
+    histogram should count values into buckets
+    """
+    histogram = banshee.metrics.Histogram([10, 100])
+
+    for value in (1, 10, 11, 100, 1000):
+        histogram.record(value)
+
+    snapshot = histogram.snapshot()
+
+    assert snapshot.counts == (2, 2, 1)
+    assert snapshot.count == 5
+    assert snapshot.total == 1122
+
+
+def test_histogram_snapshot_should_estimate_quantiles() -> None:
+    """
+    histogram snapshot should estimate quantiles
+    """
+    histogram = banshee.metrics.Histogram([10, 100])
+
+    assert histogram.snapshot().quantile(0.5) is None
+
+    for value in (1, 2, 3, 50, 1000):
+        histogram.record(value)
+
+    snapshot = histogram.snapshot()
+
+    assert snapshot.quantile(0.5) == 10
+    assert snapshot.quantile(0.8) == 100
+    assert snapshot.quantile(0.99) == float("inf")
+
+
+def test_snapshot_should_include_requests_and_handlers() -> None:
+    """
+    snapshot() should include requests and handlers
+    """
+    metrics = banshee.Metrics(buckets=[10])
+
+    reference = banshee.HandlerReference[_Request]("test", lambda _: None)
+
+    metrics.record_request(_Request, 5, banshee.metrics.SUCCESS)
+    metrics.record_request(_Request, 50, banshee.metrics.FAILURE)
+    metrics.record_request(str, 5, banshee.metrics.NO_HANDLERS)
+    metrics(reference, 5, None)
+    metrics(reference, 5, RuntimeError())
+
+    snapshot = metrics.snapshot()
+
+    name = f"{__name__}._Request"
+
+    assert snapshot.requests[name].counts == (1, 1)
+    assert snapshot.requests["str"].counts == (1, 0)
+    assert snapshot.handlers["test"].counts == (2, 0)
+    assert snapshot.request_outcomes == {
+        name: {"success": 1, "failure": 1},
+        "str": {"no_handlers": 1},
+    }
+    assert snapshot.handler_outcomes == {"test": {"success": 1, "failure": 1}}
+
+    metrics.reset()
+
+    assert metrics.snapshot() == banshee.MetricsSnapshot({}, {}, {}, {})
+
+
+def test_snapshot_should_export_prometheus_text() -> None:
+    """
+    snapshot should export prometheus text
+    """
+    metrics = banshee.Metrics(buckets=[1_000_000])
+
+    reference = banshee.HandlerReference[_Request]('a "quoted" name', lambda _: None)
+
+    metrics.record_request(str, 500_000, banshee.metrics.SUCCESS)
+    metrics.record_request(str, 2_000_000, banshee.metrics.SUCCESS)
+    metrics(reference, 500_000, None)
+
+    assert metrics.snapshot().to_prometheus() == (
+        "# TYPE banshee_request_duration_seconds histogram\n"
+        'banshee_request_duration_seconds_bucket{request_type="str",le="0.001"} 1\n'
+        'banshee_request_duration_seconds_bucket{request_type="str",le="+Inf"} 2\n'
+        'banshee_request_duration_seconds_sum{request_type="str"} 0.0025\n'
+        'banshee_request_duration_seconds_count{request_type="str"} 2\n'
+        "# TYPE banshee_requests_total counter\n"
+        'banshee_requests_total{request_type="str",outcome="success"} 2\n'
+        "# TYPE banshee_handler_duration_seconds histogram\n"
+        'banshee_handler_duration_seconds_bucket{handler="a \\"quoted\\" name",'
+        'le="0.001"} 1\n'
+        'banshee_handler_duration_seconds_bucket{handler="a \\"quoted\\" name",'
+        'le="+Inf"} 1\n'
+        'banshee_handler_duration_seconds_sum{handler="a \\"quoted\\" name"} 0.0005\n'
+        'banshee_handler_duration_seconds_count{handler="a \\"quoted\\" name"} 1\n'
+        "# TYPE banshee_handler_calls_total counter\n"
+        'banshee_handler_calls_total{handler="a \\"quoted\\" name",'
+        'outcome="success"} 1\n'
+    )
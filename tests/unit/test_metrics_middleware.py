@@ -0,0 +1,75 @@
+"""
+Tests for :class:`banshee.MetricsMiddleware`
+"""
+
+import typing
+
+import pytest
+
+import banshee
+
+import tests.fixture
+
+
+class _Request:  # pylint: disable=too-few-public-methods
+    pass
+
+
+@pytest.mark.asyncio
+async def test_it_should_record_request_outcomes() -> None:
+    """
+    it should record request outcomes
+    """
+    metrics = banshee.Metrics()
+
+    middleware = banshee.MetricsMiddleware(metrics)
+
+    async def _dispatch(message: banshee.Message[typing.Any]) -> typing.Any:
+        return message.including(banshee.Dispatch(name="test", result=None))
+
+    fail = tests.fixture.mock_handle_message()
+    fail.side_effect = RuntimeError("failed")
+
+    await middleware(banshee.message_for(_Request()), _dispatch)
+    await middleware(
+        banshee.message_for(_Request()), tests.fixture.mock_handle_message()
+    )
+
+    with pytest.raises(RuntimeError):
+        await middleware(banshee.message_for(_Request()), fail)
+
+    snapshot = metrics.snapshot()
+
+    name = f"{__name__}._Request"
+
+    assert snapshot.requests[name].count == 3
+    assert snapshot.request_outcomes == {
+        name: {"success": 1, "no_handlers": 1, "failure": 1}
+    }
+
+
+@pytest.mark.asyncio
+async def test_it_should_record_handlers_with_dispatch_hook() -> None:
+    """
+    it should record handlers with dispatch hook
+    """
+    metrics = banshee.Metrics()
+
+    registry = banshee.Registry()
+    registry.subscribe(tests.fixture.mock_handler("result"), to=_Request, name="test")
+
+    bus = (
+        banshee.Builder()
+        .with_middleware(banshee.MetricsMiddleware(metrics))
+        .with_locator(registry)
+        .with_dispatch_hook(metrics)
+        .build()
+    )
+
+    await bus.handle(_Request())
+
+    snapshot = metrics.snapshot()
+
+    assert snapshot.handlers["test"].count == 1
+    assert snapshot.handler_outcomes == {"test": {"success": 1}}
+    assert snapshot.request_outcomes == {f"{__name__}._Request": {"success": 1}}
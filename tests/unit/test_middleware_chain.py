@@ -2,6 +2,8 @@
 Tests for :class:`banshee.message.MiddlewareChain`
 """
 
+import typing
+
 import pytest
 
 import banshee
@@ -9,6 +11,8 @@ import banshee.message
 
 import tests.fixture
 
+T = typing.TypeVar("T")
+
 
 @pytest.mark.asyncio
 async def test_it_should_call_middleware_in_order() -> None:
@@ -38,3 +42,57 @@ async def test_it_should_call_middleware_in_order() -> None:
     assert (await chain(message)) == message
     assert (await chain(message)) == message
     assert (await chain(message)) == message
+
+
+@pytest.mark.asyncio
+async def test_compile_chain_should_call_middleware_in_order() -> None:
+    """
+    compile_chain() should call middleware in order
+    """
+    calls = []
+
+    def _middleware(number: int) -> banshee.Middleware:
+        async def middleware(
+            message: banshee.Message[T],
+            handle: banshee.HandleMessage,
+        ) -> banshee.Message[T]:
+            calls.append(number)
+
+            return await handle(message.including(number))
+
+        return middleware
+
+    message = banshee.message_for(object())
+
+    chain = banshee.message.compile_chain(_middleware(i) for i in range(5))
+
+    result = await chain(message)
+
+    assert calls == [0, 1, 2, 3, 4]
+    assert result == message.including(0, 1, 2, 3, 4)
+
+
+@pytest.mark.asyncio
+async def test_compile_chain_should_allow_links_to_be_reused() -> None:
+    """
+    compile_chain() should allow links to be reused
+    """
+    inner = tests.fixture.mock_middleware()
+
+    async def middleware(
+        message: banshee.Message[T],
+        handle: banshee.HandleMessage,
+    ) -> banshee.Message[T]:
+        # call the rest of the chain more than once, as deferring middleware does
+        await handle(message)
+
+        return await handle(message)
+
+    message = banshee.message_for(object())
+
+    chain = banshee.message.compile_chain([middleware, inner])
+
+    assert (await chain(message)) == message
+    assert (await chain(message)) == message
+
+    assert inner.await_count == 4
@@ -0,0 +1,280 @@
+"""
+Tests for :class:`banshee.SQLiteOutbox` and :class:`banshee.OutboxMiddleware`
+"""
+
+import asyncio
+import collections.abc
+import contextlib
+import dataclasses
+import json
+import pathlib
+import sqlite3
+import typing
+
+import pytest
+
+import banshee
+
+
+@dataclasses.dataclass(frozen=True)
+class _Event:
+    name: str
+
+
+class _Bus(banshee.Bus):
+    """
+    Bus.
+
+    Records the requests it handles, failing for those named "fail".
+    """
+
+    def __init__(self) -> None:
+        self.handled: list[typing.Any] = []
+
+    async def handle(
+        self,
+        request: typing.Any,
+        contexts: collections.abc.Iterable[typing.Any] | None = None,
+    ) -> banshee.Message[typing.Any]:
+        message = banshee.message_for(request, contexts)
+
+        if message.request == _Event(name="fail"):
+            raise RuntimeError("failed")
+
+        self.handled.append(message.request)
+
+        return message
+
+
+class _JSONSerializer(banshee.Serializer):
+    def dumps(self, message: banshee.Message[typing.Any]) -> bytes:
+        return json.dumps(dataclasses.asdict(message.request)).encode()
+
+    def loads(self, data: bytes) -> banshee.Message[typing.Any]:
+        return banshee.message_for(_Event(**json.loads(data)))
+
+
+@pytest.mark.asyncio
+async def test_it_should_store_postponed_messages(tmp_path: pathlib.Path) -> None:
+    """
+    it should store postponed messages
+    """
+    outbox = banshee.SQLiteOutbox(tmp_path / "outbox.db")
+    middleware = banshee.OutboxMiddleware(outbox)
+
+    async def handle(
+        message: banshee.Message[typing.Any],
+    ) -> banshee.Message[typing.Any]:
+        if message.request == _Event(name="outer"):
+            await middleware(
+                banshee.message_for(_Event(name="first"), [banshee.HandleAfter()]),
+                handle,
+            )
+            await middleware(
+                banshee.message_for(_Event(name="second"), [banshee.HandleAfter()]),
+                handle,
+            )
+
+        return message
+
+    await middleware(banshee.message_for(_Event(name="outer")), handle)
+
+    entries = await outbox.pending()
+
+    assert [entry.message.request for entry in entries] == [
+        _Event(name="first"),
+        _Event(name="second"),
+    ]
+    assert not any(entry.message.has(banshee.HandleAfter) for entry in entries)
+
+
+@pytest.mark.asyncio
+async def test_it_should_discard_messages_when_the_handler_fails(
+    tmp_path: pathlib.Path,
+) -> None:
+    """
+    it should discard messages when the handler fails
+    """
+    outbox = banshee.SQLiteOutbox(tmp_path / "outbox.db")
+    middleware = banshee.OutboxMiddleware(outbox)
+
+    async def handle(
+        message: banshee.Message[typing.Any],
+    ) -> banshee.Message[typing.Any]:
+        if message.request == _Event(name="outer"):
+            await middleware(
+                banshee.message_for(_Event(name="inner"), [banshee.HandleAfter()]),
+                handle,
+            )
+
+            raise RuntimeError("failed")
+
+        return message
+
+    with pytest.raises(RuntimeError):
+        await middleware(banshee.message_for(_Event(name="outer")), handle)
+
+    assert await outbox.count() == 0
+
+
+@pytest.mark.asyncio
+async def test_it_should_relay_messages_in_order(tmp_path: pathlib.Path) -> None:
+    """
+    it should relay messages in order
+    """
+    outbox = banshee.SQLiteOutbox(tmp_path / "outbox.db")
+    bus = _Bus()
+
+    events = [_Event(name=str(i)) for i in range(5)]
+
+    await outbox.append(banshee.message_for(event) for event in events)
+
+    relay = banshee.OutboxRelay(outbox, bus, batch_size=3)
+
+    assert await relay.relay() == 3
+    assert await relay.relay() == 2
+    assert await relay.relay() == 0
+
+    assert bus.handled == events
+    assert await outbox.count() == 0
+
+
+@pytest.mark.asyncio
+async def test_it_should_redeliver_messages_after_a_restart(
+    tmp_path: pathlib.Path,
+) -> None:
+    """
+    it should redeliver messages after a restart
+    """
+    outbox = banshee.SQLiteOutbox(tmp_path / "outbox.db")
+
+    await outbox.append([banshee.message_for(_Event(name="pending"))])
+
+    outbox.close()
+
+    bus = _Bus()
+
+    restarted = banshee.SQLiteOutbox(tmp_path / "outbox.db")
+
+    await banshee.OutboxRelay(restarted, bus).relay()
+
+    assert bus.handled == [_Event(name="pending")]
+
+
+@pytest.mark.asyncio
+async def test_it_should_retry_failed_messages(tmp_path: pathlib.Path) -> None:
+    """
+    it should retry failed messages
+    """
+    outbox = banshee.SQLiteOutbox(tmp_path / "outbox.db")
+    bus = _Bus()
+    errors: list[Exception] = []
+
+    await outbox.append(
+        [
+            banshee.message_for(_Event(name="fail")),
+            banshee.message_for(_Event(name="ok")),
+        ]
+    )
+
+    relay = banshee.OutboxRelay(
+        outbox, bus, max_attempts=2, on_error=lambda _, error: errors.append(error)
+    )
+
+    assert await relay.relay() == 1
+    assert await relay.relay() == 0
+    assert await relay.relay() == 0
+
+    assert bus.handled == [_Event(name="ok")]
+    assert len(errors) == 2
+
+    entries = await outbox.pending()
+
+    assert [(entry.message.request, entry.attempts) for entry in entries] == [
+        (_Event(name="fail"), 2)
+    ]
+
+
+@pytest.mark.asyncio
+async def test_it_should_not_block_on_failing_messages(tmp_path: pathlib.Path) -> None:
+    """
+    it should not block on failing messages
+    """
+    outbox = banshee.SQLiteOutbox(tmp_path / "outbox.db")
+    bus = _Bus()
+
+    await outbox.append(
+        [
+            banshee.message_for(_Event(name="fail")),
+            banshee.message_for(_Event(name="fail")),
+            banshee.message_for(_Event(name="ok")),
+        ]
+    )
+
+    relay = banshee.OutboxRelay(outbox, bus, batch_size=2, on_error=lambda *_: None)
+
+    assert await relay.relay() == 0
+    assert await relay.relay() == 1
+
+    assert bus.handled == [_Event(name="ok")]
+    assert await outbox.count() == 2
+
+
+@pytest.mark.asyncio
+async def test_it_should_relay_appended_messages(tmp_path: pathlib.Path) -> None:
+    """
+    it should relay appended messages
+    """
+    outbox = banshee.SQLiteOutbox(tmp_path / "outbox.db")
+    bus = _Bus()
+
+    relay = banshee.OutboxRelay(outbox, bus, poll_interval=60)
+
+    task = asyncio.create_task(relay.run())
+
+    try:
+        await asyncio.sleep(0.01)
+
+        await outbox.append([banshee.message_for(_Event(name="late"))])
+
+        for _ in range(100):
+            if bus.handled:
+                break
+
+            await asyncio.sleep(0.01)
+    finally:
+        task.cancel()
+
+        with pytest.raises(asyncio.CancelledError):
+            await task
+
+    assert bus.handled == [_Event(name="late")]
+
+
+@pytest.mark.asyncio
+async def test_it_should_use_the_serializer(tmp_path: pathlib.Path) -> None:
+    """
+    it should use the serializer
+    """
+    outbox = banshee.SQLiteOutbox(tmp_path / "outbox.db", serializer=_JSONSerializer())
+
+    await outbox.append([banshee.message_for(_Event(name="json"))])
+
+    with contextlib.closing(sqlite3.connect(tmp_path / "outbox.db")) as connection:
+        payloads = connection.execute("SELECT payload FROM banshee_outbox").fetchall()
+
+    assert payloads == [(b'{"name": "json"}',)]
+
+    entries = await outbox.pending()
+
+    assert [entry.message.request for entry in entries] == [_Event(name="json")]
+
+
+def test_it_should_error_when_batch_size_is_invalid(tmp_path: pathlib.Path) -> None:
+    """
+    it should error when batch size is invalid
+    """
+    outbox = banshee.SQLiteOutbox(tmp_path / "outbox.db")
+
+    with pytest.raises(banshee.ConfigurationError):
+        banshee.OutboxRelay(outbox, _Bus(), batch_size=0)
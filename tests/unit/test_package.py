@@ -0,0 +1,47 @@
+"""
+Tests for the :mod:`banshee` package
+"""
+
+import subprocess
+import sys
+
+import pytest
+
+import banshee
+
+
+def test_it_should_export_all_public_names() -> None:
+    """
+    it should export all public names
+    """
+    for name in banshee.__all__:
+        assert getattr(banshee, name).__name__ == name
+
+
+def test_it_should_list_public_names() -> None:
+    """
+    it should list public names
+    """
+    assert set(banshee.__all__) <= set(dir(banshee))
+
+
+def test_it_should_raise_for_unknown_names() -> None:
+    """
+    it should raise for unknown names
+    """
+    with pytest.raises(AttributeError):
+        getattr(banshee, "Unknown")
+
+
+def test_it_should_import_modules_on_first_use() -> None:
+    """
+    it should import modules on first use
+    """
+    code = (
+        "import sys, banshee; "
+        "assert 'banshee.testing' not in sys.modules; "
+        "banshee.TraceableBus; "
+        "assert 'banshee.testing' in sys.modules"
+    )
+
+    subprocess.run([sys.executable, "-c", code], check=True)
@@ -0,0 +1,194 @@
+"""
+Tests for :class:`banshee.PartitionMiddleware`
+"""
+
+import asyncio
+import dataclasses
+import typing
+
+import pytest
+
+import banshee
+
+
+@dataclasses.dataclass(frozen=True)
+class _Command:
+    order_id: int | None
+    step: int = 0
+
+
+class _Handle:  # pylint: disable=too-few-public-methods
+    """
+    Handle.
+
+    Records when each message starts and finishes, yielding to other tasks between.
+    """
+
+    def __init__(self) -> None:
+        self.events: list[tuple[str, typing.Any]] = []
+
+    async def __call__(
+        self, message: banshee.Message[typing.Any]
+    ) -> banshee.Message[typing.Any]:
+        self.events.append(("start", message.request))
+
+        for _ in range(3):
+            await asyncio.sleep(0)
+
+        self.events.append(("end", message.request))
+
+        return message
+
+
+def _by_order_id(request: typing.Any) -> int | None:
+    return typing.cast(_Command, request).order_id
+
+
+@pytest.mark.asyncio
+async def test_it_should_handle_messages_with_equal_keys_in_order() -> None:
+    """
+    it should handle messages with equal keys in order
+    """
+    middleware = banshee.PartitionMiddleware(_by_order_id)
+
+    handle = _Handle()
+
+    commands = [_Command(order_id=1, step=step) for step in range(3)]
+
+    await asyncio.gather(
+        *(middleware(banshee.message_for(command), handle) for command in commands)
+    )
+
+    assert handle.events == [
+        (event, command) for command in commands for event in ("start", "end")
+    ]
+
+
+@pytest.mark.asyncio
+async def test_it_should_handle_messages_with_other_keys_concurrently() -> None:
+    """
+    it should handle messages with other keys concurrently
+    """
+    middleware = banshee.PartitionMiddleware(_by_order_id, partitions=2)
+
+    handle = _Handle()
+
+    await asyncio.gather(
+        middleware(banshee.message_for(_Command(order_id=0)), handle),
+        middleware(banshee.message_for(_Command(order_id=1)), handle),
+    )
+
+    assert [event for event, _ in handle.events] == ["start", "start", "end", "end"]
+
+
+@pytest.mark.asyncio
+async def test_it_should_not_order_messages_without_a_key() -> None:
+    """
+    it should not order messages without a key
+    """
+    middleware = banshee.PartitionMiddleware(_by_order_id)
+
+    handle = _Handle()
+
+    await asyncio.gather(
+        middleware(banshee.message_for(_Command(order_id=None)), handle),
+        middleware(banshee.message_for(_Command(order_id=None)), handle),
+    )
+
+    assert [event for event, _ in handle.events] == ["start", "start", "end", "end"]
+
+
+def test_it_should_prefer_partition_context() -> None:
+    """
+    it should prefer partition context
+    """
+    middleware = banshee.PartitionMiddleware(_by_order_id, partitions=1024)
+
+    message = banshee.message_for(
+        _Command(order_id=1), [banshee.Partition(key="customer-1")]
+    )
+
+    assert middleware.lane_for(message) == hash("customer-1") % 1024
+    assert middleware.lane_for(banshee.message_for(_Command(order_id=1))) == 1
+
+
+@pytest.mark.asyncio
+async def test_it_should_handle_nested_messages_in_the_same_lane() -> None:
+    """
+    it should handle nested messages in the same lane
+    """
+    middleware = banshee.PartitionMiddleware(_by_order_id)
+
+    handled = []
+
+    async def handle(
+        message: banshee.Message[typing.Any],
+    ) -> banshee.Message[typing.Any]:
+        command = typing.cast(_Command, message.request)
+
+        if command.step < 2:
+            next_command = dataclasses.replace(command, step=command.step + 1)
+
+            await middleware(banshee.message_for(next_command), handle)
+
+        handled.append(command.step)
+
+        return message
+
+    await asyncio.wait_for(
+        middleware(banshee.message_for(_Command(order_id=1)), handle), timeout=1
+    )
+
+    assert handled == [2, 1, 0]
+
+
+@pytest.mark.asyncio
+async def test_it_should_handle_nested_messages_in_other_lanes() -> None:
+    """
+    it should handle nested messages in other lanes
+    """
+    middleware = banshee.PartitionMiddleware(_by_order_id, partitions=2)
+
+    handled = []
+    holding = []
+    both_holding = asyncio.Event()
+
+    async def handle(
+        message: banshee.Message[typing.Any],
+    ) -> banshee.Message[typing.Any]:
+        command = typing.cast(_Command, message.request)
+
+        if command.step:
+            # both lanes are held before either sends to the other's lane
+            holding.append(command)
+
+            if len(holding) == 2:
+                both_holding.set()
+
+            await both_holding.wait()
+
+            other = _Command(order_id=command.step, step=0)
+
+            await middleware(banshee.message_for(other), handle)
+
+        handled.append(command)
+
+        return message
+
+    await asyncio.wait_for(
+        asyncio.gather(
+            middleware(banshee.message_for(_Command(order_id=1, step=2)), handle),
+            middleware(banshee.message_for(_Command(order_id=2, step=1)), handle),
+        ),
+        timeout=1,
+    )
+
+    assert len(handled) == 4
+
+
+def test_it_should_error_when_partitions_is_invalid() -> None:
+    """
+    it should error when partitions is invalid
+    """
+    with pytest.raises(banshee.ConfigurationError):
+        banshee.PartitionMiddleware(partitions=0)
@@ -0,0 +1,128 @@
+"""
+Tests for :class:`banshee.Profiler`
+"""
+
+import asyncio
+import typing
+
+import pytest
+
+import banshee
+
+import tests.fixture
+
+T = typing.TypeVar("T")
+
+
+class _Sleep:  # pylint: disable=too-few-public-methods
+    """
+    Middleware that sleeps before passing the message on.
+    """
+
+    def __init__(self, seconds: float) -> None:
+        self.seconds = seconds
+
+    async def __call__(
+        self,
+        message: banshee.Message[T],
+        handle: banshee.HandleMessage,
+    ) -> banshee.Message[T]:
+        await asyncio.sleep(self.seconds)
+
+        return await handle(message)
+
+
+async def _final(
+    message: banshee.Message[T],
+    handle: banshee.HandleMessage,  # pylint: disable=unused-argument
+) -> banshee.Message[T]:
+    return message
+
+
+@pytest.mark.asyncio
+async def test_it_should_record_inclusive_and_self_time() -> None:
+    """
+    it should record inclusive and self time
+    """
+    profiler = banshee.Profiler()
+
+    bus = banshee.MessageBus([_Sleep(0.02), _Sleep(0.01), _final], profiler=profiler)
+
+    await bus.handle(tests.fixture.Query1(value=1))
+    await bus.handle(tests.fixture.Query1(value=2))
+
+    outer, inner, final = profiler.rows()
+
+    assert (outer.position, outer.middleware, outer.calls) == (0, "_Sleep", 2)
+    assert (inner.position, inner.middleware, inner.calls) == (1, "_Sleep", 2)
+    assert (final.position, final.middleware, final.calls) == (2, "_final", 2)
+
+    assert outer.request_type == "Query1"
+    assert outer.inclusive >= inner.inclusive >= final.inclusive
+    assert outer.exclusive == outer.inclusive - inner.inclusive
+    assert outer.exclusive >= 40_000_000
+    assert 20_000_000 <= inner.exclusive < outer.exclusive
+
+
+@pytest.mark.asyncio
+async def test_it_should_exclude_nested_messages_from_self_time() -> None:
+    """
+    it should exclude nested messages from self time
+    """
+    profiler = banshee.Profiler()
+
+    bus: banshee.MessageBus
+
+    async def _nesting(
+        message: banshee.Message[T],
+        handle: banshee.HandleMessage,
+    ) -> banshee.Message[T]:
+        if isinstance(message.request, tests.fixture.Query1):
+            await bus.handle(tests.fixture.Query2(value=1))
+
+        return await handle(message)
+
+    bus = banshee.MessageBus([_nesting, _Sleep(0.01), _final], profiler=profiler)
+
+    await bus.handle(tests.fixture.Query1(value=1))
+
+    rows = {(row.request_type, row.position): row for row in profiler.rows()}
+
+    assert rows["Query1", 0].inclusive >= 20_000_000
+    assert rows["Query1", 0].exclusive < 10_000_000
+    assert rows["Query2", 1].exclusive >= 10_000_000
+
+
+@pytest.mark.asyncio
+async def test_it_should_format_table() -> None:
+    """
+    it should format table
+    """
+    profiler = banshee.Profiler()
+
+    bus = banshee.MessageBus([_final], profiler=profiler)
+
+    await bus.handle(tests.fixture.Query1(value=1))
+    await bus.handle(tests.fixture.Query2(value=1))
+
+    header, query1, query2 = profiler.table().splitlines()
+
+    assert header.split()[:4] == ["request", "type", "#", "middleware"]
+    assert query1.split()[:4] == ["Query1", "0", "_final", "1"]
+    assert query2.split()[:4] == ["Query2", "0", "_final", "1"]
+
+
+@pytest.mark.asyncio
+async def test_reset_should_clear_timings() -> None:
+    """
+    reset() should clear timings
+    """
+    profiler = banshee.Profiler()
+
+    bus = banshee.MessageBus([_final], profiler=profiler)
+
+    await bus.handle(tests.fixture.Query1(value=1))
+
+    profiler.reset()
+
+    assert not profiler.rows()
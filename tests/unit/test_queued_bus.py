@@ -0,0 +1,307 @@
+"""
+Tests for :class:`banshee.QueuedBus`
+"""
+
+import asyncio
+import collections.abc
+import typing
+
+import pytest
+
+import banshee
+
+import tests.fixture
+
+T = typing.TypeVar("T")
+
+
+class _Inner(banshee.Bus):
+    """
+    Inner bus.
+
+    Records each message, waiting for the release event before handling it.
+    """
+
+    def __init__(self, error: Exception | None = None) -> None:
+        self.error = error
+        self.release = asyncio.Event()
+        self.started: list[typing.Any] = []
+        self.handled: list[typing.Any] = []
+
+    async def handle(
+        self,
+        request: T | banshee.Message[T],
+        contexts: collections.abc.Iterable[typing.Any] | None = None,
+    ) -> banshee.Message[T]:
+        message = banshee.message_for(request, contexts)
+
+        self.started.append(message.request)
+
+        await self.release.wait()
+
+        if self.error:
+            raise self.error
+
+        self.handled.append(message.request)
+
+        return message.including(banshee.Dispatch(name="handler", result="result"))
+
+
+@pytest.mark.asyncio
+async def test_handle_should_return_processed_message() -> None:
+    """
+    handle() should return processed message
+    """
+    inner = _Inner()
+    inner.release.set()
+
+    async with banshee.QueuedBus(inner) as bus:
+        result = await bus.query(tests.fixture.Query1(value=1))
+
+    assert result == "result"
+
+
+@pytest.mark.asyncio
+async def test_handle_should_raise_handler_errors() -> None:
+    """
+    handle() should raise handler errors
+    """
+    inner = _Inner(error=RuntimeError("failed"))
+    inner.release.set()
+
+    async with banshee.QueuedBus(inner) as bus:
+        with pytest.raises(RuntimeError):
+            await bus.handle(tests.fixture.Query1(value=1))
+
+
+@pytest.mark.asyncio
+async def test_it_should_handle_messages_on_workers() -> None:
+    """
+    it should handle messages on workers
+    """
+    inner = _Inner()
+
+    bus = banshee.QueuedBus(inner, workers=2)
+
+    futures = [await bus.submit(tests.fixture.Query2(value=n)) for n in range(3)]
+
+    await asyncio.sleep(0)
+
+    assert inner.started == [
+        tests.fixture.Query2(value=0),
+        tests.fixture.Query2(value=1),
+    ]
+    assert len(bus) == 1
+
+    inner.release.set()
+
+    messages = await asyncio.gather(*futures)
+
+    assert [message.request.value for message in messages] == [0, 1, 2]
+
+    await bus.close()
+
+
+@pytest.mark.asyncio
+async def test_handle_should_handle_nested_messages_inline() -> None:
+    """
+    handle() should handle nested messages inline
+    """
+    inner = _Inner()
+    inner.release.set()
+
+    bus = banshee.QueuedBus(inner, workers=1)
+
+    class _Nested(banshee.Bus):
+        async def handle(
+            self,
+            request: T | banshee.Message[T],
+            contexts: collections.abc.Iterable[typing.Any] | None = None,
+        ) -> banshee.Message[T]:
+            message = banshee.message_for(request, contexts)
+
+            if message.request == tests.fixture.Query1(value=1):
+                # sent from the only worker, through the same queued bus
+                await bus.handle(tests.fixture.Query1(value=2))
+
+            return await inner.handle(message)
+
+    bus.inner = _Nested()
+
+    try:
+        await asyncio.wait_for(bus.handle(tests.fixture.Query1(value=1)), timeout=1)
+    finally:
+        await bus.close(timeout=1)
+
+    assert inner.handled == [
+        tests.fixture.Query1(value=2),
+        tests.fixture.Query1(value=1),
+    ]
+
+
+@pytest.mark.asyncio
+async def test_post_should_not_wait_for_message() -> None:
+    """
+    post() should not wait for message
+    """
+    inner = _Inner()
+
+    bus = banshee.QueuedBus(inner)
+
+    assert await bus.post(tests.fixture.Query1(value=1))
+    assert not inner.handled
+
+    inner.release.set()
+
+    await bus.close()
+
+    assert inner.handled == [tests.fixture.Query1(value=1)]
+
+
+@pytest.mark.asyncio
+async def test_post_should_log_handler_errors(caplog: pytest.LogCaptureFixture) -> None:
+    """
+    post() should log handler errors
+    """
+    inner = _Inner(error=RuntimeError("failed"))
+    inner.release.set()
+
+    bus = banshee.QueuedBus(inner)
+
+    await bus.post(tests.fixture.Query1(value=1))
+
+    await bus.close()
+
+    assert [record.levelname for record in caplog.records] == ["ERROR"]
+
+
+@pytest.mark.asyncio
+async def test_it_should_block_when_queue_is_full() -> None:
+    """
+    it should block when queue is full
+    """
+    inner = _Inner()
+
+    bus = banshee.QueuedBus(inner, max_size=1)
+
+    await bus.post(tests.fixture.Query2(value=1))
+    await asyncio.sleep(0)
+    await bus.post(tests.fixture.Query2(value=2))
+
+    blocked = asyncio.ensure_future(bus.post(tests.fixture.Query2(value=3)))
+
+    await asyncio.sleep(0)
+
+    assert not blocked.done()
+
+    inner.release.set()
+
+    assert await blocked
+
+    await bus.close()
+
+    assert len(inner.handled) == 3
+
+
+@pytest.mark.asyncio
+async def test_it_should_drop_when_queue_is_full() -> None:
+    """
+    it should drop when queue is full
+    """
+    inner = _Inner()
+
+    bus = banshee.QueuedBus(inner, max_size=1, backpressure=banshee.Backpressure.DROP)
+
+    await bus.post(tests.fixture.Query2(value=1))
+    await asyncio.sleep(0)
+
+    assert await bus.post(tests.fixture.Query2(value=2))
+    assert not await bus.post(tests.fixture.Query2(value=3))
+
+    with pytest.raises(banshee.QueueFullError):
+        await bus.submit(tests.fixture.Query2(value=4))
+
+    inner.release.set()
+
+    await bus.close()
+
+    assert len(inner.handled) == 2
+
+
+@pytest.mark.asyncio
+async def test_it_should_raise_when_queue_is_full() -> None:
+    """
+    it should raise when queue is full
+    """
+    inner = _Inner()
+
+    bus = banshee.QueuedBus(inner, max_size=1, backpressure=banshee.Backpressure.RAISE)
+
+    await bus.post(tests.fixture.Query2(value=1))
+    await asyncio.sleep(0)
+    await bus.post(tests.fixture.Query2(value=2))
+
+    with pytest.raises(banshee.QueueFullError):
+        await bus.post(tests.fixture.Query2(value=3))
+
+    inner.release.set()
+
+    await bus.close()
+
+
+@pytest.mark.asyncio
+async def test_close_should_drain_queue() -> None:
+    """
+    close() should drain queue
+    """
+    inner = _Inner()
+
+    bus = banshee.QueuedBus(inner)
+
+    future = await bus.submit(tests.fixture.Query1(value=1))
+
+    closing = asyncio.ensure_future(bus.close())
+
+    await asyncio.sleep(0)
+
+    with pytest.raises(banshee.BusClosedError):
+        await bus.post(tests.fixture.Query1(value=2))
+
+    inner.release.set()
+
+    await closing
+
+    assert bus.closed
+    assert (await future).request == tests.fixture.Query1(value=1)
+
+
+@pytest.mark.asyncio
+async def test_close_should_discard_messages_after_timeout() -> None:
+    """
+    close() should discard messages after timeout
+    """
+    inner = _Inner()
+
+    bus = banshee.QueuedBus(inner)
+
+    started = await bus.submit(tests.fixture.Query2(value=1))
+    waiting = await bus.submit(tests.fixture.Query2(value=2))
+
+    await bus.close(timeout=0.01)
+
+    for future in (started, waiting):
+        with pytest.raises(banshee.BusClosedError):
+            await future
+
+    assert not inner.handled
+
+
+def test_it_should_error_when_configuration_is_invalid() -> None:
+    """
+    it should error when configuration is invalid
+    """
+    with pytest.raises(banshee.ConfigurationError):
+        banshee.QueuedBus(_Inner(), workers=0)
+
+    with pytest.raises(banshee.ConfigurationError):
+        banshee.QueuedBus(_Inner(), max_size=0)
@@ -1,9 +1,15 @@
 """
 Tests for :class:`banshee.Registry`
 """
+
+import abc
 import collections.abc
+import importlib
+import sys
 import typing
 
+import pytest
+
 import banshee
 
 import tests.fixture
@@ -17,6 +23,21 @@ class _Bar:  # pylint: disable=too-few-public-methods
     pass
 
 
+class _SubFoo(_Foo):  # pylint: disable=too-few-public-methods
+    pass
+
+
+class _Abstract(abc.ABC):  # pylint: disable=too-few-public-methods
+    pass
+
+
+_Abstract.register(_Bar)
+
+
+class _Named:  # pylint: disable=too-few-public-methods
+    name = "named"
+
+
 class _Handler:  # pylint: disable=too-few-public-methods
     pass
 
@@ -203,3 +224,230 @@ def test_subscribe_should_generate_handler_name_for_annotated_types() -> None:
     name = name_for(typing.Annotated[_Handler, 123])  # type: ignore
 
     assert name == f"typing.Annotated[{__name__}._Handler, {repr(123)}]", name
+
+
+def test_subscribe_should_mark_batch_handlers() -> None:
+    """
+    subscribe() should mark batch handlers
+    """
+    registry = banshee.Registry()
+
+    handler1 = tests.fixture.mock_handler()
+    handler2 = tests.fixture.mock_handler()
+
+    registry.subscribe(handler1, to=_Foo)
+    registry.subscribe(handler2, to=_Foo, batch=True)
+
+    references = tuple(registry.subscribers_for(banshee.message_for(_Foo())))
+
+    assert [ref.batch for ref in references] == [False, True]
+
+
+def test_subscribe_to_should_mark_batch_handlers() -> None:
+    """
+    subscribe_to() should mark batch handlers
+    """
+    registry = banshee.Registry()
+
+    handler = tests.fixture.mock_handler()
+
+    registry.subscribe_to(_Foo, batch=True)(handler)
+
+    references = tuple(registry.subscribers_for(banshee.message_for(_Foo())))
+
+    assert len(references) == 1
+    assert references[0].batch
+
+
+def test_subscribe_should_only_match_exact_type_by_default() -> None:
+    """
+    subscribe() should only match exact type by default
+    """
+    registry = banshee.Registry()
+
+    registry.subscribe(tests.fixture.mock_handler(), to=_Foo)
+
+    assert not tuple(registry.subscribers_for(banshee.message_for(_SubFoo())))
+
+
+def test_subscribe_should_register_polymorphic_handlers() -> None:
+    """
+    subscribe() should register polymorphic handlers
+    """
+    registry = banshee.Registry()
+
+    handler1 = tests.fixture.mock_handler()
+    handler2 = tests.fixture.mock_handler()
+    handler3 = tests.fixture.mock_handler()
+    handler4 = tests.fixture.mock_handler()
+
+    registry.subscribe(handler1, to=object, name="object", polymorphic=True)
+    registry.subscribe(handler2, to=_Foo, name="foo", polymorphic=True)
+    registry.subscribe(handler3, to=_SubFoo, name="sub_foo")
+    registry.subscribe_to(_Abstract, name="abstract", polymorphic=True)(handler4)
+
+    references1 = tuple(registry.subscribers_for(banshee.message_for(_SubFoo())))
+    references2 = tuple(registry.subscribers_for(banshee.message_for(_Bar())))
+
+    assert [ref.name for ref in references1] == ["sub_foo", "foo", "object"]
+    assert [ref.name for ref in references2] == ["object", "abstract"]
+
+
+def test_subscribe_should_invalidate_resolved_handlers() -> None:
+    """
+    subscribe() should invalidate resolved handlers
+    """
+    registry = banshee.Registry()
+
+    message = banshee.message_for(_SubFoo())
+
+    registry.subscribe(tests.fixture.mock_handler(), to=_SubFoo, name="sub_foo")
+
+    references = registry.subscribers_for(message)
+
+    assert registry.subscribers_for(message) is references
+
+    registry.subscribe(
+        tests.fixture.mock_handler(), to=_Foo, name="foo", polymorphic=True
+    )
+
+    references = tuple(registry.subscribers_for(message))
+
+    assert [ref.name for ref in references] == ["sub_foo", "foo"]
+
+
+def test_subscribe_should_accept_import_strings() -> None:
+    """
+    subscribe() should accept import strings
+    """
+    sys.modules.pop("tests.fixture.lazy", None)
+
+    registry = banshee.Registry()
+
+    registry.subscribe("tests.fixture.lazy:handler", to=f"{__name__}:_Foo")
+
+    references = tuple(registry.subscribers_for(banshee.message_for(_Foo())))
+
+    assert len(references) == 1
+    assert references[0].name == "tests.fixture.lazy.handler"
+    assert references[0].handler == "tests.fixture.lazy:handler"
+    assert "tests.fixture.lazy" not in sys.modules
+
+
+def test_subscribe_should_match_polymorphic_import_strings() -> None:
+    """
+    subscribe() should match polymorphic import strings
+    """
+    registry = banshee.Registry()
+
+    handler1 = tests.fixture.mock_handler()
+    handler2 = tests.fixture.mock_handler()
+
+    registry.subscribe(handler1, to=f"{__name__}:_Foo", name="foo", polymorphic=True)
+    registry.subscribe(
+        handler2, to=f"{__name__}:_Abstract", name="abstract", polymorphic=True
+    )
+
+    references1 = tuple(registry.subscribers_for(banshee.message_for(_SubFoo())))
+    references2 = tuple(registry.subscribers_for(banshee.message_for(_Bar())))
+
+    assert [ref.name for ref in references1] == ["foo"]
+    assert [ref.name for ref in references2] == ["abstract"]
+
+
+def test_subscribe_should_match_abstract_import_strings_once_loaded() -> None:
+    """
+    subscribe() should match abstract import strings once loaded
+    """
+    sys.modules.pop("tests.fixture.lazy", None)
+
+    registry = banshee.Registry()
+
+    registry.subscribe(
+        tests.fixture.mock_handler(),
+        to="tests.fixture.lazy:Named",
+        name="named",
+        polymorphic=True,
+    )
+
+    message = banshee.message_for(_Named())
+
+    assert not tuple(registry.subscribers_for(message))
+
+    importlib.import_module("tests.fixture.lazy")
+
+    assert [ref.name for ref in registry.subscribers_for(message)] == ["named"]
+
+
+def test_subscribe_should_reject_invalid_import_strings() -> None:
+    """
+    subscribe() should reject invalid import strings
+    """
+    registry = banshee.Registry()
+
+    with pytest.raises(banshee.ConfigurationError):
+        registry.subscribe("tests.fixture.lazy.handler", to=_Foo)
+
+    with pytest.raises(banshee.ConfigurationError):
+        registry.subscribe(tests.fixture.mock_handler(), to="tests.fixture.lazy")
+
+
+@pytest.mark.asyncio
+async def test_warm_up_should_import_handlers() -> None:
+    """
+    warm_up() should import handlers
+    """
+    sys.modules.pop("tests.fixture.lazy", None)
+
+    registry = banshee.Registry()
+
+    registry.subscribe("tests.fixture.lazy:handler", to=_Foo)
+    registry.subscribe("tests.fixture.lazy:handler", to=_Bar, polymorphic=True)
+
+    await registry.warm_up()
+
+    handler = sys.modules["tests.fixture.lazy"].handler
+
+    for request in (_Foo(), _Bar()):
+        (reference,) = registry.subscribers_for(banshee.message_for(request))
+
+        assert reference.resolve() is handler
+
+
+@pytest.mark.asyncio
+async def test_warm_up_should_raise_import_errors() -> None:
+    """
+    warm_up() should raise import errors
+    """
+    registry = banshee.Registry()
+
+    registry.subscribe("tests.fixture.lazy:missing", to=_Foo)
+    registry.subscribe("tests.fixture.missing:handler", to=_Foo)
+
+    with pytest.raises(banshee.MultipleErrors) as exc_info:
+        await registry.warm_up()
+
+    assert len(exc_info.value.exceptions) == 2
+
+
+def test_subscribe_should_set_handler_lifetimes() -> None:
+    """
+    subscribe() should set handler lifetimes
+    """
+    registry = banshee.Registry()
+
+    registry.subscribe(_Handler, to=_Foo, name="transient")
+    registry.subscribe(
+        _Handler, to=_Foo, name="singleton", lifetime=banshee.Lifetime.SINGLETON
+    )
+    registry.subscribe_to(_Foo, name="scoped", lifetime=banshee.Lifetime.SCOPED)(
+        _Handler
+    )
+
+    references = tuple(registry.subscribers_for(banshee.message_for(_Foo())))
+
+    assert [ref.lifetime for ref in references] == [
+        banshee.Lifetime.TRANSIENT,
+        banshee.Lifetime.SINGLETON,
+        banshee.Lifetime.SCOPED,
+    ]
@@ -1,6 +1,8 @@
 """
 Tests for :class:`banshee.SimpleHandlerFactory`
 """
+
+import sys
 import typing
 
 import banshee
@@ -45,3 +47,104 @@ def test_it_should_return_classes_instantiated() -> None:
     result = factory(reference)
 
     assert isinstance(result, _Foo)
+
+
+def test_it_should_import_import_strings_once() -> None:
+    """
+    it should import import strings once
+    """
+    sys.modules.pop("tests.fixture.lazy", None)
+
+    reference: banshee.HandlerReference[typing.Any] = banshee.HandlerReference(
+        name="test",
+        handler="tests.fixture.lazy:handler",
+    )
+
+    assert reference.lazy
+    assert "tests.fixture.lazy" not in sys.modules
+
+    factory = banshee.SimpleHandlerFactory()
+
+    result = factory(reference)
+
+    import tests.fixture.lazy  # pylint: disable=import-outside-toplevel
+
+    assert result is typing.cast(
+        banshee.Handler[typing.Any], tests.fixture.lazy.handler
+    )
+
+    sys.modules.pop("tests.fixture.lazy")
+
+    assert factory(reference) is result
+
+
+class _Handler:  # pylint: disable=too-few-public-methods
+    def __call__(self, _: typing.Any, /) -> typing.Any:
+        pass
+
+
+def reference_for(
+    lifetime: banshee.Lifetime,
+) -> banshee.HandlerReference[typing.Any]:
+    """
+    Reference for lifetime.
+
+    :param lifetime: handler lifetime
+
+    :returns: reference to a handler class with the lifetime
+    """
+    return banshee.HandlerReference(name="test", handler=_Handler, lifetime=lifetime)
+
+
+def test_it_should_instantiate_transient_classes_each_time() -> None:
+    """
+    it should instantiate transient classes each time
+    """
+    reference = reference_for(banshee.Lifetime.TRANSIENT)
+
+    factory = banshee.SimpleHandlerFactory()
+
+    with banshee.HandlerScope():
+        assert factory(reference) is not factory(reference)
+
+
+def test_it_should_reuse_singleton_classes() -> None:
+    """
+    it should reuse singleton classes
+    """
+    reference = reference_for(banshee.Lifetime.SINGLETON)
+
+    factory1 = banshee.SimpleHandlerFactory()
+    factory2 = banshee.SimpleHandlerFactory()
+
+    result = factory1(reference)
+
+    assert isinstance(result, _Handler)
+    assert factory1(reference) is result
+    assert factory2(reference) is not result
+
+
+def test_it_should_reuse_scoped_classes_within_a_scope() -> None:
+    """
+    it should reuse scoped classes within a scope
+    """
+    reference = reference_for(banshee.Lifetime.SCOPED)
+
+    factory = banshee.SimpleHandlerFactory()
+
+    with banshee.HandlerScope():
+        result1 = factory(reference)
+
+        with banshee.HandlerScope():
+            # nested scopes use the outer scope
+            assert factory(reference) is result1
+
+    with banshee.HandlerScope():
+        result2 = factory(reference)
+
+        assert factory(reference) is result2
+
+    assert result1 is not result2
+
+    # outside a scope the handler is transient
+    assert factory(reference) is not factory(reference)
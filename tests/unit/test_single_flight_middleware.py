@@ -0,0 +1,221 @@
+"""
+Tests for :class:`banshee.SingleFlightMiddleware`
+"""
+
+import asyncio
+import dataclasses
+import typing
+
+import pytest
+
+import banshee
+
+# the same simple queries as the cache middleware tests
+# pylint: disable=duplicate-code
+
+
+@dataclasses.dataclass(frozen=True)
+class _Query:
+    value: int
+
+
+@dataclasses.dataclass(frozen=True)
+class _OtherQuery:
+    value: int
+
+
+class _Handle:  # pylint: disable=too-few-public-methods
+    """
+    Handle message, waiting until released and counting dispatches.
+    """
+
+    def __init__(self) -> None:
+        self.calls = 0
+        self.release = asyncio.Event()
+        self.error: Exception | None = None
+
+    async def __call__(self, message: banshee.Message[typing.Any]) -> typing.Any:
+        if banshee.Dispatch in message:
+            return message
+
+        self.calls += 1
+        call = self.calls
+
+        await self.release.wait()
+
+        if self.error:
+            raise self.error
+
+        return message.including(banshee.Dispatch(name="test", result=call))
+
+
+@pytest.mark.asyncio
+async def test_it_should_coalesce_concurrent_equal_requests() -> None:
+    """
+    it should coalesce concurrent equal requests
+    """
+    handle = _Handle()
+
+    middleware = banshee.SingleFlightMiddleware()
+
+    tasks = [
+        asyncio.create_task(middleware(banshee.message_for(_Query(1)), handle))
+        for _ in range(3)
+    ]
+    other = asyncio.create_task(middleware(banshee.message_for(_Query(2)), handle))
+
+    await asyncio.sleep(0)
+
+    handle.release.set()
+
+    results = await asyncio.gather(*tasks)
+
+    assert handle.calls == 2
+    assert [result[banshee.Dispatch].result for result in results] == [1, 1, 1]
+    assert (await other)[banshee.Dispatch].result == 2
+
+
+@pytest.mark.asyncio
+async def test_it_should_not_coalesce_sequential_requests() -> None:
+    """
+    it should not coalesce sequential requests
+    """
+    handle = _Handle()
+    handle.release.set()
+
+    middleware = banshee.SingleFlightMiddleware()
+
+    result1 = await middleware(banshee.message_for(_Query(1)), handle)
+    result2 = await middleware(banshee.message_for(_Query(1)), handle)
+
+    assert result1[banshee.Dispatch].result == 1
+    assert result2[banshee.Dispatch].result == 2
+
+
+@pytest.mark.asyncio
+async def test_it_should_only_coalesce_selected_types() -> None:
+    """
+    it should only coalesce selected types
+    """
+    handle = _Handle()
+
+    middleware = banshee.SingleFlightMiddleware(types=[_OtherQuery])
+
+    tasks = [
+        asyncio.create_task(middleware(banshee.message_for(request), handle))
+        for request in (_Query(1), _Query(1), _OtherQuery(1), _OtherQuery(1))
+    ]
+
+    await asyncio.sleep(0)
+
+    handle.release.set()
+
+    await asyncio.gather(*tasks)
+
+    assert handle.calls == 3
+
+
+@pytest.mark.asyncio
+async def test_it_should_raise_errors_for_every_waiting_message() -> None:
+    """
+    it should raise errors for every waiting message
+    """
+    handle = _Handle()
+    handle.error = RuntimeError("failed")
+
+    middleware = banshee.SingleFlightMiddleware()
+
+    tasks = [
+        asyncio.create_task(middleware(banshee.message_for(_Query(1)), handle))
+        for _ in range(2)
+    ]
+
+    await asyncio.sleep(0)
+
+    handle.release.set()
+
+    results = await asyncio.gather(*tasks, return_exceptions=True)
+
+    assert handle.calls == 1
+    assert results == [handle.error, handle.error]
+
+
+@pytest.mark.asyncio
+async def test_it_should_retry_when_message_in_flight_is_cancelled() -> None:
+    """
+    it should retry when message in flight is cancelled
+    """
+    handle = _Handle()
+
+    middleware = banshee.SingleFlightMiddleware()
+
+    leader = asyncio.create_task(middleware(banshee.message_for(_Query(1)), handle))
+    follower = asyncio.create_task(middleware(banshee.message_for(_Query(1)), handle))
+
+    await asyncio.sleep(0)
+
+    leader.cancel()
+
+    await asyncio.sleep(0)
+
+    handle.release.set()
+
+    result = await follower
+
+    assert leader.cancelled()
+    assert handle.calls == 2
+    assert result[banshee.Dispatch].result == 2
+
+
+@pytest.mark.asyncio
+async def test_it_should_not_cancel_message_in_flight_with_waiting_message() -> None:
+    """
+    it should not cancel message in flight with waiting message
+    """
+    handle = _Handle()
+
+    middleware = banshee.SingleFlightMiddleware()
+
+    leader = asyncio.create_task(middleware(banshee.message_for(_Query(1)), handle))
+    follower = asyncio.create_task(middleware(banshee.message_for(_Query(1)), handle))
+
+    await asyncio.sleep(0)
+
+    follower.cancel()
+
+    await asyncio.sleep(0)
+
+    handle.release.set()
+
+    result = await leader
+
+    assert follower.cancelled()
+    assert result[banshee.Dispatch].result == 1
+
+
+@pytest.mark.asyncio
+async def test_it_should_pass_through_unhashable_requests() -> None:
+    """
+    it should pass through unhashable requests
+    """
+
+    @dataclasses.dataclass
+    class _Unhashable:
+        value: list[int]
+
+    handle = _Handle()
+
+    middleware = banshee.SingleFlightMiddleware()
+
+    tasks = [
+        asyncio.create_task(middleware(banshee.message_for(_Unhashable([])), handle))
+        for _ in range(2)
+    ]
+
+    await asyncio.sleep(0)
+
+    handle.release.set()
+
+    await asyncio.gather(*tasks)
+
+    assert handle.calls == 2
@@ -5,6 +5,7 @@ Tests for :class:`banshee.TraceableBus`
 import datetime
 import typing
 import unittest.mock
+import uuid
 
 import conjecture
 import freezegun
@@ -154,6 +155,47 @@ async def test_handle_should_record_calls() -> None:
     assert bus.messages[0].timestamp == now
 
 
+@pytest.mark.asyncio
+async def test_handle_should_not_record_caller_when_disabled() -> None:
+    """
+    handle() should not record caller when disabled
+    """
+    request = _Request()
+
+    inner = mock_bus()
+    inner.handle.return_value = banshee.message_for(request)
+
+    bus = banshee.TraceableBus(inner, capture_caller=False)
+
+    await bus.handle(request)
+
+    assert len(bus.messages) == 1
+    assert bus.messages[0].filename == ""
+    assert bus.messages[0].function == ""
+    assert bus.messages[0].lineno == 0
+    assert bus.messages[0].request == request
+
+
+@pytest.mark.asyncio
+async def test_handle_should_record_failed_calls() -> None:
+    """
+    handle() should record failed calls
+    """
+    request = _Request()
+
+    inner = mock_bus()
+    inner.handle.side_effect = RuntimeError("failed")
+
+    bus = banshee.TraceableBus(inner)
+
+    with pytest.raises(RuntimeError):
+        await bus.handle(request)
+
+    assert len(bus.messages) == 1
+    assert bus.messages[0].request == request
+    assert bus.messages[0].result_contexts is None
+
+
 @pytest.mark.asyncio
 async def test_reset_clears_recorded_calls() -> None:
     """
@@ -174,3 +216,215 @@ async def test_reset_clears_recorded_calls() -> None:
     bus.reset()
 
     assert len(bus.messages) == 0
+
+
+@pytest.mark.asyncio
+async def test_handle_many_should_record_calls() -> None:
+    """
+    handle_many() should record calls
+    """
+    requests = [_Request(), _Request()]
+
+    inner = mock_bus()
+
+    bus = banshee.TraceableBus(inner)
+
+    await bus.handle_many(requests)
+
+    assert inner.handle.await_count == 2
+    assert {id(v.request) for v in bus.messages} == {id(v) for v in requests}
+
+    for info in bus.messages:
+        assert info.filename in {__file__, typeguard.__file__}
+        assert info.function in {"test_handle_many_should_record_calls", "wrapper"}
+
+
+@pytest.mark.asyncio
+async def test_query_many_should_return_handler_results() -> None:
+    """
+    query_many() should return handler results
+    """
+
+    async def _handle(
+        message: banshee.Message[typing.Any],
+    ) -> banshee.Message[typing.Any]:
+        return message.including(banshee.Dispatch(name="test", result=message.request))
+
+    inner = mock_bus()
+    inner.handle.side_effect = _handle
+
+    bus = banshee.TraceableBus(inner)
+
+    assert await bus.query_many([1, 2, 3]) == [1, 2, 3]
+    assert len(bus.messages) == 3
+
+
+def causation_for(correlation_id: uuid.UUID) -> banshee.Causation:
+    """
+    Causation for correlation identifier.
+
+    :param correlation_id: correlation identifier
+
+    :returns: causation context
+    """
+    return banshee.Causation(causation_id=uuid.uuid4(), correlation_id=correlation_id)
+
+
+@pytest.mark.asyncio
+async def test_handle_should_keep_most_recent_messages() -> None:
+    """
+    handle() should keep most recent messages
+    """
+    inner = mock_bus()
+    inner.handle.side_effect = lambda message: message
+
+    bus = banshee.TraceableBus(inner, max_messages=2)
+
+    for i in range(4):
+        await bus.handle(i)
+
+    assert [info.request for info in bus.messages] == [2, 3]
+    assert bus.messages[-1].request == 3
+    assert [info.request for info in reversed(bus.messages)] == [3, 2]
+
+
+@pytest.mark.asyncio
+async def test_messages_should_be_a_snapshot() -> None:
+    """
+    messages should be a snapshot
+    """
+    inner = mock_bus()
+    inner.handle.side_effect = lambda message: message
+
+    bus = banshee.TraceableBus(inner)
+
+    await bus.handle(1)
+
+    messages = bus.messages
+
+    assert bus.messages is messages
+
+    await bus.handle(2)
+
+    assert [info.request for info in messages] == [1]
+    assert [info.request for info in bus.messages] == [1, 2]
+
+
+@pytest.mark.asyncio
+async def test_messages_should_allow_handling_while_iterating() -> None:
+    """
+    messages should allow handling while iterating
+    """
+    inner = mock_bus()
+    inner.handle.side_effect = lambda message: message
+
+    bus = banshee.TraceableBus(inner)
+
+    await bus.handle(1)
+
+    for info in bus.messages:
+        await bus.handle(info.request)
+
+    assert len(bus.messages) == 2
+
+
+@pytest.mark.asyncio
+async def test_handle_should_sample_messages() -> None:
+    """
+    handle() should sample messages
+    """
+    inner = mock_bus()
+    inner.handle.side_effect = lambda message: message
+
+    bus1 = banshee.TraceableBus(inner, sample_rate=0.0)
+    bus2 = banshee.TraceableBus(inner, sample_rate=0.5)
+
+    with unittest.mock.patch("random.random", side_effect=[0.4, 0.6]):
+        await bus2.handle(1)
+        await bus2.handle(2)
+
+    await bus1.handle(1)
+
+    assert not bus1.messages
+    assert [info.request for info in bus2.messages] == [1]
+
+
+@pytest.mark.asyncio
+async def test_handle_should_sample_messages_by_correlation_id() -> None:
+    """
+    handle() should sample messages by correlation id
+    """
+    inner = mock_bus()
+    inner.handle.side_effect = lambda message: message
+
+    bus = banshee.TraceableBus(inner, sample_rate=0.5, sample_by_correlation=True)
+
+    correlation_ids = [uuid.UUID(int=n) for n in range(20)]
+
+    for correlation_id in correlation_ids * 2:
+        await bus.handle(1, contexts=[causation_for(correlation_id)])
+
+    kept = [info.correlation_id for info in bus.messages]
+
+    assert 0 < len(kept) < 40
+    assert kept == [x for x in correlation_ids * 2 if x in set(kept)]
+
+
+@pytest.mark.asyncio
+async def test_handle_should_sample_time_ordered_correlation_ids_evenly() -> None:
+    """
+    handle() should sample time ordered correlation ids evenly
+    """
+    inner = mock_bus()
+    inner.handle.side_effect = lambda message: message
+
+    for sample_rate in (0.01, 0.5):
+        bus = banshee.TraceableBus(
+            inner, sample_rate=sample_rate, sample_by_correlation=True
+        )
+
+        # UUIDv7 style, a millisecond timestamp in the high bits
+        for millisecond in range(1_700_000_000_000, 1_700_000_002_000):
+            correlation_id = uuid.UUID(int=millisecond << 80)
+
+            await bus.handle(1, contexts=[causation_for(correlation_id)])
+
+        assert abs(len(bus.messages) - 2000 * sample_rate) < 2000 * 0.05
+
+
+def test_it_should_reject_invalid_retention() -> None:
+    """
+    it should reject invalid retention
+    """
+    with pytest.raises(banshee.ConfigurationError):
+        banshee.TraceableBus(mock_bus(), max_messages=0)
+
+    with pytest.raises(banshee.ConfigurationError):
+        banshee.TraceableBus(mock_bus(), sample_rate=1.5)
+
+
+@pytest.mark.asyncio
+async def test_iter_messages_should_filter_messages() -> None:
+    """
+    iter_messages() should filter messages
+    """
+    inner = mock_bus()
+    inner.handle.side_effect = lambda message: message
+
+    bus = banshee.TraceableBus(inner)
+
+    correlation_id = uuid.uuid4()
+
+    await bus.handle(1, contexts=[causation_for(correlation_id)])
+    await bus.handle("2", contexts=[causation_for(correlation_id)])
+    await bus.handle(3)
+
+    assert [info.request for info in bus.iter_messages()] == [1, "2", 3]
+    assert [info.request for info in bus.iter_messages(request_type=int)] == [1, 3]
+    assert [
+        info.request for info in bus.iter_messages(correlation_id=correlation_id)
+    ] == [1, "2"]
+    assert [
+        info.request
+        for info in bus.iter_messages(request_type=int, correlation_id=correlation_id)
+    ] == [1]